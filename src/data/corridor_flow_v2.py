@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Union
 
 import numpy as np
 import pandas as pd
 
-from src.foe.corridor_foe_runner import foe_corridor_runner
-from src.foe.forecasting import get_forecast_model    # factory for models
+from src.foe.corridor_foe_runner import (
+    corridor_calendar,
+    foe_corridor_runner,
+    foe_corridor_sample_runner,
+)
+from src.foe.hashing import hash_payload
+from src.foe.result_cache import CACHE_FORMAT_VERSION, ResultCache
+from src.foe.settlement_calendar import SettlementCalendar
+from src.foe.tracing import Tracer, span, traced_pipeline
+from src.foe.forecasting import model_capabilities
+from src.foe.forecasting.bootstrap import BootstrapConfig, bootstrap_forecast
+from src.foe.forecasting.persistence import FittedModelCache, fit_forecast_model    # factory-backed fits
 
 
 # ---------- Types & Config ----------
@@ -23,16 +33,25 @@ class CorridorFlowConfig:
     forecast_model: str = "fx_linear"  # use FX-aware model via factory
     fx_col: str = "fx_rate"            # expected FX column name (e.g. USD→local)
 
+    # Settlement calendar for the FOE; None = the calendar registered for
+    # corridor_id, if any, else calendar-day settlement.
+    settlement_calendar: Optional[SettlementCalendar] = None
+
 
 FOECallback = Callable[[pd.DataFrame, CorridorFlowConfig], Any]
 
+# Part of every result-cache key: bump when the pipeline's output for the
+# same inputs changes, so stale cached results are not served.
+PIPELINE_VERSION = "1"
+
 
 # ---------- Core helpers ----------
 
 def _check_monotonic_years(df: pd.DataFrame, year_col: str) -> pd.DataFrame:
-    df_sorted = df.sort_values(year_col).reset_index(drop=True)
-    if df_sorted[year_col].duplicated().any():
-        raise ValueError("Duplicate years found in annual corridor series.")
+    with span("check_monotonic_years", rows=len(df)):
+        df_sorted = df.sort_values(year_col).reset_index(drop=True)
+        if df_sorted[year_col].duplicated().any():
+            raise ValueError("Duplicate years found in annual corridor series.")
     return df_sorted
 
 
@@ -80,7 +99,9 @@ def train_validate_forecast_corridor(
     validation_year: int = 2024,
     forecast_years: Optional[List[int]] = None,
     fx_df: Optional[pd.DataFrame] = None,
-) -> Dict[str, pd.DataFrame]:
+    model_cache: Optional[FittedModelCache] = None,
+    intervals: Optional[BootstrapConfig] = None,
+) -> Dict[str, Any]:
     """
     B4: FX-adjusted forecasting.
 
@@ -88,6 +109,10 @@ def train_validate_forecast_corridor(
       either already on `annual_df` or supplied via `fx_df` (with columns: ["year", cfg.fx_col]).
     - The FOE-facing outputs (train/validation/forecast) remain in USD and keep
       the same schema as in the log-trend baseline.
+    - model_cache (optional FittedModelCache) reuses fits of a training
+      slice seen before.
+    - intervals (optional BootstrapConfig) adds bootstrap quantile columns
+      to the forecast and a "forecast_samples" (draws x years) matrix.
     """
     cfg = cfg or CorridorFlowConfig()
     forecast_years = forecast_years or [2025]
@@ -114,15 +139,17 @@ def train_validate_forecast_corridor(
                 f"fx_df is missing required columns: {missing}. "
                 f"Expected at least ['year', '{cfg.fx_col}']."
             )
-        df = df.merge(
-            fx_df[["year", cfg.fx_col]],
-            on="year",
-            how="left",
-            validate="one_to_one",
-        )
+        with span("merge", rows=len(df)):
+            df = df.merge(
+                fx_df[["year", cfg.fx_col]],
+                on="year",
+                how="left",
+                validate="one_to_one",
+            )
 
     # If using FX-aware model, enforce presence of FX column
-    if cfg.forecast_model == "fx_linear" and cfg.fx_col not in df.columns:
+    needs_fx = model_capabilities(cfg.forecast_model).needs_fx
+    if needs_fx and cfg.fx_col not in df.columns:
         raise ValueError(
             f"FX-adjusted model '{cfg.forecast_model}' requires FX column "
             f"'{cfg.fx_col}' on the annual series (or via fx_df)."
@@ -137,24 +164,25 @@ def train_validate_forecast_corridor(
         raise ValueError("Training set is empty. Check train_end_year.")
 
     # ---- MODEL: now using factory, default 'fx_linear' ----
-    model = get_forecast_model(cfg.forecast_model)
-
     # Choose fit features based on model type
-    if cfg.forecast_model == "fx_linear":
+    if needs_fx:
         fit_cols = ["year", "remittance_usd", cfg.fx_col]
         missing = set(fit_cols) - set(train_df.columns)
         if missing:
             raise KeyError(
-                f"Training data missing required columns for fx_linear model: {missing}"
+                f"Training data missing required columns for {cfg.forecast_model} model: {missing}"
             )
-        model.fit(train_df[fit_cols])
     else:
         # Fallback for other models (e.g. logtrend)
-        model.fit(train_df[["year", "remittance_usd"]])
+        fit_cols = ["year", "remittance_usd"]
+    with span("fit", rows=len(train_df)):
+        model = fit_forecast_model(cfg.forecast_model, train_df[fit_cols], model_cache)
 
     # Training fitted values
-    train_pred = model.predict(train_df["year"].tolist())
-    train_df = train_df.merge(train_pred, on="year", how="left")
+    with span("predict", rows=len(train_df)):
+        train_pred = model.predict(train_df["year"].tolist())
+    with span("merge", rows=len(train_df)):
+        train_df = train_df.merge(train_pred, on="year", how="left")
 
     # Validation
     validation_df = df.loc[val_mask].copy()
@@ -179,12 +207,31 @@ def train_validate_forecast_corridor(
 
     # Forecast (exclude validation year from future list)
     future_years = [y for y in forecast_years if y != validation_year]
+    forecast_cols = ["corridor_id", "year", "remittance_hat_usd"]
+    if intervals is not None:
+        forecast_cols += list(intervals.labels)
+    samples = None
     if future_years:
-        future_pred_df = model.predict(future_years)
+        if intervals is not None:
+            future_fx = None
+            if needs_fx:
+                future_fx = df.set_index("year")[cfg.fx_col].reindex(future_years).tolist()
+            with span("bootstrap", rows=intervals.n_draws):
+                future_pred_df, samples = bootstrap_forecast(
+                    model,
+                    future_years,
+                    usd_kes=future_fx,
+                    n_draws=intervals.n_draws,
+                    quantiles=intervals.quantiles,
+                    seed=intervals.seed,
+                )
+        else:
+            with span("predict", rows=len(future_years)):
+                future_pred_df = model.predict(future_years)
         future_df = future_pred_df.copy()
         future_df["corridor_id"] = cfg.corridor_id
     else:
-        future_df = pd.DataFrame(columns=["corridor_id", "year", "remittance_hat_usd"])
+        future_df = pd.DataFrame(columns=forecast_cols)
 
     # Tag corridor id
     train_df["corridor_id"] = cfg.corridor_id
@@ -207,17 +254,19 @@ def train_validate_forecast_corridor(
     ]
     validation_df = validation_df[validation_cols]
 
-    future_df = future_df[
-        ["corridor_id", "year", "remittance_hat_usd"]
-    ]
+    future_df = future_df[forecast_cols]
 
-    return {
+    out = {
         "train": train_df,
         "validation": validation_df,
         "forecast": future_df,
     }
+    if samples is not None:
+        out["forecast_samples"] = samples
+    return out
 
 
+@traced_pipeline("corridor_foe_pipeline")
 def run_corridor_foe_pipeline(
     annual_df: pd.DataFrame,
     cfg: Optional[CorridorFlowConfig] = None,
@@ -226,6 +275,10 @@ def run_corridor_foe_pipeline(
     validation_year: int = 2024,
     forecast_years: Optional[List[int]] = None,
     fx_df: Optional[pd.DataFrame] = None,
+    cache: Optional[ResultCache] = None,
+    trace: Union[bool, Tracer] = False,
+    model_cache: Optional[FittedModelCache] = None,
+    intervals: Optional[BootstrapConfig] = None,
 ) -> Dict[str, Any]:
     """
     B4 pipeline:
@@ -233,29 +286,64 @@ def run_corridor_foe_pipeline(
     - Normalize raw annual corridor series.
     - Run FX-adjusted forecasting via the factory model (default: 'fx_linear').
     - Maintain FOE pipeline and FOE-facing schema exactly as before.
+
+    cache: optional ResultCache. Results of the default FOE callback are
+    looked up / stored under a hash of the input frames, cfg, the resolved
+    settlement calendar, the year parameters and PIPELINE_VERSION; custom
+    callbacks always run.
+    model_cache: optional FittedModelCache for the forecasting fit.
+    intervals: optional BootstrapConfig; adds "forecast_samples" and, with
+    the default FOE callback, "foe_samples" (FOE over every draw).
+    trace: True (or a Tracer) records per-stage timings, row counts and
+    memory; the tracer is returned under "trace" (src.foe.tracing).
     """
     cfg = cfg or CorridorFlowConfig()
     forecast_years = forecast_years or [2025]
 
+    cache_key = None
+    if cache is not None and foe_callback is None:
+        cache_key = hash_payload(
+            "src.data.corridor_flow_v2.run_corridor_foe_pipeline",
+            PIPELINE_VERSION,
+            CACHE_FORMAT_VERSION,
+            annual_df,
+            cfg,
+            corridor_calendar(cfg),  # registered calendars change FOE results
+            train_end_year,
+            validation_year,
+            forecast_years,
+            fx_df,
+            intervals,
+        )
+        with span("cache_lookup"):
+            cached = cache.get(cache_key)
+        if cached is not None:
+            return {"cfg": cfg, **cached}
+
     # Normalize (this may already carry fx_col if present)
-    base_df = prepare_annual_corridor_series(annual_df, cfg)
+    with span("normalize", rows=len(annual_df)):
+        base_df = prepare_annual_corridor_series(annual_df, cfg)
 
     # Forecast segments
-    segments = train_validate_forecast_corridor(
-        base_df,
-        cfg=CorridorFlowConfig(
-            corridor_id=cfg.corridor_id,
-            source=cfg.source,
-            value_col="remittance_usd",
-            year_col="year",
-            forecast_model=cfg.forecast_model,
-            fx_col=cfg.fx_col,
-        ),
-        train_end_year=train_end_year,
-        validation_year=validation_year,
-        forecast_years=forecast_years,
-        fx_df=fx_df,
-    )
+    with span("forecast", rows=len(base_df)):
+        segments = train_validate_forecast_corridor(
+            base_df,
+            cfg=CorridorFlowConfig(
+                corridor_id=cfg.corridor_id,
+                source=cfg.source,
+                value_col="remittance_usd",
+                year_col="year",
+                forecast_model=cfg.forecast_model,
+                fx_col=cfg.fx_col,
+            ),
+            train_end_year=train_end_year,
+            validation_year=validation_year,
+            forecast_years=forecast_years,
+            fx_df=fx_df,
+            model_cache=model_cache,
+            intervals=intervals,
+        )
+    draws = segments.pop("forecast_samples", None)
 
     # Full annual series (historical + pred) for FOE
     full_annual = pd.concat(
@@ -264,15 +352,34 @@ def run_corridor_foe_pipeline(
         sort=False,
     ).sort_values("year")
 
+    extras: Dict[str, Any] = {}
+    if draws is not None:
+        sample_years = segments["forecast"]["year"].to_numpy(dtype=np.int64)
+        extras["forecast_samples"] = {"years": sample_years, "draws": draws}
+        if foe_callback is None:
+            with span("foe_samples", rows=len(draws)):
+                extras["foe_samples"] = foe_corridor_sample_runner(
+                    full_annual, cfg, sample_years, draws
+                )
+
     # FOE pipeline unchanged
     foe_callback = foe_callback or default_foe_callback
-    foe_result = foe_callback(full_annual, cfg) if foe_callback else None
+    with span("foe", rows=len(full_annual)):
+        foe_result = foe_callback(full_annual, cfg) if foe_callback else None
+
+    if cache_key is not None:
+        with span("cache_store"):
+            cache.put(
+                cache_key,
+                {"segments": segments, "full_annual": full_annual, "foe": foe_result, **extras},
+            )
 
     return {
         "cfg": cfg,
         "segments": segments,
         "full_annual": full_annual,
         "foe": foe_result,
+        **extras,
     }
 
 
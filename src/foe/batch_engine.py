@@ -0,0 +1,189 @@
+# src/foe/batch_engine.py
+
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.foe.flow_profile import expand_monthly_arrays
+from src.foe.settlement_calendar import SettlementCalendar
+
+
+def _long_layout(flows_df: pd.DataFrame):
+    """
+    Daily layout of a long frame: corridor ids, the zero-padded
+    (corridors x days) flow matrix, days per corridor, and the corridor,
+    position and date of every daily value.
+    """
+    codes, corridor_ids = pd.factorize(flows_df["corridor_id"])
+    order = np.argsort(codes, kind="stable")  # keep row order within a corridor
+    row, dates, _, daily = expand_monthly_arrays(
+        flows_df["year"].to_numpy(dtype=np.int64)[order],
+        flows_df["month"].to_numpy(dtype=np.int64)[order],
+        flows_df["flow_usd"].to_numpy(dtype=np.float64)[order],
+    )
+
+    n_corridors = len(corridor_ids)
+    corridor = codes[order][row]
+    days = np.bincount(corridor, minlength=n_corridors)
+    position = np.arange(len(daily)) - (np.cumsum(days) - days)[corridor]
+    width = int(days.max()) if n_corridors else 0
+
+    flow_matrix = np.zeros((n_corridors, width), dtype=np.float64)
+    flow_matrix.reshape(-1)[corridor * width + position] = daily
+    return [str(c) for c in corridor_ids], flow_matrix, days, (corridor, position, dates)
+
+
+def _grid_layout(
+    flows: np.ndarray,
+    start_year: int,
+    start_month: int,
+    corridor_ids: Optional[Sequence[str]],
+):
+    """Same as _long_layout for a (corridors x months) array; one shared calendar."""
+    n_corridors, n_months = flows.shape
+    if corridor_ids is None:
+        corridor_ids = [str(i) for i in range(n_corridors)]
+    elif len(corridor_ids) != n_corridors:
+        raise ValueError(f"Expected {n_corridors} corridor ids, got {len(corridor_ids)}.")
+
+    months = (start_year * 12 + start_month - 1) + np.arange(n_months)
+    row, dates, _, _ = expand_monthly_arrays(months // 12, months % 12 + 1, np.zeros(n_months))
+    days_in_month = np.bincount(row, minlength=n_months)
+
+    flow_matrix = (np.asarray(flows, dtype=np.float64) / days_in_month)[:, row]
+    days = np.full(n_corridors, len(row), dtype=np.int64)
+    return list(corridor_ids), flow_matrix, days, dates
+
+
+def _calendar_settled(
+    cumulative: np.ndarray,
+    days: np.ndarray,
+    cells: Any,
+    settlement_delay_days: int,
+    calendar: SettlementCalendar,
+) -> np.ndarray:
+    """Settled cumulative flow of every corridor under a business-day calendar."""
+    if not isinstance(cells, tuple):
+        # Grid layout: every corridor shares one date axis, so one gather.
+        on_time, late = calendar.settled_index(cells, settlement_delay_days)
+        padded = np.concatenate((np.zeros((len(cumulative), 1)), cumulative), axis=1)
+        settled = padded[:, on_time + 1]
+        if calendar.cutoff_hour is not None:
+            frac = calendar.late_fraction
+            settled = (1.0 - frac) * settled + frac * padded[:, late + 1]
+        return settled
+
+    # Long layout: corridors may cover different dates. Daily values are
+    # grouped by corridor in time order, so each corridor is one slice.
+    _, _, dates = cells
+    settled = cumulative.copy()  # padding: everything settled, float 0
+    starts = np.cumsum(days) - days
+    for c, (start, n) in enumerate(zip(starts, days)):
+        if n:
+            settled[c, :n] = calendar.settled_flow(
+                cumulative[c, :n], dates[start : start + n], settlement_delay_days
+            )
+    return settled
+
+
+def run_foe_batch(
+    flows: Union[pd.DataFrame, np.ndarray],
+    settlement_delay_days: int = 2,
+    start_year: Optional[int] = None,
+    start_month: int = 1,
+    corridor_ids: Optional[Sequence[str]] = None,
+    return_matrix: bool = False,
+    calendar: Optional[SettlementCalendar] = None,
+) -> Dict[str, Any]:
+    """
+    run_foe for many corridors at once.
+
+    flows is either
+      - a long DataFrame with columns [corridor_id, year, month, flow_usd]
+        (each corridor's rows in time order, as run_foe expects), or
+      - a (corridors x months) array of monthly flows starting at
+        start_year / start_month, with optional corridor_ids.
+
+    All corridors are expanded to days in one pass and laid out as a
+    zero-padded (corridors x days) matrix, so cumulative flow, settlement
+    lag and peaks are single NumPy operations along axis 1.
+
+    calendar: business-day settlement calendar applied to every corridor,
+    as run_foe(..., calendar=calendar). None means calendar-day
+    settlement; unlike run_foe there is no lookup of registered corridor
+    calendars, so pass the calendar explicitly.
+
+    Returns a dict with
+      - metrics: DataFrame, one row per corridor, with corridor_id and the
+        summarize_float_metrics fields (same values as run_foe with
+        the same calendar)
+      - dates, float_matrix (only with return_matrix=True): the calendar
+        days covered by any corridor and the float_required of every
+        corridor on them, NaN where a corridor has no data
+    """
+    if settlement_delay_days < 0:
+        raise ValueError("settlement_delay_days must be non-negative.")
+
+    if isinstance(flows, pd.DataFrame):
+        ids, flow_matrix, days, cells = _long_layout(flows)
+    else:
+        grid = np.asarray(flows)
+        if grid.ndim != 2:
+            raise ValueError("Array flows must be 2-D (corridors x months).")
+        if start_year is None:
+            raise ValueError("start_year is required for array flows.")
+        ids, flow_matrix, days, cells = _grid_layout(grid, start_year, start_month, corridor_ids)
+
+    n_corridors, width = flow_matrix.shape
+    cumulative = np.cumsum(flow_matrix, axis=1)
+    if calendar is not None:
+        float_matrix = cumulative - _calendar_settled(
+            cumulative, days, cells, settlement_delay_days, calendar
+        )
+    else:
+        float_matrix = cumulative.copy()
+        if settlement_delay_days:
+            float_matrix[:, settlement_delay_days:] -= cumulative[:, :-settlement_delay_days]
+        else:
+            float_matrix[:] = 0.0
+
+    has_days = days > 0
+    last = np.maximum(days - 1, 0)
+    if width == 0:
+        peak = final = np.full(n_corridors, np.nan)
+    else:
+        if np.all(days == width):
+            peak = float_matrix.max(axis=1)
+        else:
+            padded = np.arange(width)[None, :] >= days[:, None]
+            peak = np.where(padded, -np.inf, float_matrix).max(axis=1)
+        peak = np.where(has_days, peak, np.nan)
+        final = np.where(has_days, float_matrix[np.arange(n_corridors), last], np.nan)
+
+    metrics = pd.DataFrame(
+        {
+            "corridor_id": ids,
+            "peak_float_usd": peak,
+            "final_float_usd": final,
+            "total_flow_usd": flow_matrix.sum(axis=1),
+            "days": days.astype(np.int64),
+        }
+    )
+
+    result: Dict[str, Any] = {"metrics": metrics}
+    if return_matrix:
+        if isinstance(cells, tuple):
+            corridor, position, dates = cells
+            day_number = dates.astype(np.int64)
+            origin = int(day_number.min()) if len(day_number) else 0
+            span = int(day_number.max()) - origin + 1 if len(day_number) else 0
+            aligned = np.full((n_corridors, span), np.nan)
+            aligned[corridor, day_number - origin] = float_matrix[corridor, position]
+            result["dates"] = np.arange(origin, origin + span).astype("datetime64[D]")
+            result["float_matrix"] = aligned
+        else:
+            result["dates"] = cells
+            result["float_matrix"] = float_matrix
+
+    return result
@@ -1,29 +1,81 @@
 # src/foe/corridor_adapter.py
 
+from typing import Mapping, Optional, Sequence, Union
+
+import numpy as np
 import pandas as pd
 
-def corridor_to_foe_input(annual_path: pd.DataFrame) -> pd.DataFrame:
+# A 12-value monthly profile (January first), or one profile per corridor_id.
+Seasonality = Union[Sequence[float], Mapping[str, Sequence[float]]]
+
+
+def _month_shares(profile: Sequence[float]) -> np.ndarray:
+    """Normalize a 12-value monthly profile to shares summing to 1."""
+    shares = np.asarray(profile, dtype=np.float64)
+    if shares.shape != (12,):
+        raise ValueError("Seasonality profiles must have 12 monthly values.")
+    total = shares.sum()
+    if total <= 0 or np.any(shares < 0):
+        raise ValueError("Seasonality profiles must be non-negative with a positive sum.")
+    return shares / total
+
+
+def _share_matrix(
+    annual_path: pd.DataFrame,
+    seasonality: Seasonality,
+) -> np.ndarray:
+    """(rows x 12) monthly shares; corridors without a profile split evenly."""
+    if not isinstance(seasonality, Mapping):
+        return np.broadcast_to(_month_shares(seasonality), (len(annual_path), 12))
+
+    if "corridor_id" not in annual_path.columns:
+        raise KeyError("Per-corridor seasonality requires a 'corridor_id' column.")
+    corridor_ids = list(seasonality)
+    profiles = np.vstack(
+        [_month_shares(seasonality[c]) for c in corridor_ids] + [np.full(12, 1.0 / 12.0)]
+    )
+    # Unmapped corridors get the trailing even profile (index -1).
+    codes = pd.Index(corridor_ids).get_indexer(annual_path["corridor_id"])
+    return profiles[codes]
+
+
+def annual_amounts(annual_path: pd.DataFrame) -> np.ndarray:
+    """Actual remittance_usd where present, remittance_hat_usd otherwise."""
+    if "remittance_usd" in annual_path.columns:
+        amount = annual_path["remittance_usd"]
+        if "remittance_hat_usd" in annual_path.columns:
+            amount = amount.where(amount.notna(), annual_path["remittance_hat_usd"])
+    else:
+        amount = annual_path["remittance_hat_usd"]
+    return amount.to_numpy(dtype=np.float64)
+
+
+def corridor_to_foe_input(
+    annual_path: pd.DataFrame,
+    seasonality: Optional[Seasonality] = None,
+) -> pd.DataFrame:
     """
     Expand annual corridor flows into a synthetic monthly profile
     for FOE v1. Assumes annual_path has columns:
         - year
         - remittance_hat_usd OR remittance_usd
+    Actual remittance_usd is used where present, remittance_hat_usd
+    otherwise.
+
+    seasonality: 12 monthly weights (e.g. a December spike) applied to
+    every row, or a mapping corridor_id -> weights (rows of other
+    corridors split evenly). Weights are normalized so annual totals are
+    preserved. Without seasonality each month gets amount / 12.
     """
-    rows = []
-    for _, row in annual_path.iterrows():
-        year = int(row["year"])
-        amount = float(
-            row["remittance_usd"]
-            if not pd.isna(row.get("remittance_usd"))
-            else row["remittance_hat_usd"]
-        )
-        monthly = amount / 12.0
-
-        for m in range(1, 13):
-            rows.append({
-                "year": year,
-                "month": m,
-                "flow_usd": monthly,
-            })
-
-    return pd.DataFrame(rows)
+    amount = annual_amounts(annual_path)
+
+    if seasonality is None:
+        monthly = np.repeat(amount / 12.0, 12)
+    else:
+        monthly = (amount[:, None] * _share_matrix(annual_path, seasonality)).ravel()
+
+    return pd.DataFrame({
+        "year": np.repeat(annual_path["year"].to_numpy(dtype=np.int64), 12),
+        "month": np.tile(np.arange(1, 13, dtype=np.int64), len(amount)),
+        "flow_usd": monthly,
+    })
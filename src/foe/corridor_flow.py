@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Union
 
 import numpy as np
 import pandas as pd
 
-from src.foe.corridor_foe_runner import foe_corridor_runner
-from src.foe.forecasting import get_forecast_model
-from src.foe.forecasting.model_fx_linear import FXLinearModel
+from src.foe.corridor_foe_runner import (
+    corridor_calendar,
+    foe_corridor_runner,
+    foe_corridor_sample_runner,
+)
+from src.foe.hashing import hash_payload
+from src.foe.result_cache import CACHE_FORMAT_VERSION, ResultCache
+from src.foe.settlement_calendar import SettlementCalendar
+from src.foe.tracing import Tracer, span, traced_pipeline
+from src.foe.forecasting.bootstrap import BootstrapConfig, bootstrap_forecast
+from src.foe.forecasting.persistence import FittedModelCache, fit_forecast_model
 
 
 # ---------- Types & Config ----------
@@ -28,19 +36,45 @@ class CorridorFlowConfig:
     # FX column (must match what FXLinearModel expects)
     fx_col: str = "usd_kes"
 
+    # Settlement calendar for the FOE; None = the calendar registered for
+    # corridor_id, if any, else calendar-day settlement.
+    settlement_calendar: Optional[SettlementCalendar] = None
+
 
 FOECallback = Callable[[pd.DataFrame, CorridorFlowConfig], Any]
 
+# Part of every result-cache key: bump when the pipeline's output for the
+# same inputs changes, so stale cached results are not served.
+PIPELINE_VERSION = "1"
+
 
 # ---------- Core helpers ----------
 
 def _check_monotonic_years(df: pd.DataFrame, year_col: str) -> pd.DataFrame:
-    df_sorted = df.sort_values(year_col).reset_index(drop=True)
-    if df_sorted[year_col].duplicated().any():
-        raise ValueError("Duplicate years found in annual corridor series.")
+    with span("check_monotonic_years", rows=len(df)):
+        df_sorted = df.sort_values(year_col).reset_index(drop=True)
+        if df_sorted[year_col].duplicated().any():
+            raise ValueError("Duplicate years found in annual corridor series.")
     return df_sorted
 
 
+def _forecast_columns(intervals: Optional[BootstrapConfig]) -> List[str]:
+    cols = ["corridor_id", "year", "remittance_hat_usd"]
+    return cols + list(intervals.labels) if intervals is not None else cols
+
+
+def _bootstrap_future(model, future_years, intervals: BootstrapConfig, usd_kes=None):
+    with span("bootstrap", rows=intervals.n_draws):
+        return bootstrap_forecast(
+            model,
+            future_years,
+            usd_kes=usd_kes,
+            n_draws=intervals.n_draws,
+            quantiles=intervals.quantiles,
+            seed=intervals.seed,
+        )
+
+
 # ---------- Public API ----------
 
 def prepare_annual_corridor_series(
@@ -83,20 +117,24 @@ def _fit_and_predict_logtrend(
     validation_year: int,
     forecast_years: List[int],
     corridor_id: str,
-) -> Dict[str, pd.DataFrame]:
+    model_cache: Optional[FittedModelCache] = None,
+    intervals: Optional[BootstrapConfig] = None,
+) -> Dict[str, Any]:
     """
     Old baseline path: log-trend model without FX.
     """
-    model = get_forecast_model("logtrend")
-    model.fit(df[["year", "remittance_usd"]])
+    with span("fit", rows=len(df)):
+        model = fit_forecast_model("logtrend", df[["year", "remittance_usd"]], model_cache)
 
     # Training fitted values
     train_mask = df["year"] <= train_end_year
     val_mask = df["year"] == validation_year
 
     train_df = df.loc[train_mask].copy()
-    train_pred = model.predict(train_df["year"].tolist())
-    train_df = train_df.merge(train_pred, on="year", how="left")
+    with span("predict", rows=len(train_df)):
+        train_pred = model.predict(train_df["year"].tolist())
+    with span("merge", rows=len(train_df)):
+        train_df = train_df.merge(train_pred, on="year", how="left")
 
     # Validation
     validation_df = df.loc[val_mask].copy()
@@ -122,12 +160,17 @@ def _fit_and_predict_logtrend(
 
     # Forecast
     future_years = [y for y in forecast_years if y != validation_year]
+    samples = None
     if future_years:
-        future_pred_df = model.predict(future_years)
+        if intervals is not None:
+            future_pred_df, samples = _bootstrap_future(model, future_years, intervals)
+        else:
+            with span("predict", rows=len(future_years)):
+                future_pred_df = model.predict(future_years)
         future_df = future_pred_df.copy()
         future_df["corridor_id"] = corridor_id
     else:
-        future_df = pd.DataFrame(columns=["corridor_id", "year", "remittance_hat_usd"])
+        future_df = pd.DataFrame(columns=_forecast_columns(intervals))
 
     # Tag corridor id
     train_df["corridor_id"] = corridor_id
@@ -152,13 +195,16 @@ def _fit_and_predict_logtrend(
     ]
     validation_df = validation_df[validation_cols]
 
-    future_df = future_df[["corridor_id", "year", "remittance_hat_usd"]]
+    future_df = future_df[_forecast_columns(intervals)]
 
-    return {
+    out = {
         "train": train_df,
         "validation": validation_df,
         "forecast": future_df,
     }
+    if samples is not None:
+        out["forecast_samples"] = samples
+    return out
 
 
 def _fit_and_predict_fx_linear(
@@ -167,7 +213,9 @@ def _fit_and_predict_fx_linear(
     train_end_year: int,
     validation_year: int,
     forecast_years: List[int],
-) -> Dict[str, pd.DataFrame]:
+    model_cache: Optional[FittedModelCache] = None,
+    intervals: Optional[BootstrapConfig] = None,
+) -> Dict[str, Any]:
     """
     FX-adjusted path using FXLinearModel.
 
@@ -194,20 +242,25 @@ def _fit_and_predict_fx_linear(
     if train_df.empty:
         raise ValueError("Training set is empty. Check train_end_year.")
 
-    # Model
-    model = get_forecast_model("fx_linear")
+    # Model (imported here: model modules load on first use)
+    from src.foe.forecasting.model_fx_linear import FXLinearModel
+
+    # Fit (or reuse a cached fit of the identical training slice)
+    with span("fit", rows=len(train_df)):
+        model = fit_forecast_model(
+            "fx_linear", train_df[["year", "remittance_usd", cfg.fx_col]], model_cache
+        )
     if not isinstance(model, FXLinearModel):
         raise TypeError("get_forecast_model('fx_linear') must return FXLinearModel.")
 
-    # Fit
-    model.fit(train_df[["year", "remittance_usd", cfg.fx_col]])
-
     # Train predictions (using actual FX)
-    train_y_hat = model.predict_with_features(
-        years=train_df["year"].tolist(),
-        usd_kes=train_df[cfg.fx_col].tolist(),
-    )
-    train_df = train_df.merge(train_y_hat, on="year", how="left")
+    with span("predict", rows=len(train_df)):
+        train_y_hat = model.predict_with_features(
+            years=train_df["year"].tolist(),
+            usd_kes=train_df[cfg.fx_col].tolist(),
+        )
+    with span("merge", rows=len(train_df)):
+        train_df = train_df.merge(train_y_hat, on="year", how="left")
 
     # Validation
     validation_df = df.loc[val_mask].copy()
@@ -246,6 +299,7 @@ def _fit_and_predict_fx_linear(
 
     # Forecast
     future_years = [y for y in forecast_years if y != validation_year]
+    samples = None
     if future_years:
         future_df = df[df["year"].isin(future_years)].copy()
         if future_df.empty:
@@ -259,15 +313,22 @@ def _fit_and_predict_fx_linear(
                 f"Missing FX '{cfg.fx_col}' for forecast years: {missing_years}"
             )
 
-        future_pred_df = model.predict_with_features(
-            years=future_df["year"].tolist(),
-            usd_kes=future_df[cfg.fx_col].tolist(),
-        )
-        future_df = future_df.merge(future_pred_df, on="year", how="left")
+        if intervals is not None:
+            future_pred_df, samples = _bootstrap_future(
+                model, future_df["year"].tolist(), intervals, future_df[cfg.fx_col].tolist()
+            )
+        else:
+            with span("predict", rows=len(future_df)):
+                future_pred_df = model.predict_with_features(
+                    years=future_df["year"].tolist(),
+                    usd_kes=future_df[cfg.fx_col].tolist(),
+                )
+        with span("merge", rows=len(future_df)):
+            future_df = future_df.merge(future_pred_df, on="year", how="left")
         future_df["corridor_id"] = cfg.corridor_id
-        future_df = future_df[["corridor_id", "year", "remittance_hat_usd"]]
+        future_df = future_df[_forecast_columns(intervals)]
     else:
-        future_df = pd.DataFrame(columns=["corridor_id", "year", "remittance_hat_usd"])
+        future_df = pd.DataFrame(columns=_forecast_columns(intervals))
 
     # Tag corridor id
     train_df["corridor_id"] = cfg.corridor_id
@@ -292,11 +353,14 @@ def _fit_and_predict_fx_linear(
     ]
     validation_df = validation_df[validation_cols]
 
-    return {
+    out = {
         "train": train_df,
         "validation": validation_df,
         "forecast": future_df,
     }
+    if samples is not None:
+        out["forecast_samples"] = samples
+    return out
 
 
 def train_validate_forecast_corridor(
@@ -305,11 +369,19 @@ def train_validate_forecast_corridor(
     train_end_year: int = 2023,
     validation_year: int = 2024,
     forecast_years: Optional[List[int]] = None,
-) -> Dict[str, pd.DataFrame]:
+    model_cache: Optional[FittedModelCache] = None,
+    intervals: Optional[BootstrapConfig] = None,
+) -> Dict[str, Any]:
     """
     Wrapper that selects between:
       - logtrend path (no FX)
       - fx_linear path (with usd_kes)
+
+    model_cache: optional FittedModelCache; fits of a training slice seen
+    before are reused instead of refit.
+    intervals: optional BootstrapConfig. The forecast frame then gains
+    quantile columns (q05, q50, q95 by default) and the result a
+    "forecast_samples" (draws x forecast years) matrix.
     """
     cfg = cfg or CorridorFlowConfig()
     forecast_years = forecast_years or [2025]
@@ -334,6 +406,8 @@ def train_validate_forecast_corridor(
             train_end_year=train_end_year,
             validation_year=validation_year,
             forecast_years=forecast_years,
+            model_cache=model_cache,
+            intervals=intervals,
         )
     else:
         # fallback to logtrend baseline
@@ -343,9 +417,12 @@ def train_validate_forecast_corridor(
             validation_year=validation_year,
             forecast_years=forecast_years,
             corridor_id=cfg.corridor_id,
+            model_cache=model_cache,
+            intervals=intervals,
         )
 
 
+@traced_pipeline("corridor_foe_pipeline")
 def run_corridor_foe_pipeline(
     annual_df: pd.DataFrame,
     cfg: Optional[CorridorFlowConfig] = None,
@@ -353,6 +430,10 @@ def run_corridor_foe_pipeline(
     train_end_year: int = 2023,
     validation_year: int = 2024,
     forecast_years: Optional[List[int]] = None,
+    cache: Optional[ResultCache] = None,
+    trace: Union[bool, Tracer] = False,
+    model_cache: Optional[FittedModelCache] = None,
+    intervals: Optional[BootstrapConfig] = None,
 ) -> Dict[str, Any]:
     """
     B4 pipeline:
@@ -360,26 +441,63 @@ def run_corridor_foe_pipeline(
     - Normalize raw annual corridor series.
     - Run chosen forecasting model.
     - Feed combined path into FOE.
+
+    cache: optional ResultCache. Results of the default FOE callback are
+    looked up / stored under a hash of the input frame, cfg, the resolved
+    settlement calendar, the year parameters and PIPELINE_VERSION; custom
+    callbacks always run.
+    model_cache: optional FittedModelCache for the forecasting fits.
+    intervals: optional BootstrapConfig for residual-bootstrap forecast
+    intervals. The result then also holds "forecast_samples" ({"years",
+    "draws"}) and, with the default FOE callback, "foe_samples": the FOE
+    run over every draw (see foe_corridor_sample_runner).
+    trace: True (or a Tracer, e.g. Tracer(trace_memory=True)) records
+    per-stage wall/CPU time, row counts and memory; the tracer is returned
+    under "trace". See src.foe.tracing.
     """
     cfg = cfg or CorridorFlowConfig()
     forecast_years = forecast_years or [2025]
 
-    base_df = prepare_annual_corridor_series(annual_df, cfg)
-
-    segments = train_validate_forecast_corridor(
-        base_df,
-        cfg=CorridorFlowConfig(
-            corridor_id=cfg.corridor_id,
-            source=cfg.source,
-            value_col="remittance_usd",
-            year_col="year",
-            forecast_model=cfg.forecast_model,
-            fx_col=cfg.fx_col,
-        ),
-        train_end_year=train_end_year,
-        validation_year=validation_year,
-        forecast_years=forecast_years,
-    )
+    cache_key = None
+    if cache is not None and foe_callback is None:
+        cache_key = hash_payload(
+            "src.foe.corridor_flow.run_corridor_foe_pipeline",
+            PIPELINE_VERSION,
+            CACHE_FORMAT_VERSION,
+            annual_df,
+            cfg,
+            corridor_calendar(cfg),  # registered calendars change FOE results
+            train_end_year,
+            validation_year,
+            forecast_years,
+            intervals,
+        )
+        with span("cache_lookup"):
+            cached = cache.get(cache_key)
+        if cached is not None:
+            return {"cfg": cfg, **cached}
+
+    with span("normalize", rows=len(annual_df)):
+        base_df = prepare_annual_corridor_series(annual_df, cfg)
+
+    with span("forecast", rows=len(base_df)):
+        segments = train_validate_forecast_corridor(
+            base_df,
+            cfg=CorridorFlowConfig(
+                corridor_id=cfg.corridor_id,
+                source=cfg.source,
+                value_col="remittance_usd",
+                year_col="year",
+                forecast_model=cfg.forecast_model,
+                fx_col=cfg.fx_col,
+            ),
+            train_end_year=train_end_year,
+            validation_year=validation_year,
+            forecast_years=forecast_years,
+            model_cache=model_cache,
+            intervals=intervals,
+        )
+    draws = segments.pop("forecast_samples", None)
 
     full_annual = pd.concat(
         [segments["train"], segments["validation"], segments["forecast"]],
@@ -387,14 +505,33 @@ def run_corridor_foe_pipeline(
         sort=False,
     ).sort_values("year")
 
+    extras: Dict[str, Any] = {}
+    if draws is not None:
+        sample_years = segments["forecast"]["year"].to_numpy(dtype=np.int64)
+        extras["forecast_samples"] = {"years": sample_years, "draws": draws}
+        if foe_callback is None:
+            with span("foe_samples", rows=len(draws)):
+                extras["foe_samples"] = foe_corridor_sample_runner(
+                    full_annual, cfg, sample_years, draws
+                )
+
     foe_callback = foe_callback or default_foe_callback
-    foe_result = foe_callback(full_annual, cfg) if foe_callback else None
+    with span("foe", rows=len(full_annual)):
+        foe_result = foe_callback(full_annual, cfg) if foe_callback else None
+
+    if cache_key is not None:
+        with span("cache_store"):
+            cache.put(
+                cache_key,
+                {"segments": segments, "full_annual": full_annual, "foe": foe_result, **extras},
+            )
 
     return {
         "cfg": cfg,
         "segments": segments,
         "full_annual": full_annual,
         "foe": foe_result,
+        **extras,
     }
 
 
@@ -1,31 +1,139 @@
 # src/foe/corridor_foe_runner.py
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence
+import numpy as np
 import pandas as pd
 
-from .corridor_adapter import corridor_to_foe_input
+from .batch_engine import run_foe_batch
+from .corridor_adapter import Seasonality, _share_matrix, annual_amounts, corridor_to_foe_input
 from .engine import run_foe  # your existing FOE v1 entrypoint
+from .monte_carlo import run_foe_monte_carlo
+from .settlement_calendar import SettlementCalendar, resolve_calendar
+from .tracing import span
+
+
+def corridor_calendar(cfg: Any) -> Optional[SettlementCalendar]:
+    """
+    Settlement calendar for cfg: cfg.settlement_calendar if set, else the
+    one registered for cfg.corridor_id, else None (calendar days).
+    """
+    return resolve_calendar(cfg.corridor_id, getattr(cfg, "settlement_calendar", None))
 
 
 def foe_corridor_runner(
     annual_path: pd.DataFrame,
-    cfg: Any
+    cfg: Any,
+    seasonality: Optional[Seasonality] = None,
 ) -> Dict[str, Any]:
     """
     Convert annual path → intra-year synthetic flows → FOE engine.
     Returns FOE metrics/results.
+
+    seasonality: optional monthly profile(s), see corridor_to_foe_input.
     """
 
     # Convert annual totals to monthly flow schedule
-    monthly_flows = corridor_to_foe_input(annual_path)
+    with span("foe.adapter", rows=len(annual_path)):
+        monthly_flows = corridor_to_foe_input(annual_path, seasonality=seasonality)
 
     # Feed into FOE v1
     foe_result = run_foe(
         corridor_id=cfg.corridor_id,
-        flows_df=monthly_flows
+        flows_df=monthly_flows,
+        calendar=corridor_calendar(cfg),
     )
 
     return {
         "monthly_flows": monthly_flows,
         "foe_result": foe_result
     }
+
+
+def foe_corridor_monte_carlo_runner(
+    annual_path: pd.DataFrame,
+    cfg: Any,
+    n_paths: int = 10_000,
+    seasonality: Optional[Seasonality] = None,
+    **mc_kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Monte Carlo counterpart of foe_corridor_runner: same monthly flows,
+    fed to run_foe_monte_carlo (extra keyword arguments are passed on).
+    Use functools.partial to plug it in as a foe_callback.
+    """
+    with span("foe.adapter", rows=len(annual_path)):
+        monthly_flows = corridor_to_foe_input(annual_path, seasonality=seasonality)
+
+    mc_kwargs.setdefault("calendar", corridor_calendar(cfg))
+    with span("foe.monte_carlo", rows=len(monthly_flows)):
+        foe_result = run_foe_monte_carlo(monthly_flows, n_paths=n_paths, **mc_kwargs)
+
+    return {
+        "monthly_flows": monthly_flows,
+        "foe_mc_result": foe_result,
+    }
+
+
+def foe_corridor_sample_runner(
+    annual_path: pd.DataFrame,
+    cfg: Any,
+    sample_years: Sequence[int],
+    samples: np.ndarray,
+    seasonality: Optional[Seasonality] = None,
+    settlement_delay_days: int = 2,
+    percentiles: Sequence[float] = (50, 95, 99),
+) -> Dict[str, Any]:
+    """
+    FOE over forecast sample matrices (e.g. bootstrap draws).
+
+    samples is (draws x len(sample_years)); each draw replaces the annual
+    amounts of sample_years in annual_path (which must cover consecutive
+    years), and all draws go through run_foe_batch as one
+    (draws x months) grid. Settlement uses corridor_calendar(cfg), the
+    same calendar as foe_corridor_runner, so the draws and the point FOE
+    share one settlement model.
+
+    Returns:
+        monthly_flows          – the point-forecast monthly flows
+        draw_metrics           – run_foe_batch metrics, one row per draw
+        peak_float_percentiles – {"p50": ..., ...} of peak float across draws
+    """
+    samples = np.atleast_2d(np.asarray(samples, dtype=np.float64))
+    years = annual_path["year"].to_numpy(dtype=np.int64)
+    if len(years) == 0 or np.any(np.diff(years) != 1):
+        raise ValueError("annual_path must cover consecutive years in order.")
+    cols = np.asarray(sample_years, dtype=np.int64) - years[0]
+    if np.any((cols < 0) | (cols >= len(years))):
+        raise ValueError("sample_years must lie within annual_path.")
+    if samples.shape[1] != len(cols):
+        raise ValueError(f"Expected {len(cols)} sample columns, got {samples.shape[1]}.")
+
+    with span("foe.adapter", rows=len(annual_path)):
+        monthly_flows = corridor_to_foe_input(annual_path, seasonality=seasonality)
+        amounts = np.repeat(annual_amounts(annual_path)[None, :], len(samples), axis=0)
+        amounts[:, cols] = samples
+        shares = (
+            np.full((len(years), 12), 1.0 / 12.0)
+            if seasonality is None
+            else _share_matrix(annual_path, seasonality)
+        )
+        monthly = (amounts[:, :, None] * shares[None, :, :]).reshape(len(samples), -1)
+
+    with span("foe.samples", rows=len(samples)):
+        batch = run_foe_batch(
+            monthly,
+            settlement_delay_days=settlement_delay_days,
+            start_year=int(years[0]),
+            calendar=corridor_calendar(cfg),
+        )
+    metrics = batch["metrics"].rename(columns={"corridor_id": "draw"})
+    metrics["draw"] = np.arange(len(metrics))
+    peak = metrics["peak_float_usd"].to_numpy()
+
+    return {
+        "monthly_flows": monthly_flows,
+        "draw_metrics": metrics,
+        "peak_float_percentiles": {
+            f"p{q:g}": float(v) for q, v in zip(percentiles, np.percentile(peak, percentiles))
+        },
+    }
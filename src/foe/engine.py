@@ -1,32 +1,63 @@
 # src/foe/engine.py
 
+from typing import Optional, Sequence
+
 import pandas as pd
 
 from src.foe.flow_profile import monthly_to_daily_flow
-from src.foe.float_optimizer import compute_float_series, summarize_float_metrics
-
-
-def run_foe(corridor_id: str, flows_df: pd.DataFrame):
+from src.foe.float_optimizer import (
+    compute_float_series,
+    compute_float_sweep,
+    summarize_float_metrics,
+)
+from src.foe.settlement_calendar import SettlementCalendar, resolve_calendar
+from src.foe.tracing import span
+
+
+def run_foe(
+    corridor_id: str,
+    flows_df: pd.DataFrame,
+    settlement_delay_days: int = 2,
+    sweep_delays: Optional[Sequence[int]] = None,
+    calendar: Optional[SettlementCalendar] = None,
+):
     """
     FOE v1:
     - Input: monthly flows_df with columns [year, month, flow_usd]
     - Expand to daily flows
     - Compute float requirement with a settlement delay
     - Return detailed series + summary metrics
+
+    sweep_delays: optionally also evaluate these settlement delays in one
+    pass (see compute_float_sweep); returned under "sweep".
+    calendar: business-day settlement calendar; defaults to the one
+    registered for corridor_id, else plain calendar-day settlement.
     """
+    calendar = resolve_calendar(corridor_id, calendar)
 
     # Step 1: monthly -> daily expansion
-    daily_df = monthly_to_daily_flow(flows_df)
+    with span("foe.daily_expansion", rows=len(flows_df)) as s:
+        daily_df = monthly_to_daily_flow(flows_df)
+        s.rows = len(daily_df)
 
-    # Step 2: compute float series with 2-day settlement delay (v1 default)
-    float_df = compute_float_series(daily_df, settlement_delay_days=2)
+    # Step 2: compute float series (2-day settlement delay by default)
+    with span("foe.float_series", rows=len(daily_df)):
+        float_df = compute_float_series(
+            daily_df, settlement_delay_days=settlement_delay_days, calendar=calendar
+        )
 
     # Step 3: summarise metrics
-    metrics = summarize_float_metrics(float_df)
+    with span("foe.metrics", rows=len(float_df)):
+        metrics = summarize_float_metrics(float_df)
 
-    return {
+    result = {
         "corridor_id": corridor_id,
         "daily_df": daily_df,
         "float_df": float_df,
         "metrics": metrics,
     }
+    if sweep_delays is not None:
+        with span("foe.sweep", rows=len(daily_df)):
+            result["sweep"] = compute_float_sweep(daily_df, sweep_delays, calendar=calendar)
+
+    return result
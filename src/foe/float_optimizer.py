@@ -1,15 +1,25 @@
 # src/foe/float_optimizer.py
 
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
 import pandas as pd
 
+from src.foe.settlement_calendar import SettlementCalendar, daily_dates
+
 
 def compute_float_series(
     daily_df: pd.DataFrame,
-    settlement_delay_days: int = 2
+    settlement_delay_days: int = 2,
+    calendar: Optional[SettlementCalendar] = None,
 ) -> pd.DataFrame:
     """
     Compute required float given daily flows and settlement delay.
     Positive flow = inbound; settlement occurs after N days.
+
+    With a SettlementCalendar the delay counts business days (weekends,
+    holidays and the intraday cut-off applied); daily_df then needs
+    [year, month, day] columns in date order.
     """
     df = daily_df.copy().reset_index(drop=True)
 
@@ -17,7 +27,12 @@ def compute_float_series(
     df["cumulative_flow"] = df["flow_usd"].cumsum()
 
     # Settlement happens after 'settlement_delay_days'
-    df["settled"] = df["cumulative_flow"].shift(settlement_delay_days).fillna(0)
+    if calendar is None:
+        df["settled"] = df["cumulative_flow"].shift(settlement_delay_days).fillna(0)
+    else:
+        df["settled"] = calendar.settled_flow(
+            df["cumulative_flow"].to_numpy(), daily_dates(df), settlement_delay_days
+        )
 
     # Float required = inbound not yet settled
     df["float_required"] = df["cumulative_flow"] - df["settled"]
@@ -38,3 +53,59 @@ def summarize_float_metrics(df: pd.DataFrame) -> dict:
         "total_flow_usd": float(df["flow_usd"].sum()),
         "days": int(len(df)),
     }
+
+
+def compute_float_sweep(
+    daily_df: pd.DataFrame,
+    settlement_delays: Sequence[int],
+    calendar: Optional[SettlementCalendar] = None,
+) -> Dict[str, Any]:
+    """
+    Evaluate many settlement delays in one pass.
+
+    The cumulative flow is computed once; the settled series for delay d
+    is the same array shifted by d days (zero before the first settlement),
+    gathered for all delays at once. With a calendar, each delay is one
+    gather through the calendar's compiled settlement index.
+
+    Returns:
+        delays       – int64 array (D,)
+        float_matrix – (D x days) float_required per delay and day; row k
+                       equals compute_float_series(daily_df, delays[k])
+        metrics      – DataFrame, one row per delay with the
+                       summarize_float_metrics fields
+    """
+    delays = np.asarray(settlement_delays, dtype=np.int64).reshape(-1)
+    if np.any(delays < 0):
+        raise ValueError("Settlement delays must be non-negative.")
+
+    flow = daily_df["flow_usd"].to_numpy(dtype=np.float64)
+    cumulative = np.cumsum(flow)
+    n_days = len(cumulative)
+
+    if calendar is None:
+        lagged = np.arange(n_days)[None, :] - delays[:, None]
+        settled = cumulative[np.maximum(lagged, 0)] if n_days else np.zeros((len(delays), 0))
+        settled[lagged < 0] = 0.0
+    else:
+        dates = daily_dates(daily_df)
+        settled = np.vstack(
+            [calendar.settled_flow(cumulative, dates, int(d)) for d in delays]
+        ).reshape(len(delays), n_days)
+    float_matrix = cumulative[None, :] - settled
+
+    metrics = pd.DataFrame(
+        {
+            "settlement_delay_days": delays,
+            "peak_float_usd": float_matrix.max(axis=1) if n_days else np.nan,
+            "final_float_usd": float_matrix[:, -1] if n_days else np.nan,
+            "total_flow_usd": float(flow.sum()),
+            "days": n_days,
+        }
+    )
+
+    return {
+        "delays": delays,
+        "float_matrix": float_matrix,
+        "metrics": metrics,
+    }
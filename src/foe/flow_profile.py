@@ -1,10 +1,94 @@
 # src/foe/flow_profile.py
 
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
 import pandas as pd
-import calendar
 
 
-def monthly_to_daily_flow(monthly_df: pd.DataFrame) -> pd.DataFrame:
+def _month_starts(year: np.ndarray, month: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """First day of each (year, month) and the number of days in it."""
+    months = ((year - 1970) * 12 + (month - 1)).astype("datetime64[M]")
+    start = months.astype("datetime64[D]")
+    end = (months + 1).astype("datetime64[D]")
+    return start, (end - start).astype(np.int64)
+
+
+def expand_monthly_arrays(
+    year: np.ndarray,
+    month: np.ndarray,
+    flow: np.ndarray,
+    weekday_weights: Optional[Iterable[float]] = None,
+    day_of_month_weights: Optional[Iterable[float]] = None,
+    holidays: Optional[Iterable] = None,
+    holiday_weight: float = 0.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Array core of monthly_to_daily_flow.
+
+    Returns (row, dates, day, daily_flow), one entry per calendar day:
+        row        – index of the source month
+        dates      – datetime64[D]
+        day        – day of month (1-based)
+        daily_flow – the month's flow spread over its days
+
+    Each day gets a weight (the product of the optional profiles below,
+    1.0 otherwise) and a month's flow is split in proportion to its days'
+    weights:
+        weekday_weights      – 7 values, Monday first
+        day_of_month_weights – 31 values, day 1 first (e.g. payday spikes)
+        holidays             – dates whose weight is multiplied by holiday_weight
+
+    Raises ValueError if some month's weights sum to zero.
+    """
+    year = np.asarray(year, dtype=np.int64)
+    month = np.asarray(month, dtype=np.int64)
+    flow = np.asarray(flow, dtype=np.float64)
+
+    start, days = _month_starts(year, month)
+    row = np.repeat(np.arange(len(days)), days)
+    first_pos = np.cumsum(days) - days
+    offset = np.arange(len(row)) - np.repeat(first_pos, days)
+    dates = start[row] + offset
+
+    weighted = (
+        weekday_weights is not None
+        or day_of_month_weights is not None
+        or holidays is not None
+    )
+    if not weighted:
+        return row, dates, offset + 1, (flow / days)[row]
+
+    weight = np.ones(len(row), dtype=np.float64)
+    if weekday_weights is not None:
+        profile = np.asarray(weekday_weights, dtype=np.float64)
+        if profile.shape != (7,):
+            raise ValueError("weekday_weights must have 7 values (Monday first).")
+        # 1970-01-01 was a Thursday (weekday 3 with Monday = 0).
+        weight *= profile[(dates.astype(np.int64) + 3) % 7]
+    if day_of_month_weights is not None:
+        profile = np.asarray(day_of_month_weights, dtype=np.float64)
+        if profile.shape != (31,):
+            raise ValueError("day_of_month_weights must have 31 values (day 1 first).")
+        weight *= profile[offset]
+    if holidays is not None:
+        holiday_dates = np.asarray(list(holidays), dtype="datetime64[D]")
+        weight[np.isin(dates, holiday_dates)] *= holiday_weight
+
+    month_weight = np.bincount(row, weights=weight, minlength=len(days))
+    if np.any(month_weight[days > 0] <= 0):
+        raise ValueError("Flow profile weights sum to zero in at least one month.")
+
+    return row, dates, offset + 1, (flow / month_weight)[row] * weight
+
+
+def monthly_to_daily_flow(
+    monthly_df: pd.DataFrame,
+    weekday_weights: Optional[Iterable[float]] = None,
+    day_of_month_weights: Optional[Iterable[float]] = None,
+    holidays: Optional[Iterable] = None,
+    holiday_weight: float = 0.0,
+) -> pd.DataFrame:
     """
     Convert monthly remittance flow into daily flow.
     Assumes `monthly_df` has columns:
@@ -12,26 +96,29 @@ def monthly_to_daily_flow(monthly_df: pd.DataFrame) -> pd.DataFrame:
         - month
         - flow_usd
 
-    v1: split evenly across all days in the month.
+    By default each month is split evenly across its days. Optional
+    weekday, day-of-month (payday) and holiday profiles reshape the split
+    within each month; the monthly totals are preserved
+    (see expand_monthly_arrays).
     """
-    rows = []
-
-    for _, row in monthly_df.iterrows():
-        year = int(row["year"])
-        month = int(row["month"])
-        flow = float(row["flow_usd"])
-
-        days_in_month = calendar.monthrange(year, month)[1]
-        daily_amount = flow / days_in_month
-
-        for day in range(1, days_in_month + 1):
-            rows.append(
-                {
-                    "year": year,
-                    "month": month,
-                    "day": day,
-                    "flow_usd": daily_amount,
-                }
-            )
-
-    return pd.DataFrame(rows)
+    year = monthly_df["year"].to_numpy(dtype=np.int64)
+    month = monthly_df["month"].to_numpy(dtype=np.int64)
+
+    row, _, day, daily = expand_monthly_arrays(
+        year,
+        month,
+        monthly_df["flow_usd"].to_numpy(dtype=np.float64),
+        weekday_weights=weekday_weights,
+        day_of_month_weights=day_of_month_weights,
+        holidays=holidays,
+        holiday_weight=holiday_weight,
+    )
+
+    return pd.DataFrame(
+        {
+            "year": year[row],
+            "month": month[row],
+            "day": day,
+            "flow_usd": daily,
+        }
+    )
@@ -1,23 +1,44 @@
 # src/foe/forecasting/__init__.py
+#
+# Model modules are imported on first use (see registry.py), so importing
+# this package stays cheap. The names below resolve lazily.
 
-from .model_base import ForecastModel
-from .model_logtrend import LogTrendModel
-from .model_fx_linear import FXLinearModel
+import importlib
 
+from .registry import (
+    ModelCapabilities,
+    available_models,
+    get_forecast_model,
+    get_model_class,
+    model_capabilities,
+    register_model,
+)
 
-def get_forecast_model(name: str = "logtrend") -> ForecastModel:
-    """
-    Simple factory for forecast models.
+_LAZY = {
+    "ForecastModel": ".model_base",
+    "LogTrendModel": ".model_logtrend",
+    "FXLinearModel": ".model_fx_linear",
+    "CorridorPanel": ".panel",
+    "fit_panel": ".panel",
+    "panel_from_long": ".panel",
+    "predict_panel": ".panel",
+    "rolling_origin_backtest": ".backtest",
+    "select_models": ".selection",
+    "bootstrap_forecast": ".bootstrap",
+    "FittedModelCache": ".persistence",
+    "fit_forecast_model": ".persistence",
+    "load_model": ".persistence",
+    "save_model": ".persistence",
+}
 
-    name:
-      - "logtrend"  -> LogTrendModel (default)
-      - "fx_linear" -> FXLinearModel (uses year + usd_kes)
-    """
-    name = name.lower()
 
-    if name == "logtrend":
-        return LogTrendModel()
-    if name == "fx_linear":
-        return FXLinearModel()
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    raise ValueError(f"Unknown forecast model: {name}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,302 @@
+# src/foe/forecasting/backtest.py
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .panel import CorridorPanel, panel_from_long
+from .registry import get_forecast_model, model_capabilities
+
+
+# ---------- Incremental fitters ----------
+#
+# Both walk the panel one year column at a time, folding the new
+# observations into running sufficient statistics, so the fit at every
+# origin costs O(corridors) instead of a refit over the whole history.
+
+class _LogTrendState:
+    """Running sums for log(y) = a + b * year, per corridor."""
+
+    def __init__(self, n_corridors: int, year0: float) -> None:
+        self.year0 = year0  # years are offset to keep the sums small
+        self.n = np.zeros(n_corridors)
+        self.sx = np.zeros(n_corridors)
+        self.sy = np.zeros(n_corridors)
+        self.sxx = np.zeros(n_corridors)
+        self.sxy = np.zeros(n_corridors)
+
+    def add(self, year: float, values: np.ndarray, fx: Optional[np.ndarray]) -> None:
+        ok = np.isfinite(values) & (values > 0)
+        w = ok.astype(np.float64)
+        x = year - self.year0
+        y = np.log(np.where(ok, values, 1.0)) * w
+        self.n += w
+        self.sx += w * x
+        self.sy += y
+        self.sxx += w * x * x
+        self.sxy += x * y
+
+    def coef(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            det = self.n * self.sxx - self.sx ** 2
+            b = (self.n * self.sxy - self.sx * self.sy) / det
+            a = (self.sy - b * self.sx) / self.n - b * self.year0
+        coef = np.column_stack((a, b))
+        coef[(self.n < 2) | ~(det > 0)] = np.nan
+        return coef
+
+    @staticmethod
+    def predict(coef: np.ndarray, years: np.ndarray, fx: Optional[np.ndarray]) -> np.ndarray:
+        return np.exp(coef[:, 0:1] + coef[:, 1:2] * years)
+
+
+class _FXLinearState:
+    """Cumulative Gram matrix and X'y for y = b0 + b1 * year + b2 * fx."""
+
+    def __init__(self, n_corridors: int, year0: float, fx_shift: float, fx_scale: float) -> None:
+        # Features are [1, year - year0, (fx - fx_shift) / fx_scale]; the
+        # coefficients are mapped back to raw year / fx in coef().
+        self.year0 = year0
+        self.fx_shift = fx_shift
+        self.fx_scale = fx_scale
+        self.n = np.zeros(n_corridors)
+        self.gram = np.zeros((n_corridors, 3, 3))
+        self.xty = np.zeros((n_corridors, 3))
+
+    def add(self, year: float, values: np.ndarray, fx: Optional[np.ndarray]) -> None:
+        ok = np.isfinite(values) & np.isfinite(fx)
+        w = ok.astype(np.float64)
+        feats = np.column_stack(
+            (w, w * (year - self.year0), w * (np.where(ok, fx, 0.0) - self.fx_shift) / self.fx_scale)
+        )
+        # Rank-one update per corridor (masked rows are all zero).
+        self.n += w
+        self.gram += feats[:, :, None] * feats[:, None, :]
+        self.xty += feats * np.where(ok, values, 0.0)[:, None]
+
+    def coef(self) -> np.ndarray:
+        c = np.einsum("cij,cj->ci", np.linalg.pinv(self.gram, hermitian=True), self.xty)
+        b1 = c[:, 1]
+        b2 = c[:, 2] / self.fx_scale
+        b0 = c[:, 0] - b1 * self.year0 - b2 * self.fx_shift
+        coef = np.column_stack((b0, b1, b2))
+        coef[self.n < 3] = np.nan
+        return coef
+
+    @staticmethod
+    def predict(coef: np.ndarray, years: np.ndarray, fx: Optional[np.ndarray]) -> np.ndarray:
+        return coef[:, 0:1] + coef[:, 1:2] * years + coef[:, 2:3] * fx
+
+
+# Models with an incremental fitter; others need a full refit per origin.
+INCREMENTAL_MODELS = frozenset({"logtrend", "fx_linear"})
+
+
+def _new_state(model: str, panel: CorridorPanel):
+    n_corridors = len(panel.corridor_ids)
+    year0 = float(panel.years[0]) if len(panel.years) else 0.0
+    if model == "logtrend":
+        return _LogTrendState(n_corridors, year0)
+    if model == "fx_linear":
+        if panel.fx is None:
+            raise ValueError("fx_linear backtests need a panel built with fx_col.")
+        finite = panel.fx[np.isfinite(panel.fx)]
+        shift = float(finite.mean()) if finite.size else 0.0
+        scale = float(finite.std()) if finite.size else 1.0
+        return _FXLinearState(n_corridors, year0, shift, scale if scale > 0 else 1.0)
+    raise ValueError(f"Unknown forecast model: {model}")
+
+
+# ---------- Metrics ----------
+
+ERROR_COLUMNS = [
+    "model", "corridor_id", "origin", "year", "horizon",
+    "remittance_usd", "remittance_hat_usd", "error_abs_usd", "error_pct",
+]
+
+
+def _error_summary(errors: pd.DataFrame, keys) -> pd.DataFrame:
+    grouped = errors.assign(sq=errors["error_abs_usd"] ** 2).groupby(keys, sort=True)
+    out = grouped.agg(
+        n=("error_abs_usd", "size"),
+        mae=("error_abs_usd", "mean"),
+        mape=("error_pct", "mean"),
+        mse=("sq", "mean"),
+    )
+    out["rmse"] = np.sqrt(out.pop("mse"))
+    return out.reset_index()
+
+
+# ---------- Refit fallback ----------
+
+def _refit_backtest(
+    model_name: str,
+    panel: CorridorPanel,
+    origins: Sequence[int],
+    horizon: int,
+    min_train_years: int,
+) -> pd.DataFrame:
+    """Rolling-origin errors for a model without an incremental fitter: one fit per fold."""
+    needs_fx = model_capabilities(model_name).needs_fx
+    if needs_fx and panel.fx is None:
+        raise ValueError(f"{model_name} backtests need a panel built with fx_col.")
+    years = panel.years
+    rows: List[Tuple[Any, ...]] = []
+
+    for c, corridor_id in enumerate(panel.corridor_ids):
+        values = panel.values[c]
+        fx = panel.fx[c] if panel.fx is not None else None
+        usable = np.isfinite(values)
+        if needs_fx:
+            usable &= np.isfinite(fx)
+
+        for origin in origins:
+            j = int(np.searchsorted(years, origin))
+            train = usable & (years <= origin)
+            targets = np.arange(j + 1, min(j + 1 + horizon, len(years)))
+            targets = targets[(values[targets] > 0) & (usable[targets] if needs_fx else True)]
+            if train.sum() < max(min_train_years, 1) or targets.size == 0:
+                continue
+
+            train_df = pd.DataFrame({"year": years[train], "remittance_usd": values[train]})
+            if needs_fx:
+                train_df["usd_kes"] = fx[train]
+            model = get_forecast_model(model_name)
+            try:
+                model.fit(train_df)
+                target_years = years[targets].tolist()
+                if needs_fx:
+                    pred = model.predict_with_features(target_years, fx[targets].tolist())
+                else:
+                    pred = model.predict(target_years)
+            except ValueError:
+                # e.g. logtrend on a non-positive training value: skip the fold.
+                continue
+
+            y_hat = pred["remittance_hat_usd"].to_numpy(dtype=np.float64)
+            actual = values[targets]
+            err = np.abs(actual - y_hat)
+            for k, t in enumerate(targets):
+                rows.append((
+                    model_name, corridor_id, int(origin), int(years[t]), int(t - j),
+                    actual[k], y_hat[k], err[k], err[k] / actual[k],
+                ))
+
+    return pd.DataFrame.from_records(rows, columns=ERROR_COLUMNS)
+
+
+# ---------- Public API ----------
+
+def rolling_origin_backtest(
+    data: Union[CorridorPanel, pd.DataFrame],
+    models: Optional[Sequence[str]] = None,
+    horizon: int = 1,
+    origins: Optional[Sequence[int]] = None,
+    min_train_years: int = 3,
+    fx_col: str = "usd_kes",
+) -> Dict[str, pd.DataFrame]:
+    """
+    Rolling-origin (expanding window) backtest of every model on every
+    corridor.
+
+    For each origin year o, each model is fit on years <= o and forecasts
+    o+1 .. o+horizon; fx_linear uses the actual FX of those years, as the
+    validation step of train_validate_forecast_corridor does. Fits are
+    updated incrementally as the origin advances (running sums for
+    logtrend, rank-one Gram updates for fx_linear), so a full backtest
+    costs one pass over the panel. Other registered models fall back to a
+    full refit per (corridor, origin).
+
+    models: registry names; default logtrend, plus fx_linear if the panel
+          has FX. a CorridorPanel, or a long frame [corridor_id, year,
+          remittance_usd, (fx_col)] that is pivoted with panel_from_long.
+    origins: origin years; default every panel year from the
+          min_train_years-th to the second to last.
+
+    A fold is scored only if the corridor has at least min_train_years
+    usable training years, and only target years with a positive actual
+    value are scored.
+
+    Returns:
+        errors     – one row per (model, corridor, origin, target year):
+                     [model, corridor_id, origin, year, horizon,
+                      remittance_usd, remittance_hat_usd, error_abs_usd,
+                      error_pct]
+        by_origin  – [model, origin, n, mae, mape, rmse]
+        by_corridor– [model, corridor_id, n, mae, mape, rmse]
+        summary    – [model, n, mae, mape, rmse]
+    """
+    if horizon < 1:
+        raise ValueError("horizon must be at least 1.")
+    if isinstance(data, pd.DataFrame):
+        data = panel_from_long(data, fx_col=fx_col if fx_col in data.columns else None)
+    panel = data
+
+    if models is None:
+        models = ["logtrend", "fx_linear"] if panel.fx is not None else ["logtrend"]
+    models = [m.lower() for m in models]
+
+    years = panel.years
+    if origins is None:
+        origin_set = set(years[max(min_train_years, 1) - 1:-1].tolist())
+    else:
+        origin_set = set(int(o) for o in origins)
+
+    states = {model: _new_state(model, panel) for model in models if model in INCREMENTAL_MODELS}
+    fx = panel.fx
+    frames = []
+
+    for j, year in enumerate(years):
+        for state in states.values():
+            state.add(float(year), panel.values[:, j], None if fx is None else fx[:, j])
+        if int(year) not in origin_set:
+            continue
+
+        # Targets: the next `horizon` panel years after the origin.
+        target_cols = np.arange(j + 1, min(j + 1 + horizon, len(years)))
+        if target_cols.size == 0:
+            continue
+        target_years = years[target_cols].astype(np.float64)
+        actual = panel.values[:, target_cols]
+
+        for model, state in states.items():
+            target_fx = None if fx is None else fx[:, target_cols]
+            coef = state.coef()
+            coef[state.n < min_train_years] = np.nan
+            y_hat = state.predict(coef, target_years, target_fx)
+            ok = np.isfinite(y_hat) & (actual > 0)  # NaN compares False
+            rows, cols = np.nonzero(ok)
+            err = np.abs(actual[rows, cols] - y_hat[rows, cols])
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "model": model,
+                        "corridor_id": panel.corridor_ids[rows],
+                        "origin": int(year),
+                        "year": years[target_cols][cols],
+                        "horizon": cols + 1,
+                        "remittance_usd": actual[rows, cols],
+                        "remittance_hat_usd": y_hat[rows, cols],
+                        "error_abs_usd": err,
+                        "error_pct": err / actual[rows, cols],
+                    }
+                )
+            )
+
+    panel_origins = sorted(o for o in origin_set if o in set(years.tolist()))
+    for model in models:
+        if model not in states:
+            frames.append(_refit_backtest(model, panel, panel_origins, horizon, min_train_years))
+
+    frames = [f for f in frames if len(f)]
+    errors = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=ERROR_COLUMNS)
+
+    return {
+        "errors": errors,
+        "by_origin": _error_summary(errors, ["model", "origin"]),
+        "by_corridor": _error_summary(errors, ["model", "corridor_id"]),
+        "summary": _error_summary(errors, ["model"]),
+    }
@@ -0,0 +1,120 @@
+# src/foe/forecasting/bootstrap.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class BootstrapConfig:
+    """Prediction-interval settings for the corridor pipelines."""
+
+    n_draws: int = 1000
+    quantiles: Tuple[float, ...] = (0.05, 0.5, 0.95)
+    seed: Optional[int] = None
+
+    @property
+    def labels(self) -> Tuple[str, ...]:
+        """Quantile column names, e.g. ("q05", "q50", "q95")."""
+        return tuple(_quantile_label(q) for q in self.quantiles)
+
+
+def residual_bootstrap(
+    design: np.ndarray,
+    target: np.ndarray,
+    future_design: np.ndarray,
+    n_draws: int = 1000,
+    include_noise: bool = True,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Residual-bootstrap forecast draws for the linear model target ~ design.
+
+    Each draw resamples the (centred, df-corrected) training residuals
+    onto the fitted values and refits. With the design fixed, every refit
+    is one projection, so all draws are a single (n_draws x n) @ (n x p)
+    product rather than n_draws lstsq calls. With include_noise, a
+    resampled residual is added to each forecast as well, giving
+    prediction (not just confidence) intervals.
+
+    Shapes: design (n, p), target (n,), future_design (m, p).
+    Returns (n_draws, m) draws on the scale of `target`.
+    """
+    design = np.asarray(design, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    future_design = np.asarray(future_design, dtype=np.float64)
+    n, p = design.shape
+    if n <= p:
+        raise ValueError(f"Bootstrap needs more than {p} training points, got {n}.")
+    if n_draws < 1:
+        raise ValueError("n_draws must be at least 1.")
+
+    projection = np.linalg.pinv(design)                 # (p, n)
+    coef = projection @ target
+    resid = target - design @ coef
+    resid = (resid - resid.mean()) * np.sqrt(n / (n - p))
+
+    rng = np.random.default_rng(seed)
+    resampled = resid[rng.integers(0, n, size=(n_draws, n))]
+    coef_draws = coef + resampled @ projection.T       # (n_draws, p)
+    draws = coef_draws @ future_design.T                # (n_draws, m)
+    if include_noise:
+        draws += resid[rng.integers(0, n, size=draws.shape)]
+    return draws
+
+
+def _quantile_label(q: float) -> str:
+    return f"q{q * 100:02g}"
+
+
+def summarize_draws(
+    years: Sequence[int],
+    draws: np.ndarray,
+    quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+    point: Optional[np.ndarray] = None,
+) -> pd.DataFrame:
+    """
+    DataFrame [year, (remittance_hat_usd), q05, q50, q95, ...] of per-year
+    quantiles of a (draws x years) matrix.
+    """
+    quantiles = np.asarray(quantiles, dtype=np.float64)
+    if np.any((quantiles < 0) | (quantiles > 1)):
+        raise ValueError("quantiles must lie in [0, 1].")
+    out = pd.DataFrame({"year": list(years)})
+    if point is not None:
+        out["remittance_hat_usd"] = point
+    # Quantiles over draws on a year-major copy (contiguous per year).
+    values = np.quantile(np.ascontiguousarray(draws.T), quantiles, axis=1)
+    for q, row in zip(quantiles, values):
+        out[_quantile_label(float(q))] = row
+    return out
+
+
+def bootstrap_forecast(
+    model,
+    years: Sequence[int],
+    usd_kes: Optional[Sequence[float]] = None,
+    n_draws: int = 1000,
+    quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+    seed: Optional[int] = None,
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Point forecast, quantiles and the raw (n_draws x years) draws for any
+    fitted model with `capabilities.supports_intervals`. FX-driven models
+    need usd_kes for the forecast years.
+    """
+    if not model.capabilities.supports_intervals:
+        raise TypeError(f"{type(model).__name__} does not support prediction intervals.")
+    if model.capabilities.needs_fx:
+        if usd_kes is None:
+            raise ValueError(f"{type(model).__name__} needs usd_kes for the forecast years.")
+        return model.predict_interval_with_features(
+            years, usd_kes, quantiles=quantiles, n_draws=n_draws, seed=seed, return_samples=True
+        )
+    return model.predict_interval(
+        years, quantiles=quantiles, n_draws=n_draws, seed=seed, return_samples=True
+    )
@@ -1,9 +1,12 @@
 # src/foe/forecasting/model_base.py
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List
+import numpy as np
 import pandas as pd
 
+from .registry import ModelCapabilities
+
 
 class ForecastModel(ABC):
     """
@@ -12,8 +15,15 @@ class ForecastModel(ABC):
     Expect input df with columns:
       - year (int)
       - remittance_usd (float)
+
+    Subclasses declare what they can do via `capabilities`, and bump
+    `version` whenever the meaning of their fitted parameters changes
+    (persisted / cached fits of another version are refused).
     """
 
+    capabilities = ModelCapabilities()
+    version = 1
+
     @abstractmethod
     def fit(self, df: pd.DataFrame) -> None:
         """Fit model on historical annual data."""
@@ -29,3 +39,11 @@ class ForecastModel(ABC):
           - remittance_hat_usd
         """
         ...
+
+    def get_params(self) -> Dict[str, np.ndarray]:
+        """Fitted state as named arrays (see forecasting.persistence)."""
+        raise NotImplementedError(f"{type(self).__name__} does not support persistence.")
+
+    def set_params(self, params: Dict[str, np.ndarray]) -> None:
+        """Restore the fitted state produced by get_params()."""
+        raise NotImplementedError(f"{type(self).__name__} does not support persistence.")
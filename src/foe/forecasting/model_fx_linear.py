@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from .bootstrap import residual_bootstrap, summarize_draws
 from .model_base import ForecastModel
+from .panel import masked_linear_fit
+from .registry import ModelCapabilities
 
 
 class FXLinearModel(ForecastModel):
@@ -22,9 +25,16 @@ class FXLinearModel(ForecastModel):
         - FX pressure (usd_kes)
     """
 
+    capabilities = ModelCapabilities(
+        needs_fx=True, supports_batching=True, supports_intervals=True, supports_persistence=True
+    )
+
     def __init__(self) -> None:
         # _coef_ = [b0, b1, b2]
         self._coef_: Optional[np.ndarray] = None
+        # Training design / target, kept for bootstrap intervals.
+        self._train_X: Optional[np.ndarray] = None
+        self._train_y: Optional[np.ndarray] = None
 
     # ---------------------------------------------------------
     # FIT
@@ -58,6 +68,7 @@ class FXLinearModel(ForecastModel):
         # OLS solution: minimize ||Xb - y||^2 using least squares
         coef, *_ = np.linalg.lstsq(X, y, rcond=None)
         self._coef_ = coef  # np.ndarray of shape (3,)
+        self._train_X, self._train_y = X, y
 
     # ---------------------------------------------------------
     # INTERNAL PREDICTION CORE
@@ -134,3 +145,114 @@ class FXLinearModel(ForecastModel):
                 "remittance_hat_usd": y_hat,
             }
         )
+
+    # ---------------------------------------------------------
+    # BATCHED FIT / PREDICT (many corridors or scenarios at once)
+    # ---------------------------------------------------------
+    @staticmethod
+    def fit_batch(years, remittance_usd, usd_kes) -> np.ndarray:
+        """
+        Fit many series in one stacked normal-equation pass.
+
+        years:          (Y,) or (..., Y)
+        remittance_usd: (..., Y); NaN entries are masked out
+        usd_kes:        (..., Y); NaN entries are masked out
+
+        Returns (..., 3) coefficients [b0, b1, b2] (NaN where fewer than
+        three usable years). For full-rank series this equals fit().
+        """
+        y = np.asarray(remittance_usd, dtype=float)
+        fx = np.asarray(usd_kes, dtype=float)
+        shape = np.broadcast_shapes(y.shape, fx.shape)
+        y = np.broadcast_to(y, shape)
+        fx = np.broadcast_to(fx, shape)
+        years_arr = np.broadcast_to(np.asarray(years, dtype=float), shape)
+
+        mask = np.isfinite(y) & np.isfinite(fx)
+        return masked_linear_fit(np.stack((years_arr, fx), axis=-1), y, mask)
+
+    @staticmethod
+    def predict_batch(coef: np.ndarray, years, usd_kes) -> np.ndarray:
+        """(..., 3) coefficients with (..., Y) FX paths -> (..., Y) forecasts."""
+        coef = np.asarray(coef, dtype=float)
+        years_arr = np.asarray(years, dtype=float)
+        fx_arr = np.asarray(usd_kes, dtype=float)
+        return coef[..., 0:1] + coef[..., 1:2] * years_arr + coef[..., 2:3] * fx_arr
+
+    @classmethod
+    def from_coefficients(cls, coef) -> "FXLinearModel":
+        """A fitted model from [b0, b1, b2], e.g. one row of fit_batch()."""
+        model = cls()
+        model._coef_ = np.asarray(coef, dtype=float).copy()
+        return model
+
+    # ---------------------------------------------------------
+    # PERSISTENCE
+    # ---------------------------------------------------------
+    def get_params(self) -> Dict[str, np.ndarray]:
+        if self._coef_ is None:
+            raise RuntimeError("FXLinearModel must be fit() before it can be saved.")
+        params = {"coef": self._coef_.copy()}
+        if self._train_X is not None:
+            params["train_X"] = self._train_X
+            params["train_y"] = self._train_y
+        return params
+
+    def set_params(self, params: Dict[str, np.ndarray]) -> None:
+        coef = np.asarray(params["coef"], dtype=float)
+        if coef.shape != (3,):
+            raise ValueError(f"FXLinearModel expects 3 coefficients, got shape {coef.shape}.")
+        self._coef_ = coef.copy()
+        if "train_X" in params:
+            self._train_X = np.asarray(params["train_X"], dtype=float)
+            self._train_y = np.asarray(params["train_y"], dtype=float)
+
+    # ---------------------------------------------------------
+    # BOOTSTRAP PREDICTION INTERVALS
+    # ---------------------------------------------------------
+    def predict_samples_with_features(
+        self,
+        years: List[int],
+        usd_kes: List[float],
+        n_draws: int = 1000,
+        include_noise: bool = True,
+        seed: Optional[int] = None,
+    ) -> np.ndarray:
+        """(n_draws x len(years)) residual-bootstrap draws of the forecast."""
+        if self._train_X is None:
+            raise RuntimeError("FXLinearModel needs its training data (call fit()) for intervals.")
+        if len(years) != len(usd_kes):
+            raise ValueError("years and usd_kes must have same length.")
+
+        # Centre year / FX on the training means so the design stays well
+        # conditioned; the fitted values are unchanged.
+        center = self._train_X.mean(axis=0)
+        center[0] = 0.0
+        future = np.column_stack(
+            [np.ones(len(years)), np.asarray(years, dtype=float), np.asarray(usd_kes, dtype=float)]
+        )
+        return residual_bootstrap(
+            self._train_X - center,
+            self._train_y,
+            future - center,
+            n_draws=n_draws,
+            include_noise=include_noise,
+            seed=seed,
+        )
+
+    def predict_interval_with_features(
+        self,
+        years: List[int],
+        usd_kes: List[float],
+        quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+        n_draws: int = 1000,
+        seed: Optional[int] = None,
+        return_samples: bool = False,
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, np.ndarray]]:
+        """
+        predict_with_features() plus bootstrap quantile columns (q05, q50,
+        q95 by default). With return_samples, also returns the draws matrix.
+        """
+        draws = self.predict_samples_with_features(years, usd_kes, n_draws=n_draws, seed=seed)
+        out = summarize_draws(years, draws, quantiles, point=self._predict_internal(years, usd_kes))
+        return (out, draws) if return_samples else out
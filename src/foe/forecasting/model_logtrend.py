@@ -1,11 +1,14 @@
 # src/foe/forecasting/model_logtrend.py
 
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from .bootstrap import residual_bootstrap, summarize_draws
 from .model_base import ForecastModel
+from .panel import masked_linear_fit
+from .registry import ModelCapabilities
 
 
 class LogTrendModel(ForecastModel):
@@ -18,9 +21,16 @@ class LogTrendModel(ForecastModel):
     Simple, fast baseline for remittance forecasting.
     """
 
+    capabilities = ModelCapabilities(
+        supports_batching=True, supports_intervals=True, supports_persistence=True
+    )
+
     def __init__(self) -> None:
         self._a: Optional[float] = None
         self._b: Optional[float] = None
+        # Training data, kept for bootstrap intervals.
+        self._train_x: Optional[np.ndarray] = None
+        self._train_log_y: Optional[np.ndarray] = None
 
     def _fit_log_trend(
         self,
@@ -36,6 +46,7 @@ class LogTrendModel(ForecastModel):
         log_y = np.log(y)
 
         b, a = np.polyfit(x, log_y, 1)  # slope, intercept
+        self._train_x, self._train_log_y = x, log_y
         return float(a), float(b)
 
     def _predict_log_trend(self, years: List[int]) -> np.ndarray:
@@ -71,3 +82,98 @@ class LogTrendModel(ForecastModel):
                 "remittance_hat_usd": y_hat,
             }
         )
+
+    # ---------- Batched ----------
+
+    @staticmethod
+    def fit_batch(years, values) -> np.ndarray:
+        """
+        Fit many series at once.
+
+        years:  (Y,) or (..., Y) years
+        values: (..., Y) remittance_usd; NaN or non-positive entries are
+                masked out instead of raising
+
+        Returns (..., 2) coefficients [a, b] (NaN where fewer than two
+        usable years), matching fit() on each series' usable rows.
+        """
+        values = np.asarray(values, dtype=float)
+        years = np.broadcast_to(np.asarray(years, dtype=float), values.shape)
+        mask = np.isfinite(values) & (values > 0)
+        log_y = np.log(np.where(mask, values, 1.0))
+        return masked_linear_fit(years[..., None], log_y, mask)
+
+    @staticmethod
+    def predict_batch(coef: np.ndarray, years) -> np.ndarray:
+        """(..., 2) coefficients x (Y,) or (..., Y) years -> (..., Y) forecasts."""
+        coef = np.asarray(coef, dtype=float)
+        x = np.asarray(years, dtype=float)
+        return np.exp(coef[..., 0:1] + coef[..., 1:2] * x)
+
+    @classmethod
+    def from_coefficients(cls, a: float, b: float) -> "LogTrendModel":
+        """A fitted model from (a, b), e.g. one row of fit_batch()."""
+        model = cls()
+        model._a, model._b = float(a), float(b)
+        return model
+
+    # ---------- Persistence ----------
+
+    def get_params(self) -> Dict[str, np.ndarray]:
+        if self._a is None or self._b is None:
+            raise RuntimeError("LogTrendModel must be fit() before it can be saved.")
+        params = {"coef": np.array([self._a, self._b])}
+        if self._train_x is not None:
+            params["train_x"] = self._train_x
+            params["train_log_y"] = self._train_log_y
+        return params
+
+    def set_params(self, params: Dict[str, np.ndarray]) -> None:
+        a, b = np.asarray(params["coef"], dtype=float)
+        self._a, self._b = float(a), float(b)
+        if "train_x" in params:
+            self._train_x = np.asarray(params["train_x"], dtype=float)
+            self._train_log_y = np.asarray(params["train_log_y"], dtype=float)
+
+    # ---------- Intervals ----------
+
+    def predict_samples(
+        self,
+        years: List[int],
+        n_draws: int = 1000,
+        include_noise: bool = True,
+        seed: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        (n_draws x len(years)) residual-bootstrap draws of the forecast, in
+        USD. The bootstrap runs in log space, where the model is linear.
+        """
+        if self._train_x is None:
+            raise RuntimeError("LogTrendModel needs its training data (call fit()) for intervals.")
+        center = self._train_x.mean()
+        x = np.asarray(years, dtype=float)
+        draws = residual_bootstrap(
+            np.column_stack((np.ones_like(self._train_x), self._train_x - center)),
+            self._train_log_y,
+            np.column_stack((np.ones_like(x), x - center)),
+            n_draws=n_draws,
+            include_noise=include_noise,
+            seed=seed,
+        )
+        return np.exp(draws, out=draws)
+
+    def predict_interval(
+        self,
+        years: List[int],
+        quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+        n_draws: int = 1000,
+        seed: Optional[int] = None,
+        return_samples: bool = False,
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, np.ndarray]]:
+        """
+        predict() plus bootstrap quantile columns (q05, q50, q95 by
+        default). With return_samples, also returns the draws matrix.
+        """
+        draws = self.predict_samples(years, n_draws=n_draws, seed=seed)
+        out = summarize_draws(years, draws, quantiles, point=self._predict_log_trend(years))
+        return (out, draws) if return_samples else out
@@ -0,0 +1,191 @@
+# src/foe/forecasting/panel.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# ---------- Stacked least squares ----------
+
+def masked_linear_fit(
+    regressors: np.ndarray,
+    target: np.ndarray,
+    mask: np.ndarray,
+) -> np.ndarray:
+    """
+    Solve many small OLS problems  target ~ b0 + sum_j b_j * regressors[..., j]
+    in one pass.
+
+    Shapes:
+        regressors – (..., n_obs, p)
+        target     – (..., n_obs)
+        mask       – (..., n_obs) bool, observations to use
+
+    Returns (..., p + 1) coefficients [b0, b1, ..., bp]; all NaN where a
+    problem has fewer than p + 1 usable observations.
+
+    Each problem is solved from its (p + 1) x (p + 1) normal equations with
+    the regressors centred and scaled by their masked mean / std, which
+    keeps e.g. raw calendar years well conditioned. A pseudo-inverse is
+    used, so a constant regressor gets coefficient 0 instead of failing.
+    """
+    regressors = np.asarray(regressors, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    mask = np.asarray(mask, dtype=bool)
+    p = regressors.shape[-1]
+
+    w = mask.astype(np.float64)
+    n = w.sum(axis=-1)                                   # (...)
+    safe_n = np.where(n > 0, n, 1.0)
+
+    # Masked entries may hold NaN; zero them so they drop out of every sum.
+    x = np.where(mask[..., None], regressors, 0.0)
+    y = np.where(mask, target, 0.0)
+
+    mean_x = x.sum(axis=-2) / safe_n[..., None]          # (..., p)
+    mean_y = y.sum(axis=-1) / safe_n
+    z = (x - mean_x[..., None, :]) * w[..., None]
+    scale = np.sqrt((z * z).sum(axis=-2) / safe_n[..., None])
+    scale = np.where(scale > 0, scale, 1.0)
+    z /= scale[..., None, :]
+    yc = (y - mean_y[..., None]) * w
+
+    # Centred problem has no intercept: gram (..., p, p), rhs (..., p).
+    gram = np.einsum("...ni,...nj->...ij", z, z)
+    rhs = np.einsum("...ni,...n->...i", z, yc)
+    slopes = np.einsum("...ij,...j->...i", np.linalg.pinv(gram, hermitian=True), rhs)
+
+    slopes = slopes / scale
+    intercept = mean_y - (slopes * mean_x).sum(axis=-1)
+    coef = np.concatenate((intercept[..., None], slopes), axis=-1)
+    coef[n < p + 1] = np.nan
+    return coef
+
+
+# ---------- Corridor panels ----------
+
+@dataclass(frozen=True)
+class CorridorPanel:
+    """
+    Annual corridor series on a dense (corridors x years) grid.
+
+    values and fx hold NaN where a corridor has no row for a year.
+    """
+
+    corridor_ids: np.ndarray        # (C,)
+    years: np.ndarray               # (Y,) int, ascending
+    values: np.ndarray              # (C, Y) remittance_usd
+    fx: Optional[np.ndarray] = None  # (C, Y) FX driver, if any
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def year_mask(self, train_end_year: Optional[int] = None) -> np.ndarray:
+        """(Y,) bool: years up to and including train_end_year (all if None)."""
+        if train_end_year is None:
+            return np.ones(len(self.years), dtype=bool)
+        return self.years <= train_end_year
+
+
+def panel_from_long(
+    df: pd.DataFrame,
+    value_col: str = "remittance_usd",
+    fx_col: Optional[str] = None,
+    corridor_col: str = "corridor_id",
+    year_col: str = "year",
+) -> CorridorPanel:
+    """
+    Pivot a long frame [corridor_id, year, remittance_usd, (fx_col)] into a
+    CorridorPanel. Duplicate (corridor, year) rows are an error.
+    """
+    missing = {corridor_col, year_col, value_col} - set(df.columns)
+    if fx_col is not None and fx_col not in df.columns:
+        missing.add(fx_col)
+    if missing:
+        raise KeyError(f"Panel input missing columns: {missing}")
+
+    corridor_ids, row = np.unique(df[corridor_col].to_numpy(), return_inverse=True)
+    years, col = np.unique(df[year_col].to_numpy(dtype=np.int64), return_inverse=True)
+    flat = row * len(years) + col
+    if len(np.unique(flat)) != len(flat):
+        raise ValueError("Duplicate (corridor, year) rows in panel input.")
+
+    def grid(column: str) -> np.ndarray:
+        out = np.full(len(corridor_ids) * len(years), np.nan)
+        out[flat] = df[column].to_numpy(dtype=np.float64)
+        return out.reshape(len(corridor_ids), len(years))
+
+    return CorridorPanel(
+        corridor_ids=corridor_ids,
+        years=years,
+        values=grid(value_col),
+        fx=grid(fx_col) if fx_col is not None else None,
+    )
+
+
+def fit_panel(
+    panel: CorridorPanel,
+    model: str = "logtrend",
+    train_end_year: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Fit every corridor of the panel on years <= train_end_year.
+
+    Returns (C, k) coefficients: [a, b] for "logtrend", [b0, b1, b2] for
+    "fx_linear"; NaN rows for corridors without enough usable years.
+    """
+    from .model_fx_linear import FXLinearModel
+    from .model_logtrend import LogTrendModel
+
+    cols = panel.year_mask(train_end_year)
+    years = panel.years[cols]
+    values = panel.values[:, cols]
+
+    if model == "logtrend":
+        return LogTrendModel.fit_batch(years, values)
+    if model == "fx_linear":
+        if panel.fx is None:
+            raise ValueError("fx_linear needs a panel built with fx_col.")
+        return FXLinearModel.fit_batch(years, values, panel.fx[:, cols])
+    raise ValueError(f"Unknown forecast model: {model}")
+
+
+def predict_panel(
+    panel: CorridorPanel,
+    coef: np.ndarray,
+    years,
+    model: str = "logtrend",
+    fx: Optional[np.ndarray] = None,
+) -> pd.DataFrame:
+    """
+    Predict every corridor for `years` from fit_panel coefficients.
+
+    fx: (C, len(years)) FX path for "fx_linear".
+
+    Returns a long DataFrame [corridor_id, year, remittance_hat_usd].
+    """
+    from .model_fx_linear import FXLinearModel
+    from .model_logtrend import LogTrendModel
+
+    years = np.asarray(years, dtype=np.int64)
+    if model == "logtrend":
+        y_hat = LogTrendModel.predict_batch(coef, years)
+    elif model == "fx_linear":
+        if fx is None:
+            raise ValueError("fx_linear predictions need an FX path.")
+        y_hat = FXLinearModel.predict_batch(coef, years, fx)
+    else:
+        raise ValueError(f"Unknown forecast model: {model}")
+
+    return pd.DataFrame(
+        {
+            "corridor_id": np.repeat(panel.corridor_ids, len(years)),
+            "year": np.tile(years, len(panel.corridor_ids)),
+            "remittance_hat_usd": y_hat.ravel(),
+        }
+    )
@@ -0,0 +1,158 @@
+# src/foe/forecasting/persistence.py
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.foe.hashing import hash_payload
+from src.foe.result_cache import ResultCache
+
+from .registry import _resolve, get_forecast_model, get_model_class, model_capabilities
+
+# Bump when the file layout changes.
+MODEL_FORMAT_VERSION = 1
+
+
+def _class_path(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _restore(class_path: str, version: Any, params: Dict[str, np.ndarray]):
+    cls = _resolve(class_path)
+    current = getattr(cls, "version", 1)
+    if version != current:
+        raise ValueError(
+            f"{cls.__name__} was saved at version {version}, current version is {current}; refit it."
+        )
+    model = cls()
+    model.set_params(params)
+    return model
+
+
+# ---------- Files ----------
+
+def save_model(
+    model: Any,
+    path: Union[str, Path],
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """
+    Save a fitted model as a single .npz: its parameter arrays plus a JSON
+    header (class, model version, optional JSON-able metadata). No pickles.
+    Returns the written path (".npz" is appended if missing).
+    """
+    path = Path(path)
+    if path.suffix != ".npz":
+        path = path.with_name(path.name + ".npz")
+    header = {
+        "format": MODEL_FORMAT_VERSION,
+        "class": _class_path(type(model)),
+        "version": getattr(model, "version", 1),
+        "metadata": metadata or {},
+    }
+    arrays = {f"p_{k}": np.asarray(v) for k, v in model.get_params().items()}
+    np.savez(path, __header__=np.array(json.dumps(header)), **arrays)
+    return path
+
+
+def load_model(path: Union[str, Path]):
+    """
+    Load a model written by save_model. Raises ValueError if the file
+    format or the model's version no longer matches.
+    """
+    with np.load(path, allow_pickle=False) as npz:
+        header = json.loads(str(npz["__header__"]))
+        params = {name[2:]: npz[name] for name in npz.files if name.startswith("p_")}
+    if header.get("format") != MODEL_FORMAT_VERSION:
+        raise ValueError(f"Unsupported model file format: {header.get('format')}")
+    return _restore(header["class"], header["version"], params)
+
+
+# ---------- Warm cache of fitted models ----------
+
+class FittedModelCache:
+    """
+    Fitted models keyed by (model name, model class and version, training
+    frame contents). A byte-identical training slice skips fit() entirely.
+
+    Parameters are stored through a ResultCache (in-process memo plus an
+    optional on-disk LRU store), so entries survive across processes when
+    a directory is given. Every hit returns a fresh model instance. Models
+    without `capabilities.supports_persistence` are fitted but never cached.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        memo_entries: int = 256,
+    ) -> None:
+        self._store = ResultCache(directory, max_bytes=max_bytes, memo_entries=memo_entries)
+
+    @property
+    def hits(self) -> int:
+        return self._store.hits
+
+    @property
+    def misses(self) -> int:
+        return self._store.misses
+
+    def key(self, name: str, train_df: pd.DataFrame) -> str:
+        cls = get_model_class(name)
+        return hash_payload(
+            "fitted_model", name.lower(), _class_path(cls), getattr(cls, "version", 1), train_df
+        )
+
+    def get(self, name: str, train_df: pd.DataFrame):
+        entry = self._store.get(self.key(name, train_df))
+        if entry is None:
+            return None
+        try:
+            return _restore(entry["class"], entry["version"], entry["params"])
+        except ValueError:
+            return None
+
+    def put(self, name: str, train_df: pd.DataFrame, model: Any) -> bool:
+        """Store a fitted model; False if it cannot be persisted."""
+        if not model_capabilities(name).supports_persistence:
+            return False
+        return self._store.put(
+            self.key(name, train_df),
+            {
+                "class": _class_path(type(model)),
+                "version": getattr(model, "version", 1),
+                "params": model.get_params(),
+            },
+        )
+
+    def fit(self, name: str, train_df: pd.DataFrame):
+        """Cached model for this training frame, fitting (and storing) on a miss."""
+        if not model_capabilities(name).supports_persistence:
+            return fit_forecast_model(name, train_df)
+        model = self.get(name, train_df)
+        if model is None:
+            model = get_forecast_model(name)
+            model.fit(train_df)
+            self.put(name, train_df, model)
+        return model
+
+    def clear(self) -> None:
+        self._store.clear()
+
+
+def fit_forecast_model(
+    name: str,
+    train_df: pd.DataFrame,
+    cache: Optional[FittedModelCache] = None,
+):
+    """get_forecast_model(name).fit(train_df), served from `cache` when given."""
+    if cache is not None:
+        return cache.fit(name, train_df)
+    model = get_forecast_model(name)
+    model.fit(train_df)
+    return model
@@ -0,0 +1,141 @@
+# src/foe/forecasting/registry.py
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Type, Union
+
+# Third-party packages can ship models under this entry-point group, e.g.
+#   [project.entry-points."liquidity_sequencing_lab.forecast_models"]
+#   arima = "mypkg.arima:ArimaModel"
+ENTRY_POINT_GROUP = "liquidity_sequencing_lab.forecast_models"
+
+
+@dataclass(frozen=True)
+class ModelCapabilities:
+    needs_fx: bool = False              # fit/predict require an FX column
+    supports_batching: bool = False     # has fit_batch / predict_batch
+    supports_intervals: bool = False    # can produce prediction intervals
+    supports_persistence: bool = False  # has get_params / set_params
+
+
+@dataclass
+class _Entry:
+    target: Union[str, type]          # "module:Class" (imported on first use) or the class
+    capabilities: Optional[ModelCapabilities] = None
+
+
+_REGISTRY: Dict[str, _Entry] = {}
+_entry_points_loaded = False
+
+
+def _resolve(target: str) -> type:
+    module_name, _, attr = target.partition(":")
+    if not attr:
+        raise ValueError(f"Model target '{target}' must look like 'module:Class'.")
+    package = __name__.rpartition(".")[0] if module_name.startswith(".") else None
+    return getattr(importlib.import_module(module_name, package), attr)
+
+
+def _load_entry_points() -> None:
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    from importlib.metadata import entry_points
+
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        # Explicit registrations win over installed plugins.
+        _REGISTRY.setdefault(ep.name.lower(), _Entry(ep.value))
+
+
+def register_model(
+    name: str,
+    target: Union[str, type, None] = None,
+    capabilities: Optional[ModelCapabilities] = None,
+    replace: bool = False,
+):
+    """
+    Register a forecast model under `name`.
+
+        register_model("arima", "mypkg.arima:ArimaModel",
+                       ModelCapabilities(supports_intervals=True))
+
+        @register_model("naive")
+        class NaiveModel(ForecastModel): ...
+
+    A string target is imported only when the model is first requested;
+    passing capabilities then lets model_capabilities() answer without
+    importing it. Otherwise capabilities come from the class attribute
+    `capabilities`. Used without a target, returns a class decorator.
+    """
+    key = name.lower()
+
+    def add(entry_target: Union[str, type]):
+        if key in _REGISTRY and not replace:
+            raise ValueError(f"Forecast model '{name}' is already registered.")
+        _REGISTRY[key] = _Entry(entry_target, capabilities)
+        return entry_target
+
+    if target is None:
+        return add
+    add(target)
+    return None
+
+
+def _entry(name: str) -> _Entry:
+    key = name.lower()
+    if key not in _REGISTRY:
+        _load_entry_points()
+    if key not in _REGISTRY:
+        raise ValueError(f"Unknown forecast model: {name}")
+    return _REGISTRY[key]
+
+
+def get_model_class(name: str) -> Type:
+    """The registered model class, importing its module on first use."""
+    entry = _entry(name)
+    if isinstance(entry.target, str):
+        entry.target = _resolve(entry.target)
+    return entry.target
+
+
+def get_forecast_model(name: str = "logtrend"):
+    """
+    Instantiate a registered forecast model.
+
+    Built-in names:
+      - "logtrend"  -> LogTrendModel (default)
+      - "fx_linear" -> FXLinearModel (uses year + usd_kes)
+    """
+    return get_model_class(name)()
+
+
+def model_capabilities(name: str) -> ModelCapabilities:
+    entry = _entry(name)
+    if entry.capabilities is None:
+        entry.capabilities = getattr(get_model_class(name), "capabilities", ModelCapabilities())
+    return entry.capabilities
+
+
+def available_models() -> List[str]:
+    """Registered model names, including installed entry-point plugins."""
+    _load_entry_points()
+    return sorted(_REGISTRY)
+
+
+# ---------- Built-in models ----------
+
+register_model(
+    "logtrend",
+    ".model_logtrend:LogTrendModel",
+    ModelCapabilities(supports_batching=True, supports_intervals=True, supports_persistence=True),
+)
+register_model(
+    "fx_linear",
+    ".model_fx_linear:FXLinearModel",
+    ModelCapabilities(
+        needs_fx=True, supports_batching=True, supports_intervals=True, supports_persistence=True
+    ),
+)
@@ -0,0 +1,253 @@
+# src/foe/forecasting/selection.py
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .backtest import ERROR_COLUMNS, _error_summary, rolling_origin_backtest
+from .panel import CorridorPanel, panel_from_long
+from .registry import available_models, model_capabilities
+
+METRICS = ("mae", "mape", "rmse")
+
+
+# ---------- Evaluation of one (model, corridor block) ----------
+
+def _evaluate(
+    model_name: str,
+    panel: CorridorPanel,
+    origins: Sequence[int],
+    horizon: int,
+    min_train_years: int,
+) -> pd.DataFrame:
+    return rolling_origin_backtest(
+        panel,
+        models=[model_name],
+        horizon=horizon,
+        origins=origins,
+        min_train_years=min_train_years,
+    )["errors"]
+
+
+def _common_folds(errors: pd.DataFrame) -> pd.Series:
+    """
+    Mask of the forecasts whose (corridor, origin, year) every model
+    scored on that corridor produced.
+    """
+    fold = ["corridor_id", "origin", "year"]
+    produced = errors.groupby(fold)["model"].transform("size")
+    competing = errors.groupby("corridor_id")["model"].transform("nunique")
+    return produced == competing
+
+
+# ---------- Process pool with shared-memory panels ----------
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(
+    blocks: Dict[str, str],
+    shape: Tuple[int, int],
+    corridor_ids: np.ndarray,
+    years: np.ndarray,
+) -> None:
+    # Workers share the parent's resource tracker, and only the parent
+    # unlinks the blocks.
+    handles = {key: shared_memory.SharedMemory(name=name) for key, name in blocks.items()}
+    arrays = {
+        key: np.ndarray(shape, dtype=np.float64, buffer=shm.buf) for key, shm in handles.items()
+    }
+    _WORKER["handles"] = handles  # keep the mappings alive
+    _WORKER["panel"] = CorridorPanel(
+        corridor_ids=corridor_ids,
+        years=years,
+        values=arrays["values"],
+        fx=arrays.get("fx"),
+    )
+
+
+def _subpanel(panel: CorridorPanel, lo: int, hi: int) -> CorridorPanel:
+    return CorridorPanel(
+        corridor_ids=panel.corridor_ids[lo:hi],
+        years=panel.years,
+        values=panel.values[lo:hi],
+        fx=panel.fx[lo:hi] if panel.fx is not None else None,
+    )
+
+
+def _worker_task(
+    model_name: str,
+    lo: int,
+    hi: int,
+    origins: List[int],
+    horizon: int,
+    min_train_years: int,
+) -> pd.DataFrame:
+    return _evaluate(
+        model_name, _subpanel(_WORKER["panel"], lo, hi), origins, horizon, min_train_years
+    )
+
+
+def _share(array: np.ndarray) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=np.float64, buffer=shm.buf)[...] = array
+    return shm
+
+
+# ---------- Public API ----------
+
+def _fold_origins(
+    years: np.ndarray,
+    n_folds: Optional[int],
+    horizon: int,
+    min_train_years: int,
+) -> List[int]:
+    # Origins whose whole horizon lies inside the panel.
+    candidates = years[max(min_train_years, 1) - 1 : len(years) - horizon].tolist()
+    if n_folds is not None:
+        if n_folds < 1:
+            raise ValueError("n_folds must be at least 1.")
+        candidates = candidates[-n_folds:]
+    return [int(y) for y in candidates]
+
+
+def select_models(
+    data: Union[CorridorPanel, pd.DataFrame],
+    models: Optional[Sequence[str]] = None,
+    metric: str = "mape",
+    n_folds: Optional[int] = None,
+    horizon: int = 1,
+    min_train_years: int = 3,
+    max_workers: Optional[int] = 1,
+    corridors_per_task: Optional[int] = None,
+    fx_col: str = "usd_kes",
+) -> Dict[str, pd.DataFrame]:
+    """
+    Rolling-origin model selection: every model on every corridor.
+
+    Folds are expanding-window origins (fit on years <= origin, score the
+    next `horizon` years); n_folds keeps the last n_folds origins, None
+    uses every origin with at least min_train_years of history, and a
+    fold needs min_train_years usable training years in the corridor.
+    Each (model, corridor) pair is scored by the mean `metric` ("mae",
+    "mape" or "rmse"), and the lowest score wins the corridor.
+
+    Models are compared on the same forecasts: a corridor is scored only
+    on the (origin, year) targets that every model producing forecasts
+    for it produced (e.g. fx_linear skips years with missing FX, so
+    logtrend is not scored on those either). `dropped` counts a model's
+    forecasts left out this way. A model with no forecasts at all for a
+    corridor does not compete there.
+
+    models: registry names; default every registered model the data can
+        serve (FX-driven models only if the panel has FX).
+    max_workers: 1 runs in-process; otherwise (None = os.cpu_count()) the
+        (model x corridor block) tasks run in a ProcessPoolExecutor whose
+        workers map the panel from shared memory instead of receiving a
+        copy per task. Models must then be registered at import time or
+        via entry points so worker processes can resolve them.
+
+    Returns:
+        scores      – [corridor_id, model, n, dropped, mae, mape, rmse,
+                      rank]
+        leaderboard – per model: [model, corridors, wins, n, mae, mape,
+                      rmse], best first
+        chosen      – [corridor_id, model, <metric>]
+        errors      – the scored per-forecast errors, as
+                      rolling_origin_backtest
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}.")
+    if horizon < 1:
+        raise ValueError("horizon must be at least 1.")
+    if isinstance(data, pd.DataFrame):
+        data = panel_from_long(data, fx_col=fx_col if fx_col in data.columns else None)
+    panel = data
+
+    if models is None:
+        models = [
+            name for name in available_models()
+            if panel.fx is not None or not model_capabilities(name).needs_fx
+        ]
+    models = [m.lower() for m in models]
+    origins = _fold_origins(panel.years, n_folds, horizon, min_train_years)
+
+    n_corridors = len(panel.corridor_ids)
+    workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+    block = corridors_per_task or max(1, -(-n_corridors // (4 * workers)))
+    bounds = [(lo, min(lo + block, n_corridors)) for lo in range(0, n_corridors, block)]
+
+    if workers <= 1 or not bounds:
+        frames = [
+            _evaluate(model, _subpanel(panel, lo, hi), origins, horizon, min_train_years)
+            for model in models
+            for lo, hi in bounds
+        ]
+    else:
+        blocks = {"values": _share(panel.values)}
+        if panel.fx is not None:
+            blocks["fx"] = _share(panel.fx)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(
+                    {key: shm.name for key, shm in blocks.items()},
+                    panel.values.shape,
+                    panel.corridor_ids,
+                    panel.years,
+                ),
+            ) as pool:
+                futures = [
+                    pool.submit(_worker_task, model, lo, hi, origins, horizon, min_train_years)
+                    for model in models
+                    for lo, hi in bounds
+                ]
+                frames = [f.result() for f in futures]
+        finally:
+            for shm in blocks.values():
+                shm.close()
+                shm.unlink()
+
+    frames = [f for f in frames if len(f)]
+    errors = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=ERROR_COLUMNS)
+    common = _common_folds(errors)
+    dropped = (~common).groupby([errors["corridor_id"], errors["model"]]).sum()
+    errors = errors[common].reset_index(drop=True)
+
+    scores = _error_summary(errors, ["corridor_id", "model"])
+    scores.insert(
+        3,
+        "dropped",
+        dropped.reindex(pd.MultiIndex.from_frame(scores[["corridor_id", "model"]]))
+        .fillna(0)
+        .astype(int)
+        .to_numpy(),
+    )
+    # Ties go to the model listed first.
+    scores["model_order"] = scores["model"].map({m: i for i, m in enumerate(models)})
+    scores = scores.sort_values(["corridor_id", metric, "model_order"], kind="stable")
+    scores["rank"] = scores.groupby("corridor_id").cumcount() + 1
+    scores = scores.drop(columns="model_order").reset_index(drop=True)
+
+    chosen = scores.loc[scores["rank"] == 1, ["corridor_id", "model", metric]].reset_index(drop=True)
+
+    leaderboard = _error_summary(errors, ["model"])
+    per_model = scores.groupby("model").agg(corridors=("corridor_id", "size"))
+    per_model["wins"] = chosen["model"].value_counts()
+    leaderboard = leaderboard.merge(per_model.fillna(0).astype(int).reset_index(), on="model")
+    leaderboard = leaderboard[["model", "corridors", "wins", "n", "mae", "mape", "rmse"]]
+    leaderboard = leaderboard.sort_values(["wins", metric], ascending=[False, True])
+
+    return {
+        "scores": scores,
+        "leaderboard": leaderboard.reset_index(drop=True),
+        "chosen": chosen,
+        "errors": errors,
+    }
@@ -0,0 +1,58 @@
+# src/foe/hashing.py
+
+import dataclasses
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def _update_frame(h: "hashlib._Hash", df: pd.DataFrame) -> None:
+    h.update(json.dumps([str(c) for c in df.columns]).encode())
+    h.update(json.dumps([str(t) for t in df.dtypes]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """
+    Stable content hash of a DataFrame (values, index, column names and
+    dtypes). Identical frames hash identically across processes.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _update_frame(h, df)
+    return h.hexdigest()
+
+
+def _canonical(obj: Any) -> Any:
+    """JSON-able canonical form; frames and arrays are replaced by digests."""
+    if isinstance(obj, pd.DataFrame):
+        return {"__frame__": hash_frame(obj)}
+    if isinstance(obj, pd.Series):
+        return {"__frame__": hash_frame(obj.to_frame())}
+    if isinstance(obj, np.ndarray):
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{obj.dtype.str}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+        return {"__array__": h.hexdigest()}
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {"__dataclass__": type(obj).__name__, "fields": _canonical(dataclasses.asdict(obj))}
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    raise TypeError(f"Cannot hash object of type {type(obj).__name__}.")
+
+
+def hash_payload(*parts: Any) -> str:
+    """
+    Stable hash of a mix of frames, arrays, dataclasses (e.g.
+    CorridorFlowConfig), dicts, sequences and scalars.
+    """
+    text = json.dumps(_canonical(list(parts)), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
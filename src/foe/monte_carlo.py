@@ -0,0 +1,154 @@
+# src/foe/monte_carlo.py
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.foe.flow_profile import expand_monthly_arrays
+from src.foe.settlement_calendar import SettlementCalendar
+
+
+def _settlement_lookups(
+    dates: np.ndarray,
+    settlement_delay_days: int,
+    calendar: Optional[SettlementCalendar],
+):
+    """
+    Per-day gather indexes of the settled cumulative flow ((index, weight)
+    pairs; -1 = nothing settled) and the longest lookback they need.
+    """
+    n_days = len(dates)
+    if calendar is None:
+        lookups = [(np.maximum(np.arange(n_days) - settlement_delay_days, -1), 1.0)]
+    else:
+        on_time, late = calendar.settled_index(dates, settlement_delay_days)
+        lookups = [(on_time, 1.0 - calendar.late_fraction)]
+        if calendar.cutoff_hour is not None:
+            lookups.append((late, calendar.late_fraction))
+    days = np.arange(n_days)
+    lookback = max([int((days - idx).max(initial=0)) for idx, _ in lookups])
+    return lookups, lookback
+
+
+def run_foe_monte_carlo(
+    flows_df: pd.DataFrame,
+    n_paths: int = 10_000,
+    settlement_delay_days: int = 2,
+    daily_volatility: float = 0.25,
+    monthly_volatility: float = 0.10,
+    percentiles: Sequence[float] = (50, 95, 99),
+    calendar: Optional[SettlementCalendar] = None,
+    seed: Optional[int] = None,
+    max_cells: int = 1 << 22,
+) -> Dict[str, Any]:
+    """
+    Stochastic-flow FOE.
+
+    Each path multiplies the deterministic daily profile (monthly flows
+    split evenly, as run_foe) by a mean-one lognormal shock per month
+    (monthly_volatility, shared by the month's days) and per day
+    (daily_volatility). Float is computed for all paths at once.
+
+    Days are processed in blocks of about max_cells / n_paths, carrying
+    each path's cumulative flow, the last `lookback` cumulative values and
+    its running peak between blocks, so memory stays O(n_paths x block)
+    (plus one shock per path and month) even for n_paths = 100k over
+    decades. Month shocks are drawn up front and each month's day shocks
+    come from its own child of SeedSequence(seed), so a seeded run gives
+    the same paths whatever max_cells is.
+
+    Returns:
+        percentiles – {"p50": ..., "p95": ..., "p99": ...} of peak float
+        peak_float  – (n_paths,) peak float per path
+        bands       – DataFrame [date, p50, p95, p99, mean] of
+                      float_required per day across paths
+    """
+    if n_paths < 1:
+        raise ValueError("n_paths must be at least 1.")
+    if settlement_delay_days < 0:
+        raise ValueError("settlement_delay_days must be non-negative.")
+
+    month_row, dates, _, base = expand_monthly_arrays(
+        flows_df["year"].to_numpy(dtype=np.int64),
+        flows_df["month"].to_numpy(dtype=np.int64),
+        flows_df["flow_usd"].to_numpy(dtype=np.float64),
+    )
+    n_days = len(base)
+    lookups, lookback = _settlement_lookups(dates, settlement_delay_days, calendar)
+    labels = [f"p{q:g}" for q in percentiles]
+
+    drift = -0.5 * (daily_volatility ** 2 + monthly_volatility ** 2)
+
+    # One stream for the monthly log shocks, one per month for its days.
+    n_months = int(month_row[-1]) + 1 if n_days else 0
+    month_seed, *day_seeds = np.random.SeedSequence(seed).spawn(n_months + 1)
+    month_shocks = monthly_volatility * np.random.default_rng(month_seed).standard_normal(
+        (n_paths, n_months)
+    )
+    day_rngs = [np.random.default_rng(s) for s in day_seeds]
+
+    # State carried across blocks.
+    history = np.zeros((n_paths, lookback))  # cumulative flow of the last `lookback` days
+    running = np.zeros(n_paths)
+    peak = np.full(n_paths, -np.inf)
+
+    bands = np.empty((len(percentiles), n_days))
+    mean_band = np.empty(n_days)
+    block = max(1, max_cells // n_paths)
+
+    for lo in range(0, n_days, block):
+        hi = min(lo + block, n_days)
+        rows = month_row[lo:hi]
+
+        # Daily log shocks, drawn day by day from each month's own stream
+        # so a month split across blocks continues where it left off.
+        flows = np.empty((n_paths, hi - lo))
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(rows)) + 1, [hi - lo]))
+        for a, b in zip(starts[:-1], starts[1:]):
+            flows[:, a:b] = day_rngs[rows[a]].standard_normal((b - a, n_paths)).T
+
+        # flows = base * exp(monthly + daily log shocks + drift), in place.
+        flows *= daily_volatility
+        flows += month_shocks[:, rows]
+        flows += drift
+        np.exp(flows, out=flows)
+        flows *= base[lo:hi]
+
+        cumulative = np.cumsum(flows, axis=1, out=flows)
+        cumulative += running[:, None]
+        running = cumulative[:, -1].copy()
+
+        # Columns of `window` are days lo - lookback .. hi - 1. Days before
+        # the start hold 0, so index -1 ("nothing settled") needs no branch.
+        window = np.concatenate((history, cumulative), axis=1) if lookback else cumulative
+        float_required = cumulative.copy()
+        for idx, weight in lookups:
+            cols = idx[lo:hi] - lo + lookback
+            if cols[-1] - cols[0] == len(cols) - 1 and np.all(np.diff(cols) == 1):
+                settled = window[:, cols[0]:cols[-1] + 1]
+            else:
+                settled = window[:, cols]
+            float_required -= settled if weight == 1.0 else weight * settled
+
+        np.maximum(peak, float_required.max(axis=1), out=peak)
+        # Percentiles over paths, on a day-major copy so each day's values
+        # are contiguous for the partition.
+        by_day = np.ascontiguousarray(float_required.T)
+        bands[:, lo:hi] = np.percentile(by_day, percentiles, axis=1)
+        mean_band[lo:hi] = by_day.mean(axis=1)
+        if lookback:
+            history = window[:, -lookback:].copy()
+
+    peak_percentiles = np.percentile(peak, percentiles) if n_days else np.full(len(labels), np.nan)
+    band_df = pd.DataFrame({"date": dates})
+    for label, values in zip(labels, bands):
+        band_df[label] = values
+    band_df["mean"] = mean_band
+
+    return {
+        "n_paths": n_paths,
+        "percentiles": dict(zip(labels, (float(v) for v in peak_percentiles))),
+        "peak_float": peak,
+        "bands": band_df,
+    }
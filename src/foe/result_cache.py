@@ -0,0 +1,286 @@
+# src/foe/result_cache.py
+
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Bump when the stored layout changes; older entries are then ignored.
+CACHE_FORMAT_VERSION = 2
+
+
+class UncacheableResult(TypeError):
+    """Raised when a result holds objects the columnar format cannot store."""
+
+
+# ---------- Columnar encoding ----------
+#
+# A result (nested dicts / lists of frames, arrays and JSON scalars) is
+# split into a JSON manifest describing its structure and a flat dict of
+# NumPy arrays, one per frame column or array, stored together in an .npz.
+# Every array is a plain (non-object) dtype, so the .npz never needs
+# pickling; anything else raises UncacheableResult and put() stores nothing.
+
+def _label(value: Any) -> Any:
+    """A column label or index name as a JSON scalar."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise UncacheableResult(f"Label {value!r} is not cacheable.")
+
+
+def _values_array(values: Union[pd.Series, pd.Index], what: str) -> Tuple[np.ndarray, Optional[str]]:
+    """
+    Storable (non-object) array for a column or an index, plus its time
+    zone: tz-aware datetimes are stored as naive UTC and the zone goes in
+    the manifest.
+    """
+    tz = getattr(values.dtype, "tz", None)
+    if tz is not None:
+        utc = pd.Series(values).dt.tz_convert("UTC").dt.tz_localize(None)
+        return utc.to_numpy(copy=True), str(tz)
+    if values.dtype.kind in "biufcmM":
+        return values.to_numpy(copy=True), None
+    items = values.tolist()
+    if all(isinstance(v, str) for v in items):
+        return np.asarray(items, dtype=np.str_), None
+    if isinstance(values, pd.Series):
+        try:
+            return values.to_numpy(dtype=np.float64), None
+        except (TypeError, ValueError):
+            pass
+    raise UncacheableResult(f"{what} has object values that cannot be stored.")
+
+
+def _restore_values(array: np.ndarray, tz: Optional[str], dtype: str) -> pd.Series:
+    values = pd.Series(array)
+    if tz is not None:
+        values = values.dt.tz_localize("UTC").dt.tz_convert(tz)
+    if str(values.dtype) != dtype:
+        values = values.astype(dtype)
+    return values
+
+
+def _encode_frame(obj: pd.DataFrame, arrays: Dict[str, np.ndarray]) -> Any:
+    keys, zones = [], []
+    for i in range(obj.shape[1]):
+        column = obj.iloc[:, i]
+        key = f"a{len(arrays)}"
+        arrays[key], tz = _values_array(column, f"Column {column.name!r}")
+        keys.append(key)
+        zones.append(tz)
+
+    index = obj.index
+    if isinstance(index, pd.MultiIndex):
+        raise UncacheableResult("MultiIndex frames are not cacheable.")
+    index_node = None
+    if not isinstance(index, pd.RangeIndex) or index.start != 0 or index.step != 1:
+        key = f"a{len(arrays)}"
+        arrays[key], tz = _values_array(index, "Index")
+        index_node = {"key": key, "tz": tz, "dtype": str(index.dtype)}
+    if isinstance(obj.columns, pd.MultiIndex):
+        raise UncacheableResult("MultiIndex columns are not cacheable.")
+
+    return {
+        "kind": "frame",
+        "columns": [_label(c) for c in obj.columns],
+        "columns_name": _label(obj.columns.name),
+        "dtypes": [str(t) for t in obj.dtypes],
+        "zones": zones,
+        "arrays": keys,
+        "index": index_node,
+        "index_name": _label(index.name),
+        "rows": len(obj),
+    }
+
+
+def _decode_frame(node: Any, arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    spec = node["index"]
+    if spec is None:
+        index = pd.RangeIndex(node["rows"])
+    else:
+        index = pd.Index(_restore_values(arrays[spec["key"]], spec["tz"], spec["dtype"]))
+    index.name = node["index_name"]
+
+    # Columns are built by position so duplicate labels survive.
+    columns = zip(node["arrays"], node["zones"], node["dtypes"])
+    df = pd.DataFrame(
+        {i: _restore_values(arrays[key], tz, dtype) for i, (key, tz, dtype) in enumerate(columns)},
+        index=pd.RangeIndex(node["rows"]),
+    )
+    df.index = index
+    df.columns = pd.Index(node["columns"], name=node["columns_name"])
+    return df
+
+
+def _encode(obj: Any, arrays: Dict[str, np.ndarray]) -> Any:
+    if isinstance(obj, pd.DataFrame):
+        return _encode_frame(obj, arrays)
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == "O":
+            raise UncacheableResult("Object arrays are not cacheable.")
+        key = f"a{len(arrays)}"
+        arrays[key] = obj.copy()
+        return {"kind": "array", "key": key}
+    if isinstance(obj, dict):
+        if not all(isinstance(k, str) for k in obj):
+            raise UncacheableResult("Only dicts with string keys are cacheable.")
+        return {"kind": "dict", "items": {k: _encode(v, arrays) for k, v in obj.items()}}
+    if isinstance(obj, (list, tuple)):
+        return {"kind": "list", "items": [_encode(v, arrays) for v in obj]}
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return {"kind": "value", "value": obj}
+    raise UncacheableResult(f"Objects of type {type(obj).__name__} are not cacheable.")
+
+
+def _decode(node: Any, arrays: Dict[str, np.ndarray]) -> Any:
+    kind = node["kind"]
+    if kind == "frame":
+        return _decode_frame(node, arrays)
+    if kind == "array":
+        return arrays[node["key"]].copy()
+    if kind == "dict":
+        return {k: _decode(v, arrays) for k, v in node["items"].items()}
+    if kind == "list":
+        return [_decode(v, arrays) for v in node["items"]]
+    return node["value"]
+
+
+# ---------- Cache ----------
+
+def _paths(directory: Path, key: str) -> Tuple[Path, Path]:
+    return directory / f"{key}.npz", directory / f"{key}.json"
+
+
+class ResultCache:
+    """
+    Content-addressed result cache: an in-process memo in front of an
+    on-disk store.
+
+    On disk each entry is <key>.npz (columns and arrays, no pickles) plus
+    <key>.json (structure and scalars). A hit refreshes the entry's mtime;
+    after each write the least recently used entries are evicted until the
+    directory holds at most max_bytes. With directory=None only the memo
+    is used.
+
+    Keys come from src.foe.hashing (hash_frame / hash_payload). Results
+    are decoded afresh on every hit, so callers may mutate what they get.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        memo_entries: int = 64,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memo_entries = memo_entries
+        self._memo: "OrderedDict[str, Tuple[Any, Dict[str, np.ndarray]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, manifest: Any, arrays: Dict[str, np.ndarray]) -> None:
+        if self.memo_entries <= 0:
+            return
+        self._memo[key] = (manifest, arrays)
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.memo_entries:
+            self._memo.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Tuple[Any, Dict[str, np.ndarray]]]:
+        if self.directory is None:
+            return None
+        npz_path, json_path = _paths(self.directory, key)
+        try:
+            with open(json_path, "r", encoding="utf-8") as fh:
+                meta = json.load(fh)
+            if meta.get("format") != CACHE_FORMAT_VERSION:
+                return None
+            with np.load(npz_path, allow_pickle=False) as npz:
+                arrays = {name: npz[name] for name in npz.files}
+        except (OSError, ValueError, KeyError):
+            return None
+        for path in (npz_path, json_path):
+            os.utime(path)
+        return meta["manifest"], arrays
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached result for key, or None."""
+        entry = self._memo.get(key)
+        if entry is not None:
+            self._memo.move_to_end(key)
+        else:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, *entry)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _decode(entry[0], entry[1])
+
+    def put(self, key: str, result: Any) -> bool:
+        """
+        Store result under key. Returns False (and stores nothing) if the
+        result holds values the columnar format cannot represent.
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        try:
+            manifest = _encode(result, arrays)
+        except UncacheableResult:
+            return False
+        self._remember(key, manifest, arrays)
+
+        if self.directory is not None:
+            npz_path, json_path = _paths(self.directory, key)
+            tmp_npz = npz_path.with_suffix(".tmp.npz")
+            tmp_json = json_path.with_suffix(".tmp.json")
+            np.savez(tmp_npz, **arrays)
+            with open(tmp_json, "w", encoding="utf-8") as fh:
+                json.dump({"format": CACHE_FORMAT_VERSION, "manifest": manifest}, fh)
+            os.replace(tmp_npz, npz_path)
+            os.replace(tmp_json, json_path)
+            self._evict(self.directory)
+        return True
+
+    def _evict(self, directory: Path) -> None:
+        entries = []
+        total = 0
+        for npz_path in directory.glob("*.npz"):
+            if npz_path.name.endswith(".tmp.npz"):
+                continue
+            json_path = npz_path.with_suffix(".json")
+            try:
+                size = npz_path.stat().st_size + json_path.stat().st_size
+                mtime = npz_path.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((mtime, size, npz_path, json_path))
+            total += size
+
+        for _, size, npz_path, json_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (npz_path, json_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._memo.pop(npz_path.stem, None)
+            total -= size
+
+    def clear(self) -> None:
+        self._memo.clear()
+        if self.directory is not None:
+            for path in list(self.directory.glob("*.npz")) + list(self.directory.glob("*.json")):
+                path.unlink(missing_ok=True)
@@ -0,0 +1,176 @@
+# src/foe/settlement_calendar.py
+
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class SettlementCalendar:
+    """
+    Business-day settlement rules for a corridor.
+
+    weekmask:    business days Monday..Sunday, as accepted by
+                 np.busdaycalendar (e.g. "1111100" or "Mon Tue Wed Thu Fri").
+    holidays:    non-business dates (anything np.datetime64 parses).
+    cutoff_hour: local hour after which a business day's receipts count
+                 as received the next business day. Daily flows are
+                 assumed to arrive evenly through the day, so a fraction
+                 (24 - cutoff_hour) / 24 of each business day's flow
+                 settles one business day later. None = no cut-off.
+
+    A flow received on day j settles settlement_delay_days business days
+    after j (after j is rolled forward to a business day). With an
+    all-days weekmask, no holidays and no cut-off this is exactly the
+    calendar-day shift of compute_float_series.
+
+    Calendars are immutable and hashable; compiled settlement indexes are
+    cached per (calendar, date range, delay).
+    """
+
+    weekmask: str = "1111100"
+    holidays: Tuple[str, ...] = field(default=())
+    cutoff_hour: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        days = np.unique(np.asarray(list(self.holidays), dtype="datetime64[D]"))
+        object.__setattr__(self, "holidays", tuple(str(d) for d in days))
+        if self.cutoff_hour is not None and not 0 <= self.cutoff_hour <= 24:
+            raise ValueError("cutoff_hour must lie between 0 and 24.")
+
+    @cached_property
+    def busdaycalendar(self) -> np.busdaycalendar:
+        return np.busdaycalendar(
+            weekmask=self.weekmask,
+            holidays=np.asarray(self.holidays, dtype="datetime64[D]"),
+        )
+
+    @property
+    def late_fraction(self) -> float:
+        if self.cutoff_hour is None:
+            return 0.0
+        return (24.0 - self.cutoff_hour) / 24.0
+
+    def settlement_dates(
+        self,
+        dates: np.ndarray,
+        settlement_delay_days: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Settlement date of flows received on each date before and after
+        the cut-off. Both arrays are non-decreasing for sorted dates.
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        cal = self.busdaycalendar
+        on_time = np.busday_offset(dates, settlement_delay_days, roll="forward", busdaycal=cal)
+        if self.cutoff_hour is None:
+            return on_time, on_time
+        # Late receipts on a business day move to the next one; receipts
+        # on a non-business day are already processed on the next one.
+        extra = np.is_busday(dates, busdaycal=cal).astype(np.int64)
+        late = np.busday_offset(
+            dates, settlement_delay_days + extra, roll="forward", busdaycal=cal
+        )
+        return on_time, late
+
+    def settled_index(
+        self,
+        dates: np.ndarray,
+        settlement_delay_days: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather indexes into the cumulative-flow series.
+
+        For each day t, on_time[t] (late[t]) is the last day whose
+        before (after) cut-off receipts have settled by t, or -1 if none,
+        so settled[t] is a pair of O(1) lookups (see settled_flow).
+        dates must be sorted.
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        if settlement_delay_days < 0:
+            raise ValueError("settlement_delay_days must be non-negative.")
+        if len(dates) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        day_number = dates.astype(np.int64)
+        if np.all(np.diff(day_number) == 1):
+            return _compiled_index(self, int(day_number[0]), len(dates), settlement_delay_days)
+        return _settled_index(self, dates, settlement_delay_days)
+
+    def settled_flow(
+        self,
+        cumulative_flow: np.ndarray,
+        dates: np.ndarray,
+        settlement_delay_days: int,
+    ) -> np.ndarray:
+        """Cumulative flow settled by each day under this calendar."""
+        cumulative_flow = np.asarray(cumulative_flow, dtype=np.float64)
+        on_time, late = self.settled_index(dates, settlement_delay_days)
+        # Pad with a leading 0 so index -1 means "nothing settled yet".
+        padded = np.concatenate(([0.0], cumulative_flow))
+        settled = padded[on_time + 1]
+        if self.cutoff_hour is not None:
+            settled = (1.0 - self.late_fraction) * settled + self.late_fraction * padded[late + 1]
+        return settled
+
+
+def _settled_index(
+    calendar: SettlementCalendar,
+    dates: np.ndarray,
+    settlement_delay_days: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    on_time, late = calendar.settlement_dates(dates, settlement_delay_days)
+    on_time_idx = np.searchsorted(on_time, dates, side="right") - 1
+    if calendar.cutoff_hour is None:
+        return on_time_idx, on_time_idx
+    return on_time_idx, np.searchsorted(late, dates, side="right") - 1
+
+
+@lru_cache(maxsize=256)
+def _compiled_index(
+    calendar: SettlementCalendar,
+    start_day: int,
+    n_days: int,
+    settlement_delay_days: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Cached settled_index for a contiguous range of days (read-only arrays)."""
+    dates = np.arange(start_day, start_day + n_days).astype("datetime64[D]")
+    on_time, late = _settled_index(calendar, dates, settlement_delay_days)
+    on_time.setflags(write=False)
+    late.setflags(write=False)
+    return on_time, late
+
+
+def daily_dates(daily_df: pd.DataFrame) -> np.ndarray:
+    """datetime64[D] dates of a [year, month, day] daily frame."""
+    months = (
+        (daily_df["year"].to_numpy(dtype=np.int64) - 1970) * 12
+        + daily_df["month"].to_numpy(dtype=np.int64) - 1
+    ).astype("datetime64[M]")
+    return months.astype("datetime64[D]") + (daily_df["day"].to_numpy(dtype=np.int64) - 1)
+
+
+# ---------- Corridor registry ----------
+
+_CORRIDOR_CALENDARS: Dict[str, SettlementCalendar] = {}
+
+
+def register_corridor_calendar(corridor_id: str, calendar: SettlementCalendar) -> None:
+    """Use `calendar` for every FOE run of this corridor that passes none."""
+    _CORRIDOR_CALENDARS[corridor_id] = calendar
+
+
+def get_corridor_calendar(corridor_id: str) -> Optional[SettlementCalendar]:
+    return _CORRIDOR_CALENDARS.get(corridor_id)
+
+
+def resolve_calendar(
+    corridor_id: str,
+    calendar: Optional[SettlementCalendar] = None,
+) -> Optional[SettlementCalendar]:
+    """calendar if given, else the one registered for corridor_id (None = calendar days)."""
+    return calendar if calendar is not None else get_corridor_calendar(corridor_id)
@@ -0,0 +1,178 @@
+# src/foe/streaming.py
+
+import math
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.foe.flow_profile import expand_monthly_arrays
+from src.foe.settlement_calendar import SettlementCalendar
+
+
+class _SettlementQueue:
+    """
+    Days whose receipts have not settled yet, as (settlement date,
+    cumulative flow) pairs in date order, plus the cumulative flow of
+    everything already settled. Settlement dates are non-decreasing, so
+    settled flow at t is the last queued cumulative value settling by t.
+    """
+
+    def __init__(self) -> None:
+        self._dates = np.empty(0, dtype="datetime64[D]")
+        self._cumulative = np.empty(0, dtype=np.float64)
+        self._settled = 0.0
+
+    def push_and_settle(
+        self,
+        settle_dates: np.ndarray,
+        cumulative: np.ndarray,
+        dates: np.ndarray,
+    ) -> np.ndarray:
+        queued_dates = np.concatenate((self._dates, settle_dates))
+        queued = np.concatenate((self._cumulative, cumulative))
+        idx = np.searchsorted(queued_dates, dates, side="right") - 1
+        settled = np.where(idx >= 0, queued[np.maximum(idx, 0)], self._settled)
+
+        done = int(idx[-1]) + 1
+        if done:
+            self._settled = float(queued[done - 1])
+        self._dates = queued_dates[done:]
+        self._cumulative = queued[done:]
+        return settled
+
+
+class FloatStreamAccumulator:
+    """
+    Constant-memory version of compute_float_series + summarize_float_metrics.
+
+    Flows arrive in chunks of consecutive steps (days, or hours with
+    steps_per_day=24). Only the running cumulative flow, a ring of the
+    last `lag` cumulative values (lag = settlement_delay_days *
+    steps_per_day) and the running peak are carried between chunks, so
+    memory is O(lag + chunk) regardless of the horizon.
+
+    With a SettlementCalendar the steps are days, each update() needs the
+    chunk's dates, and settlement follows the calendar as in
+    compute_float_series; only the not-yet-settled days are carried.
+    """
+
+    def __init__(
+        self,
+        settlement_delay_days: int = 2,
+        steps_per_day: int = 1,
+        calendar: Optional[SettlementCalendar] = None,
+    ) -> None:
+        if settlement_delay_days < 0:
+            raise ValueError("settlement_delay_days must be non-negative.")
+        if steps_per_day < 1:
+            raise ValueError("steps_per_day must be at least 1.")
+        if calendar is not None and steps_per_day != 1:
+            raise ValueError("Calendar settlement needs steps_per_day=1.")
+
+        self.settlement_delay_days = settlement_delay_days
+        self.calendar = calendar
+        if calendar is not None:
+            self._on_time = _SettlementQueue()
+            self._late = _SettlementQueue()
+        self.steps_per_day = steps_per_day
+        self.lag = settlement_delay_days * steps_per_day
+        # Cumulative flow of the last `lag` steps, oldest first. Steps
+        # before the start count as 0 (nothing settled yet).
+        self._ring = np.zeros(self.lag, dtype=np.float64)
+        self._cumulative = 0.0
+        self._total = 0.0
+        self._peak = -math.inf
+        self._last = math.nan
+        self.steps = 0
+
+    def update(
+        self,
+        flows: Union[np.ndarray, Iterable[float]],
+        dates: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Consume the next chunk of per-step flows; returns its float_required.
+        dates (datetime64[D], one per flow) are required with a calendar.
+        """
+        flows = np.asarray(flows, dtype=np.float64).reshape(-1)
+        n = len(flows)
+        if n == 0:
+            return flows
+
+        # Seeding the cumsum with the carried total keeps the running sum
+        # identical to one cumsum over the whole series.
+        cumulative = np.cumsum(np.concatenate(([self._cumulative], flows)))[1:]
+        if self.calendar is not None:
+            if dates is None or len(dates) != n:
+                raise ValueError("Calendar settlement needs one date per flow.")
+            float_required = cumulative - self._calendar_settled(cumulative, dates)
+        elif self.lag:
+            history = np.concatenate((self._ring, cumulative))
+            float_required = cumulative - history[:n]
+            self._ring = history[-self.lag:]
+        else:
+            float_required = cumulative - cumulative
+
+        self._cumulative = float(cumulative[-1])
+        self._total += float(flows.sum())
+        self._peak = max(self._peak, float(float_required.max()))
+        self._last = float(float_required[-1])
+        self.steps += n
+        return float_required
+
+    def _calendar_settled(self, cumulative: np.ndarray, dates: np.ndarray) -> np.ndarray:
+        cal = self.calendar
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        on_time, late = cal.settlement_dates(dates, self.settlement_delay_days)
+        settled = self._on_time.push_and_settle(on_time, cumulative, dates)
+        if cal.cutoff_hour is not None:
+            frac = cal.late_fraction
+            late_settled = self._late.push_and_settle(late, cumulative, dates)
+            settled = (1.0 - frac) * settled + frac * late_settled
+        return settled
+
+    def metrics(self) -> Dict[str, Union[float, int]]:
+        """Same fields as summarize_float_metrics for the flows seen so far."""
+        return {
+            "peak_float_usd": self._peak if self.steps else math.nan,
+            "final_float_usd": self._last,
+            "total_flow_usd": self._total,
+            "days": math.ceil(self.steps / self.steps_per_day),
+        }
+
+
+def run_foe_streaming(
+    monthly_chunks: Iterable[pd.DataFrame],
+    settlement_delay_days: int = 2,
+    steps_per_day: int = 1,
+    calendar: Optional[SettlementCalendar] = None,
+) -> Dict[str, Union[float, int]]:
+    """
+    run_foe metrics without materialising the daily frame.
+
+    monthly_chunks yields consecutive monthly frames with columns
+    [year, month, flow_usd] (e.g. one year at a time). Each chunk is
+    expanded to days, split evenly into steps_per_day steps, and fed to a
+    FloatStreamAccumulator; the settlement lag is settlement_delay_days
+    whole days at that granularity.
+
+    calendar: business-day settlement calendar (steps_per_day must be 1).
+    None means calendar-day settlement; registered corridor calendars are
+    not looked up, so pass the calendar explicitly.
+
+    With steps_per_day=1 the metrics equal run_foe(..., calendar=calendar)
+    ["metrics"] on the concatenated input (total_flow_usd up to summation
+    rounding).
+    """
+    acc = FloatStreamAccumulator(settlement_delay_days, steps_per_day, calendar)
+    for chunk in monthly_chunks:
+        _, dates, _, daily = expand_monthly_arrays(
+            chunk["year"].to_numpy(dtype=np.int64),
+            chunk["month"].to_numpy(dtype=np.int64),
+            chunk["flow_usd"].to_numpy(dtype=np.float64),
+        )
+        if steps_per_day > 1:
+            daily = np.repeat(daily / steps_per_day, steps_per_day)
+        acc.update(daily, dates if calendar is not None else None)
+    return acc.metrics()
@@ -0,0 +1,232 @@
+# src/foe/tracing.py
+
+import functools
+import inspect
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, Union
+
+try:  # not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+_ACTIVE: ContextVar[Optional["Tracer"]] = ContextVar("foe_tracer", default=None)
+
+
+@dataclass
+class Span:
+    """One timed stage. Times in seconds, memory in bytes."""
+
+    name: str
+    parent: Optional[int]      # index of the enclosing span in Tracer.spans
+    start_s: float             # offset from the tracer start
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rows: Optional[int] = None
+    peak_alloc_bytes: Optional[int] = None  # tracemalloc peak, if tracing memory
+    max_rss_bytes: Optional[int] = None     # process high-water mark at span end
+    thread_id: int = 0
+
+
+class _NullSpan:
+    """Stand-in yielded when no tracer is active; attribute writes are ignored."""
+
+    rows = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _max_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class Tracer:
+    """
+    Collects nested spans for one run.
+
+        with Tracer() as tracer:
+            run_corridor_foe_pipeline(...)
+        tracer.to_chrome_trace()
+
+    While a tracer is active (in this context), span() calls anywhere in
+    the pipeline record into it; otherwise span() is a no-op. Each span
+    costs a couple of clock reads and a getrusage call. With
+    trace_memory=True, tracemalloc also records the peak allocation per
+    span, which is considerably slower.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.spans: List[Span] = []
+        self._stack: List[int] = []
+        self._origin = time.perf_counter()
+        self._tokens: List[Token] = []
+        self._started_tracemalloc = False
+        # Peak allocation seen so far by each open span (tracemalloc's peak
+        # is reset when a child starts, so parents accumulate it here).
+        self._open_peaks: Dict[int, int] = {}
+
+    def __enter__(self) -> "Tracer":
+        self._tokens.append(_ACTIVE.set(self))
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        _ACTIVE.reset(self._tokens.pop())
+        if self._started_tracemalloc and not self._tokens:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def span(self, name: str, rows: Optional[int] = None) -> Iterator[Span]:
+        index = len(self.spans)
+        parent = self._stack[-1] if self._stack else None
+        record = Span(
+            name=name,
+            parent=parent,
+            start_s=time.perf_counter() - self._origin,
+            rows=rows,
+            thread_id=threading.get_ident(),
+        )
+        self.spans.append(record)
+
+        memory = self.trace_memory and tracemalloc.is_tracing()
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            for open_index in self._stack:
+                self._open_peaks[open_index] = max(self._open_peaks.get(open_index, 0), peak)
+            tracemalloc.reset_peak()
+            self._open_peaks[index] = 0
+
+        self._stack.append(index)
+        wall0 = time.perf_counter()
+        cpu0 = time.process_time()
+        try:
+            yield record
+        finally:
+            record.cpu_s = time.process_time() - cpu0
+            record.wall_s = time.perf_counter() - wall0
+            self._stack.pop()
+            if memory:
+                peak = max(self._open_peaks.pop(index, 0), tracemalloc.get_traced_memory()[1])
+                record.peak_alloc_bytes = peak
+                if parent is not None:
+                    self._open_peaks[parent] = max(self._open_peaks.get(parent, 0), peak)
+            record.max_rss_bytes = _max_rss_bytes()
+
+    # ---------- Export ----------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"spans": [asdict(s) for s in self.spans]}
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format (chrome://tracing, Perfetto): complete events in µs."""
+        events = []
+        for s in self.spans:
+            args: Dict[str, Any] = {"cpu_ms": s.cpu_s * 1e3}
+            for key in ("rows", "peak_alloc_bytes", "max_rss_bytes"):
+                value = getattr(s, key)
+                if value is not None:
+                    args[key] = value
+            events.append({
+                "name": s.name,
+                "ph": "X",
+                "ts": s.start_s * 1e6,
+                "dur": s.wall_s * 1e6,
+                "pid": 0,
+                "tid": s.thread_id,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_chrome_trace(), fh)
+
+    def summary(self) -> Dict[str, float]:
+        """Total wall seconds per span name."""
+        totals: Dict[str, float] = {}
+        for s in self.spans:
+            totals[s.name] = totals.get(s.name, 0.0) + s.wall_s
+        return totals
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _ACTIVE.get()
+
+
+def span(name: str, rows: Optional[int] = None):
+    """
+    Record a stage on the active tracer; a shared no-op when none is active.
+
+        with span("foe.float_series", rows=len(df)) as s:
+            ...
+            s.rows = len(out)   # optional, after the fact
+    """
+    tracer = _ACTIVE.get()
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, rows)
+
+
+F = TypeVar("F", bound=Callable[..., Dict[str, Any]])
+
+
+def traced_pipeline(name: str) -> Callable[[F], F]:
+    """
+    Decorator for pipeline entry points that return a dict and take a
+    `trace` argument (False, True or a Tracer).
+
+    With trace=True (a fresh Tracer) or a Tracer, the call runs under that
+    tracer inside a root span `name`, and the tracer is attached to the
+    result under "trace". With trace=False the call is untouched, though
+    spans still record into a tracer the caller already activated.
+    """
+
+    def decorate(func: F) -> F:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+            trace: Union[bool, Tracer] = signature.bind(*args, **kwargs).arguments.get(
+                "trace", False
+            )
+            if trace is False or trace is None:
+                return func(*args, **kwargs)
+
+            tracer = Tracer() if trace is True else trace
+            with tracer, tracer.span(name):
+                result = func(*args, **kwargs)
+            result["trace"] = tracer
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
@@ -0,0 +1,531 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .sequencing_graph import EventId
+from .sequencing_graph import Event
+from .sequencing_graph import Dependency
+from .sequencing_graph import SequencingGraph
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MIN_SECONDS = int(np.iinfo(np.int64).min)
+_MAX_SECONDS = int(np.iinfo(np.int64).max)
+
+
+def datetime_to_epoch_seconds(ts: datetime) -> int:
+    """
+    Convert a datetime to integer epoch seconds.
+    Naive datetimes are interpreted as UTC; sub-second precision is dropped.
+    """
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (ts - _EPOCH) // timedelta(seconds=1)
+
+
+def epoch_seconds_to_datetime(seconds: int) -> datetime:
+    """Inverse of datetime_to_epoch_seconds (always returns a UTC datetime)."""
+    return _EPOCH + timedelta(seconds=int(seconds))
+
+
+def _index_dtype(n: int) -> np.dtype:
+    return np.dtype(np.int32) if n < np.iinfo(np.int32).max else np.dtype(np.int64)
+
+
+def _encode_categories(values: Iterable[str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Dictionary-encode string values into int32 codes.
+    Categories keep first-seen order.
+    """
+    lookup: Dict[str, int] = {}
+    codes = np.fromiter(
+        (lookup.setdefault(v, len(lookup)) for v in values),
+        dtype=np.int32,
+    )
+    return codes, list(lookup.keys())
+
+
+def _build_csr(
+    src: np.ndarray,
+    dst: np.ndarray,
+    n: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build CSR arrays (indptr, indices) for edges src -> dst over n nodes.
+    Edges of one source keep their insertion order.
+    """
+    order = np.argsort(src, kind="stable")
+    indices = dst[order].astype(_index_dtype(n), copy=False)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, indices
+
+
+def _gather_neighbours(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    nodes: np.ndarray,
+) -> np.ndarray:
+    """Concatenate the CSR neighbour slices of `nodes` without a Python loop."""
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return indices[:0]
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return indices[offsets + np.arange(total)]
+
+
+TimeBound = Union[datetime, int, None]
+
+
+def _bound_seconds(bound: TimeBound, default: int) -> int:
+    if bound is None:
+        return default
+    if isinstance(bound, datetime):
+        return datetime_to_epoch_seconds(bound)
+    return int(bound)
+
+
+class _GroupedTimeIndex:
+    """
+    Static index of events sorted by (group code, scheduled_time).
+    Each group is a contiguous segment located through `indptr`, so a
+    range query is two binary searches inside one segment.
+    """
+
+    def __init__(self, codes: np.ndarray, times: np.ndarray, n_groups: int) -> None:
+        self.order = np.lexsort((times, codes))
+        self.times = times[self.order]
+        self.indptr = np.zeros(n_groups + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=n_groups), out=self.indptr[1:])
+
+    def query(self, code: int, start: int, end: int) -> np.ndarray:
+        lo, hi = self.indptr[code], self.indptr[code + 1]
+        seg = self.times[lo:hi]
+        a = lo + np.searchsorted(seg, start, side="left")
+        b = lo + np.searchsorted(seg, end, side="left")
+        return self.order[a:max(a, b)]
+
+
+class CompactSequencingGraph:
+    """
+    Array-backed, read-only storage engine for a sequencing graph.
+
+    - EventIds are mapped to dense integers 0..n-1. The ids are stored
+      once, sorted for O(log n) id -> index lookups, with permutations
+      between sorted position and dense index.
+    - Adjacency is stored in CSR form (int64 indptr, int32 indices) in
+      both directions. The CSR arrays are write-protected, so the views
+      returned by successor_indices() and friends are read-only.
+    - Event attributes are stored as columns:
+        amount         float64
+        scheduled_time int64 epoch seconds (UTC)
+        actor_code     int32 codes into actor_categories
+        type_code      int32 codes into type_categories
+        currency_code  int32 codes into currency_categories
+
+    Event/Dependency metadata dicts are not stored.
+    """
+
+    def __init__(
+        self,
+        event_ids: np.ndarray,
+        amount: np.ndarray,
+        scheduled_time: np.ndarray,
+        actor_code: np.ndarray,
+        actor_categories: Sequence[str],
+        type_code: np.ndarray,
+        type_categories: Sequence[str],
+        currency_code: np.ndarray,
+        currency_categories: Sequence[str],
+        edge_src: np.ndarray,
+        edge_dst: np.ndarray,
+    ) -> None:
+        """
+        Low-level constructor. `event_ids` is a bytes ('S') array of
+        UTF-8 encoded ids; edges are given as dense index arrays.
+        Prefer from_graph() unless the columns already exist.
+        """
+        n = len(event_ids)
+
+        ids = np.asarray(event_ids, dtype=np.bytes_)
+        # Ids sorted for O(log n) id -> index lookups; _id_order maps a
+        # sorted position to its dense index and _id_rank the reverse.
+        self._id_order = np.argsort(ids, kind="stable").astype(_index_dtype(n))
+        self._sorted_ids = ids[self._id_order]
+        self._id_rank = np.empty(n, dtype=self._id_order.dtype)
+        self._id_rank[self._id_order] = np.arange(n, dtype=self._id_order.dtype)
+
+        self.amount = np.asarray(amount, dtype=np.float64)
+        self.scheduled_time = np.asarray(scheduled_time, dtype=np.int64)
+        self.actor_code = np.asarray(actor_code, dtype=np.int32)
+        self.actor_categories: List[str] = list(actor_categories)
+        self.type_code = np.asarray(type_code, dtype=np.int32)
+        self.type_categories: List[str] = list(type_categories)
+        self.currency_code = np.asarray(currency_code, dtype=np.int32)
+        self.currency_categories: List[str] = list(currency_categories)
+
+        src = np.asarray(edge_src, dtype=np.int64)
+        dst = np.asarray(edge_dst, dtype=np.int64)
+        self._succ_indptr, self._succ_indices = _build_csr(src, dst, n)
+        self._pred_indptr, self._pred_indices = _build_csr(dst, src, n)
+        for array in (
+            self._sorted_ids,
+            self._id_order,
+            self._id_rank,
+            self._succ_indptr,
+            self._succ_indices,
+            self._pred_indptr,
+            self._pred_indices,
+        ):
+            array.setflags(write=False)
+
+        # The structure is immutable, so the ordering and the secondary
+        # indexes are computed once, on first use.
+        self._topo: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._time_order: Optional[np.ndarray] = None
+        self._sorted_times: Optional[np.ndarray] = None
+        self._actor_index: Optional[_GroupedTimeIndex] = None
+        self._type_index: Optional[_GroupedTimeIndex] = None
+        self._actor_type_index: Optional[_GroupedTimeIndex] = None
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_graph(cls, graph: SequencingGraph) -> "CompactSequencingGraph":
+        """
+        Build a compact copy of a SequencingGraph.
+        Node indices follow the graph's event insertion order.
+        """
+        events = graph.events
+        index: Dict[EventId, int] = {event.id: i for i, event in enumerate(events)}
+
+        actor_code, actor_categories = _encode_categories(e.actor_id for e in events)
+        type_code, type_categories = _encode_categories(e.event_type for e in events)
+        currency_code, currency_categories = _encode_categories(e.currency for e in events)
+
+        src: List[int] = []
+        dst: List[int] = []
+        for event in events:
+            i = index[event.id]
+            for succ in graph.successors(event.id):
+                src.append(i)
+                dst.append(index[succ])
+
+        return cls(
+            event_ids=np.array(
+                [e.id.value.encode("utf-8") for e in events], dtype=np.bytes_
+            ),
+            amount=np.fromiter((e.amount for e in events), dtype=np.float64),
+            scheduled_time=np.fromiter(
+                (datetime_to_epoch_seconds(e.scheduled_time) for e in events),
+                dtype=np.int64,
+            ),
+            actor_code=actor_code,
+            actor_categories=actor_categories,
+            type_code=type_code,
+            type_categories=type_categories,
+            currency_code=currency_code,
+            currency_categories=currency_categories,
+            edge_src=np.asarray(src, dtype=np.int64),
+            edge_dst=np.asarray(dst, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_frames(cls, events: Any, dependencies: Optional[Any] = None) -> "CompactSequencingGraph":
+        """
+        Bulk constructor from event/dependency columns (DataFrames, dicts
+        of NumPy arrays, Arrow tables). See ingest.compact_graph_from_frames.
+        """
+        from .ingest import compact_graph_from_frames
+
+        return compact_graph_from_frames(events, dependencies)
+
+    def to_graph(self) -> SequencingGraph:
+        """Materialize an object-based SequencingGraph (metadata is empty)."""
+        g = SequencingGraph()
+        for event in self.iter_events():
+            g.add_event(event)
+        src, dst = self.edge_arrays()
+        for u, v in zip(src.tolist(), dst.tolist()):
+            g.add_dependency(
+                Dependency(predecessor=self.event_id_at(u), successor=self.event_id_at(v))
+            )
+        return g
+
+    # ------------------------------------------------------------------
+    # Sizes and id mapping
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._sorted_ids)
+
+    @property
+    def num_events(self) -> int:
+        return len(self._sorted_ids)
+
+    @property
+    def num_dependencies(self) -> int:
+        return len(self._succ_indices)
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes held by the array columns and CSR structure."""
+        arrays = [
+            self._sorted_ids,
+            self._id_order,
+            self._id_rank,
+            self.amount,
+            self.scheduled_time,
+            self.actor_code,
+            self.type_code,
+            self.currency_code,
+            self._succ_indptr,
+            self._succ_indices,
+            self._pred_indptr,
+            self._pred_indices,
+        ]
+        return int(sum(a.nbytes for a in arrays))
+
+    def index_of(self, event_id: EventId) -> int:
+        """Dense index of an event. Raises KeyError if missing."""
+        key = event_id.value.encode("utf-8")
+        pos = int(np.searchsorted(self._sorted_ids, key))
+        if pos == len(self._sorted_ids) or self._sorted_ids[pos] != key:
+            raise KeyError(event_id)
+        return int(self._id_order[pos])
+
+    def event_id_at(self, index: int) -> EventId:
+        return EventId(self._sorted_ids[self._id_rank[index]].decode("utf-8"))
+
+    def event_ids_at(self, indices: Iterable[int]) -> List[EventId]:
+        if not isinstance(indices, np.ndarray):
+            indices = np.fromiter(indices, dtype=np.int64)
+        ids = self._sorted_ids[self._id_rank[indices]]
+        return [EventId(b.decode("utf-8")) for b in ids.tolist()]
+
+    # ------------------------------------------------------------------
+    # Event access
+    # ------------------------------------------------------------------
+    def event_at(self, index: int) -> Event:
+        """Materialize the Event stored at a dense index."""
+        return Event(
+            id=self.event_id_at(index),
+            actor_id=self.actor_categories[self.actor_code[index]],
+            event_type=self.type_categories[self.type_code[index]],
+            amount=float(self.amount[index]),
+            currency=self.currency_categories[self.currency_code[index]],
+            scheduled_time=epoch_seconds_to_datetime(self.scheduled_time[index]),
+        )
+
+    def get_event(self, event_id: EventId) -> Event:
+        """
+        Look up an event by ID. Raises KeyError if missing.
+        """
+        return self.event_at(self.index_of(event_id))
+
+    def iter_events(self) -> Iterator[Event]:
+        for i in range(len(self)):
+            yield self.event_at(i)
+
+    @property
+    def events(self) -> List[Event]:
+        """Return all events in the graph (materialized)."""
+        return list(self.iter_events())
+
+    # ------------------------------------------------------------------
+    # Basic graph queries
+    # ------------------------------------------------------------------
+    def successor_indices(self, index: int) -> np.ndarray:
+        """Direct successors of a dense index (read-only view)."""
+        return self._succ_indices[self._succ_indptr[index]:self._succ_indptr[index + 1]]
+
+    def predecessor_indices(self, index: int) -> np.ndarray:
+        """Direct predecessors of a dense index (read-only view)."""
+        return self._pred_indices[self._pred_indptr[index]:self._pred_indptr[index + 1]]
+
+    def predecessors(self, event_id: EventId) -> List[EventId]:
+        """Return direct predecessors of the given event."""
+        return self.event_ids_at(self.predecessor_indices(self.index_of(event_id)))
+
+    def successors(self, event_id: EventId) -> List[EventId]:
+        """Return direct successors of the given event."""
+        return self.event_ids_at(self.successor_indices(self.index_of(event_id)))
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self._pred_indptr)
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self._succ_indptr)
+
+    def successor_csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (indptr, indices) arrays of the successor CSR."""
+        return self._succ_indptr, self._succ_indices
+
+    def predecessor_csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (indptr, indices) arrays of the predecessor CSR."""
+        return self._pred_indptr, self._pred_indices
+
+    def edge_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (src, dst) dense index arrays for every dependency."""
+        src = np.repeat(
+            np.arange(len(self), dtype=self._succ_indices.dtype),
+            self.out_degree(),
+        )
+        return src, self._succ_indices
+
+    # ------------------------------------------------------------------
+    # Indexed queries (half-open [start, end) on scheduled_time)
+    #
+    # Bounds are datetimes or epoch seconds; results are dense indices
+    # ordered by scheduled_time.
+    # ------------------------------------------------------------------
+    def events_between_indices(self, start: TimeBound = None, end: TimeBound = None) -> np.ndarray:
+        if self._time_order is None:
+            self._time_order = np.argsort(self.scheduled_time, kind="stable")
+            self._sorted_times = self.scheduled_time[self._time_order]
+        lo = np.searchsorted(self._sorted_times, _bound_seconds(start, _MIN_SECONDS), side="left")
+        hi = np.searchsorted(self._sorted_times, _bound_seconds(end, _MAX_SECONDS), side="left")
+        return self._time_order[lo:max(lo, hi)]
+
+    def events_for_actor_indices(
+        self,
+        actor_id: str,
+        start: TimeBound = None,
+        end: TimeBound = None,
+        event_type: Optional[str] = None,
+    ) -> np.ndarray:
+        """Events of one actor (optionally one event_type) in [start, end)."""
+        lo = _bound_seconds(start, _MIN_SECONDS)
+        hi = _bound_seconds(end, _MAX_SECONDS)
+        try:
+            actor = self.actor_categories.index(actor_id)
+            etype = None if event_type is None else self.type_categories.index(event_type)
+        except ValueError:
+            return np.empty(0, dtype=np.int64)
+
+        if etype is None:
+            if self._actor_index is None:
+                self._actor_index = _GroupedTimeIndex(
+                    self.actor_code, self.scheduled_time, len(self.actor_categories)
+                )
+            return self._actor_index.query(actor, lo, hi)
+
+        n_types = len(self.type_categories)
+        if self._actor_type_index is None:
+            self._actor_type_index = _GroupedTimeIndex(
+                self.actor_code.astype(np.int64) * n_types + self.type_code,
+                self.scheduled_time,
+                len(self.actor_categories) * n_types,
+            )
+        return self._actor_type_index.query(actor * n_types + etype, lo, hi)
+
+    def events_of_type_indices(
+        self,
+        event_type: str,
+        start: TimeBound = None,
+        end: TimeBound = None,
+    ) -> np.ndarray:
+        """Events of one event_type in [start, end)."""
+        try:
+            etype = self.type_categories.index(event_type)
+        except ValueError:
+            return np.empty(0, dtype=np.int64)
+        if self._type_index is None:
+            self._type_index = _GroupedTimeIndex(
+                self.type_code, self.scheduled_time, len(self.type_categories)
+            )
+        return self._type_index.query(
+            etype, _bound_seconds(start, _MIN_SECONDS), _bound_seconds(end, _MAX_SECONDS)
+        )
+
+    def events_between(self, start: TimeBound = None, end: TimeBound = None) -> List[EventId]:
+        return self.event_ids_at(self.events_between_indices(start, end))
+
+    def events_for_actor(
+        self,
+        actor_id: str,
+        start: TimeBound = None,
+        end: TimeBound = None,
+        event_type: Optional[str] = None,
+    ) -> List[EventId]:
+        return self.event_ids_at(
+            self.events_for_actor_indices(actor_id, start, end, event_type)
+        )
+
+    def events_of_type(
+        self,
+        event_type: str,
+        start: TimeBound = None,
+        end: TimeBound = None,
+    ) -> List[EventId]:
+        return self.event_ids_at(self.events_of_type_indices(event_type, start, end))
+
+    # ------------------------------------------------------------------
+    # Topological ordering
+    # ------------------------------------------------------------------
+    def _kahn_levels(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Level-synchronous Kahn ordering over the CSR arrays.
+
+        Each iteration releases a whole frontier at once, so the Python
+        loop runs once per level rather than once per event. Returns
+        (order, level) and raises ValueError if it detects a cycle.
+        """
+        n = len(self)
+        in_degree = self.in_degree().astype(np.int64)
+        level = np.zeros(n, dtype=np.int32)
+        frontier = np.flatnonzero(in_degree == 0)
+
+        parts: List[np.ndarray] = []
+        placed = 0
+        depth = 0
+        while frontier.size:
+            parts.append(frontier)
+            level[frontier] = depth
+            placed += frontier.size
+            depth += 1
+
+            succ = _gather_neighbours(self._succ_indptr, self._succ_indices, frontier)
+            if succ.size == 0:
+                break
+            touched, counts = np.unique(succ, return_counts=True)
+            in_degree[touched] -= counts
+            frontier = touched[in_degree[touched] == 0]
+
+        if placed != n:
+            raise ValueError("Graph contains a cycle or disconnected dependency structure")
+
+        order = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        order.setflags(write=False)
+        level.setflags(write=False)
+        return order, level
+
+    def topological_order_indices(self) -> np.ndarray:
+        """
+        Dense indices in topological order (memoized, read-only).
+        Raises ValueError if it detects a cycle.
+        """
+        if self._topo is None:
+            self._topo = self._kahn_levels()
+        return self._topo[0]
+
+    def topological_levels(self) -> np.ndarray:
+        """
+        Generation of every event by dense index: 0 without predecessors,
+        otherwise one more than its deepest predecessor (memoized).
+        """
+        if self._topo is None:
+            self._topo = self._kahn_levels()
+        return self._topo[1]
+
+    def topological_order(self) -> List[EventId]:
+        """
+        Compute a topological ordering of the events.
+        Raises ValueError if it detects a cycle.
+        """
+        return self.event_ids_at(self.topological_order_indices())
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .sequencing_graph import EventId
+
+
+class TimeIndex:
+    """
+    Secondary index of events sorted by scheduled_time.
+
+    Two parallel lists (times, ids) are kept sorted; events with equal
+    times keep insertion order. Range queries are half-open [start, end)
+    and cost O(log n + k).
+    """
+
+    def __init__(self) -> None:
+        self._times: List[datetime] = []
+        self._ids: List[EventId] = []
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[datetime, EventId]]) -> "TimeIndex":
+        """Build an index in one sort instead of repeated inserts."""
+        index = cls()
+        ordered = sorted(pairs, key=lambda pair: pair[0])
+        index._times = [t for t, _ in ordered]
+        index._ids = [eid for _, eid in ordered]
+        return index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def insert(self, time: datetime, event_id: EventId) -> None:
+        # Appending in time order (the common streaming case) is O(1).
+        pos = bisect_right(self._times, time)
+        self._times.insert(pos, time)
+        self._ids.insert(pos, event_id)
+
+    def _bounds(self, start: Optional[datetime], end: Optional[datetime]) -> Tuple[int, int]:
+        lo = 0 if start is None else bisect_left(self._times, start)
+        hi = len(self._times) if end is None else bisect_left(self._times, end)
+        return lo, max(lo, hi)
+
+    def between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[EventId]:
+        """Events with start <= scheduled_time < end (None = unbounded)."""
+        lo, hi = self._bounds(start, end)
+        return self._ids[lo:hi]
+
+    def count_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> int:
+        lo, hi = self._bounds(start, end)
+        return hi - lo
@@ -1,7 +1,69 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Union
+
+import numpy as np
+
+
+ArrayLike = Union[float, np.ndarray]
+
+# Acklam's rational approximation of the inverse normal CDF
+# (relative error below 1.2e-9 over the whole open interval).
+_ACKLAM_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+             1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_ACKLAM_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+             6.680131188771972e+01, -1.328068155288572e+01)
+_ACKLAM_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+             -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_ACKLAM_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+             3.754408661907416e+00)
+_ACKLAM_P_LOW = 0.02425
+
+# Structured result of size_float_batch, one record per input row.
+FLOAT_BATCH_DTYPE = np.dtype([
+    ("required_float", np.float64),
+    ("annual_float_cost", np.float64),
+    ("z_value", np.float64),
+    ("horizon_days", np.float64),
+])
+
+
+def _polyval(coeffs: tuple, x: np.ndarray) -> np.ndarray:
+    out = np.full_like(x, coeffs[0])
+    for c in coeffs[1:]:
+        out = out * x + c
+    return out
+
+
+def inverse_normal_cdf(p: ArrayLike) -> ArrayLike:
+    """
+    z such that P(Z <= z) = p for a standard normal Z.
+
+    Accepts a scalar or an array (evaluated elementwise, no Python loop)
+    and returns the same shape. Raises ValueError unless 0 < p < 1.
+    """
+    q = np.asarray(p, dtype=np.float64)
+    if not np.all((q > 0.0) & (q < 1.0)):
+        raise ValueError("Probabilities must lie strictly between 0 and 1.")
+
+    z = np.empty_like(q)
+    low = q < _ACKLAM_P_LOW
+    high = q > 1.0 - _ACKLAM_P_LOW
+    mid = ~(low | high)
+
+    if mid.any():
+        r = q[mid] - 0.5
+        s = r * r
+        z[mid] = r * _polyval(_ACKLAM_A, s) / (_polyval(_ACKLAM_B, s) * s + 1.0)
+    if low.any():
+        t = np.sqrt(-2.0 * np.log(q[low]))
+        z[low] = _polyval(_ACKLAM_C, t) / (_polyval(_ACKLAM_D, t) * t + 1.0)
+    if high.any():
+        t = np.sqrt(-2.0 * np.log1p(-q[high]))
+        z[high] = -_polyval(_ACKLAM_C, t) / (_polyval(_ACKLAM_D, t) * t + 1.0)
+
+    return float(z) if z.ndim == 0 else z
 
 
 @dataclass
@@ -42,18 +104,8 @@ class FloatOptimizationEngine:
     - Estimate annual cost of holding that float.
     """
 
-    def __init__(self) -> None:
-        # Simple mapping from service level to z-score.
-        # Later we can replace this with a proper inverse normal CDF.
-        self._z_map: Dict[float, float] = {
-            0.90: 1.28,
-            0.95: 1.64,
-            0.99: 2.33,
-        }
-
     def _z_for_service_level(self, service_level: float) -> float:
-        # Default to 95% if not in the map.
-        return self._z_map.get(service_level, 1.64)
+        return inverse_normal_cdf(service_level)
 
     def size_float(self, inp: CorridorFloatInput) -> CorridorFloatResult:
         """
@@ -77,3 +129,37 @@ class FloatOptimizationEngine:
             annual_float_cost=annual_cost,
             z_value=z,
         )
+
+    def size_float_batch(
+        self,
+        expected_outflow: ArrayLike,
+        outflow_volatility: ArrayLike,
+        service_level: ArrayLike,
+        cost_of_float_per_year: ArrayLike,
+        horizon_days: ArrayLike = 1.0,
+    ) -> np.ndarray:
+        """
+        Vectorized size_float over many corridors (or corridor x currency x
+        service level combinations).
+
+        Inputs broadcast against each other (scalars included), with the
+        same meaning as the CorridorFloatInput fields. Returns a structured
+        array of FLOAT_BATCH_DTYPE with the broadcast shape; row k matches
+        size_float on the k-th combination of inputs.
+        """
+        mean, sigma, level, cost, horizon = np.broadcast_arrays(
+            *(np.asarray(a, dtype=np.float64) for a in (
+                expected_outflow, outflow_volatility, service_level,
+                cost_of_float_per_year, horizon_days,
+            ))
+        )
+
+        z = np.asarray(inverse_normal_cdf(level))
+        required = np.maximum(np.maximum(mean, 0.0) + z * np.maximum(sigma, 0.0), 0.0)
+
+        out = np.empty(mean.shape, dtype=FLOAT_BATCH_DTYPE)
+        out["required_float"] = required
+        out["annual_float_cost"] = required * cost
+        out["z_value"] = z
+        out["horizon_days"] = horizon
+        return out
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
 
 # Import each class separately to avoid line-wrapping issues
 from .sequencing_graph import EventId
 from .sequencing_graph import Event
 from .sequencing_graph import SequencingGraph
+from .compact_graph import CompactSequencingGraph
+from .compact_graph import datetime_to_epoch_seconds
+from .list_scheduler import INFLOW, OUTFLOW, NEUTRAL
+from .list_scheduler import list_schedule
+from .local_search import IncrementalScheduleEvaluator
+from .local_search import anneal
 
 
 @dataclass
@@ -23,6 +31,50 @@ class ScheduleResult:
     details: Dict[str, float]
 
 
+# ScheduleResult.details keys that are totals over events; everything
+# else in details is a run parameter shared by all parts of a graph.
+ADDITIVE_DETAIL_KEYS = {
+    "events_evaluated",
+    "unfunded_events",
+    "shortfall_amount",
+    "gap_cost",
+    "accepted_moves",
+}
+
+# Balance effect of each event_type, as modelled by the household
+# liquidity-gap simulation: incomes add, obligations subtract.
+EVENT_DIRECTIONS: Dict[str, int] = {"income": INFLOW, "obligation": OUTFLOW}
+
+
+def merge_schedule_results(results: Iterable[ScheduleResult]) -> ScheduleResult:
+    """
+    Combine results computed on disjoint parts of a graph (e.g. shards).
+
+    - decisions are unioned,
+    - total_delay_cost is summed,
+    - details in ADDITIVE_DETAIL_KEYS are summed; other details are run
+      parameters and the first part's value is kept.
+    """
+    decisions: Dict[EventId, ExecutionDecision] = {}
+    total_delay_cost = 0.0
+    details: Dict[str, float] = {}
+
+    for result in results:
+        decisions.update(result.decisions)
+        total_delay_cost += result.total_delay_cost
+        for key, value in result.details.items():
+            if key not in details:
+                details[key] = value
+            elif key in ADDITIVE_DETAIL_KEYS:
+                details[key] += value
+
+    return ScheduleResult(
+        decisions=decisions,
+        total_delay_cost=total_delay_cost,
+        details=details,
+    )
+
+
 class FlowOptimizationEngine:
     """
     v1 skeleton of the Flow Optimization Engine (FOE).
@@ -30,6 +82,121 @@ class FlowOptimizationEngine:
 
     def __init__(self, graph: SequencingGraph) -> None:
         self.graph = graph
+        # (graph version, event ids, id -> column, scheduled epoch seconds)
+        self._arrays: Optional[
+            Tuple[int, List[EventId], Dict[EventId, int], np.ndarray]
+        ] = None
+        self._compact: Optional[Tuple[int, CompactSequencingGraph]] = None
+
+    # ------------------------------------------------------------------
+    # Array view of the graph (columns follow graph insertion order)
+    # ------------------------------------------------------------------
+    def _event_arrays(self) -> Tuple[List[EventId], Dict[EventId, int], np.ndarray]:
+        arrays = self._arrays
+        if arrays is None or arrays[0] != self.graph.version:
+            events = self.graph.events
+            ids = [event.id for event in events]
+            scheduled = np.fromiter(
+                (datetime_to_epoch_seconds(event.scheduled_time) for event in events),
+                dtype=np.int64,
+                count=len(events),
+            )
+            arrays = (self.graph.version, ids, {eid: i for i, eid in enumerate(ids)}, scheduled)
+            self._arrays = arrays
+        return arrays[1], arrays[2], arrays[3]
+
+    def _compact_graph(self) -> CompactSequencingGraph:
+        """CSR copy of the graph (same column order as event_ids)."""
+        compact = self._compact
+        if compact is None or compact[0] != self.graph.version:
+            compact = (self.graph.version, self.graph.to_compact())
+            self._compact = compact
+        return compact[1]
+
+    @property
+    def event_ids(self) -> List[EventId]:
+        """Column order of every array accepted or returned by batch APIs."""
+        return self._event_arrays()[0]
+
+    def scheduled_epoch_seconds(self) -> np.ndarray:
+        """Scheduled times as int64 epoch seconds, aligned with event_ids."""
+        return self._event_arrays()[2]
+
+    def decisions_to_array(self, decisions: Mapping[EventId, ExecutionDecision]) -> np.ndarray:
+        """
+        Execution times of a decision dict as int64 epoch seconds aligned
+        with event_ids. Events without a decision keep their scheduled time.
+        """
+        ids, _, scheduled = self._event_arrays()
+        out = scheduled.copy()
+        for i, eid in enumerate(ids):
+            decision = decisions.get(eid)
+            if decision is not None:
+                out[i] = datetime_to_epoch_seconds(decision.execute_at)
+        return out
+
+    def _weight_array(
+        self,
+        penalty_weights: Union[None, Mapping[EventId, float], np.ndarray],
+    ) -> np.ndarray:
+        ids, index, _ = self._event_arrays()
+        if penalty_weights is None:
+            return np.ones(len(ids), dtype=np.float64)
+        if isinstance(penalty_weights, Mapping):
+            weights = np.ones(len(ids), dtype=np.float64)
+            for eid, w in penalty_weights.items():
+                weights[index[eid]] = w
+            return weights
+        weights = np.asarray(penalty_weights, dtype=np.float64)
+        if weights.shape != (len(ids),):
+            raise ValueError(
+                f"penalty_weights must have shape ({len(ids)},), got {weights.shape}"
+            )
+        return weights
+
+    def _balance_arrays(
+        self,
+        initial_balances: Optional[Mapping[str, float]],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-event balance direction (int8, see EVENT_DIRECTIONS) and
+        per-actor initial balance (indexed by the compact actor codes).
+        """
+        compact = self._compact_graph()
+        type_direction = np.array(
+            [EVENT_DIRECTIONS.get(t, NEUTRAL) for t in compact.type_categories],
+            dtype=np.int8,
+        )
+        balances = initial_balances or {}
+        initial = np.array(
+            [balances.get(a, 0.0) for a in compact.actor_categories],
+            dtype=np.float64,
+        )
+        if len(compact) == 0:
+            return np.empty(0, np.int8), initial
+        return type_direction[compact.type_code], initial
+
+    def _decisions_from_array(
+        self,
+        execute_at: np.ndarray,
+        direction: np.ndarray,
+        funded: Optional[np.ndarray] = None,
+    ) -> Dict[EventId, ExecutionDecision]:
+        _, _, scheduled = self._event_arrays()
+        shifts = (execute_at - scheduled).tolist()
+        decisions: Dict[EventId, ExecutionDecision] = {}
+        for i, event in enumerate(self.graph.iter_events()):
+            if direction[i] == OUTFLOW:
+                source = "shortfall" if funded is not None and not funded[i] else "balance"
+            elif direction[i] == INFLOW:
+                source = "income"
+            else:
+                source = "default"
+            decisions[event.id] = ExecutionDecision(
+                execute_at=event.scheduled_time + timedelta(seconds=shifts[i]),
+                use_liquidity_source=source,
+            )
+        return decisions
 
     def _baseline_schedule(self) -> Dict[EventId, ExecutionDecision]:
         decisions: Dict[EventId, ExecutionDecision] = {}
@@ -44,17 +211,26 @@ class FlowOptimizationEngine:
         self,
         decisions: Optional[Dict[EventId, ExecutionDecision]] = None,
         delay_penalty_per_hour: float = 1.0,
+        penalty_weights: Optional[Mapping[EventId, float]] = None,
     ) -> ScheduleResult:
+        """
+        Score one schedule. Delay cost per event is
+            max(0, execute_at - scheduled_time) in hours
+            * delay_penalty_per_hour * penalty_weights.get(event, 1.0)
+        """
 
         if decisions is None:
             decisions = self._baseline_schedule()
+        weights = penalty_weights or {}
 
         total_delay_cost = 0.0
+        events_evaluated = 0
 
         for event in self.graph.events:
             decision = decisions.get(event.id)
             if decision is None:
                 continue
+            events_evaluated += 1
 
             scheduled = event.scheduled_time
             actual = decision.execute_at
@@ -63,10 +239,13 @@ class FlowOptimizationEngine:
 
             if delay_seconds > 0:
                 delay_hours = delay_seconds / 3600.0
-                total_delay_cost += delay_hours * delay_penalty_per_hour
+                total_delay_cost += (
+                    delay_hours * delay_penalty_per_hour * weights.get(event.id, 1.0)
+                )
 
         details = {
             "delay_penalty_per_hour": delay_penalty_per_hour,
+            "events_evaluated": events_evaluated,
         }
 
         return ScheduleResult(
@@ -74,3 +253,196 @@ class FlowOptimizationEngine:
             total_delay_cost=total_delay_cost,
             details=details,
         )
+
+    def evaluate_schedule_batch(
+        self,
+        execute_at: np.ndarray,
+        delay_penalty_per_hour: float = 1.0,
+        penalty_weights: Union[None, Mapping[EventId, float], np.ndarray] = None,
+        chunk_rows: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Delay cost of many candidate schedules at once.
+
+        execute_at: (n_schedules, n_events) int64 epoch seconds, columns
+            aligned with `event_ids` (a 1-D array is one schedule).
+        penalty_weights: per-event multipliers, as a dict keyed by EventId
+            (missing events weigh 1.0) or an array aligned with event_ids.
+        chunk_rows: rows scored per NumPy pass to bound temporaries;
+            by default about 4M cells per pass.
+
+        Returns a float64 array of shape (n_schedules,), matching
+        evaluate_schedule(...).total_delay_cost for whole-second times.
+        """
+        _, _, scheduled = self._event_arrays()
+        times = np.asarray(execute_at, dtype=np.int64)
+        single = times.ndim == 1
+        times = np.atleast_2d(times)
+        if times.shape[1] != len(scheduled):
+            raise ValueError(
+                f"execute_at must have {len(scheduled)} columns, got {times.shape[1]}"
+            )
+
+        # Cost per second of delay for each event.
+        rate = self._weight_array(penalty_weights) * (delay_penalty_per_hour / 3600.0)
+
+        n_rows = times.shape[0]
+        step = chunk_rows or max(1, (1 << 22) // max(1, len(scheduled)))
+        costs = np.empty(n_rows, dtype=np.float64)
+        for lo in range(0, n_rows, step):
+            delay = times[lo:lo + step] - scheduled
+            np.maximum(delay, 0, out=delay)
+            costs[lo:lo + step] = delay @ rate
+
+        return costs[0:1] if single else costs
+
+    def optimize_schedule(
+        self,
+        delay_penalty_per_hour: float = 1.0,
+        penalty_weights: Union[None, Mapping[EventId, float], np.ndarray] = None,
+        initial_balances: Optional[Mapping[str, float]] = None,
+        max_delay: Optional[timedelta] = None,
+    ) -> ScheduleResult:
+        """
+        Choose execution times with a liquidity-constrained list scheduler
+        (see list_scheduler.list_schedule), in O((V + E) log V).
+
+        - No event executes before its scheduled_time or before any of
+          its predecessors.
+        - Obligations wait until their actor's running balance (starting
+          from initial_balances, default 0) covers them. Incomes add to
+          it and other event types leave it unchanged.
+        - Among competing obligations, higher penalty weights go first.
+        - An obligation still unfunded after `max_delay` executes on a
+          shortfall. With no max_delay, that only happens once nothing
+          else can run, and no earlier than its actor's last scheduled
+          event; the wait counts as delay cost.
+
+        Shortfalls are reported in details as unfunded_events and
+        shortfall_amount.
+        """
+        compact = self._compact_graph()
+        ids, _, scheduled = self._event_arrays()
+        weights = self._weight_array(penalty_weights)
+        direction, initial = self._balance_arrays(initial_balances)
+        succ_indptr, succ_indices = compact.successor_csr()
+
+        plan = list_schedule(
+            scheduled=scheduled,
+            amount=compact.amount,
+            direction=direction,
+            actor=compact.actor_code,
+            succ_indptr=succ_indptr,
+            succ_indices=succ_indices,
+            weights=weights,
+            initial_balance=initial,
+            max_delay_seconds=None if max_delay is None else int(max_delay.total_seconds()),
+        )
+
+        decisions = self._decisions_from_array(plan.execute_at, direction, plan.funded)
+
+        total_delay_cost = float(
+            self.evaluate_schedule_batch(
+                plan.execute_at,
+                delay_penalty_per_hour=delay_penalty_per_hour,
+                penalty_weights=weights,
+            )[0]
+        ) if len(ids) else 0.0
+
+        return ScheduleResult(
+            decisions=decisions,
+            total_delay_cost=total_delay_cost,
+            details={
+                "delay_penalty_per_hour": delay_penalty_per_hour,
+                "events_evaluated": len(ids),
+                "unfunded_events": plan.unfunded_events,
+                "shortfall_amount": plan.shortfall_amount,
+            },
+        )
+
+    def anneal_schedule(
+        self,
+        initial: Optional[ScheduleResult] = None,
+        iterations: int = 10_000,
+        delay_penalty_per_hour: float = 1.0,
+        penalty_weights: Union[None, Mapping[EventId, float], np.ndarray] = None,
+        initial_balances: Optional[Mapping[str, float]] = None,
+        gap_penalty: float = 1.0,
+        max_delay: timedelta = timedelta(days=7),
+        initial_temperature: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> ScheduleResult:
+        """
+        Improve a schedule by simulated annealing (see local_search.anneal).
+
+        The objective is delay cost plus gap_penalty times each actor's
+        peak liquidity shortfall (how far its running balance, from
+        initial_balances, dips below zero in execution order). Each move
+        is priced incrementally (O(1) delay, O(log n) balance), so long
+        runs stay cheap on large graphs.
+
+        initial: starting schedule; by default the optimize_schedule result
+            for the same parameters (with max_delay as its deadline).
+        max_delay: no move pushes an event later than scheduled + max_delay.
+
+        total_delay_cost is the delay part of the best schedule found; the
+        shortfall part is details["gap_cost"].
+        """
+        if initial is None:
+            initial = self.optimize_schedule(
+                delay_penalty_per_hour=delay_penalty_per_hour,
+                penalty_weights=penalty_weights,
+                initial_balances=initial_balances,
+                max_delay=max_delay,
+            )
+
+        compact = self._compact_graph()
+        _, _, scheduled = self._event_arrays()
+        direction, initial_balance = self._balance_arrays(initial_balances)
+        succ_indptr, succ_indices = compact.successor_csr()
+        rate = self._weight_array(penalty_weights) * (delay_penalty_per_hour / 3600.0)
+
+        evaluator = IncrementalScheduleEvaluator(
+            execute_at=self.decisions_to_array(initial.decisions),
+            scheduled=scheduled,
+            rate=rate,
+            value=direction * compact.amount,
+            actor=compact.actor_code,
+            succ_indptr=succ_indptr,
+            succ_indices=succ_indices,
+            initial_balance=initial_balance,
+            gap_penalty=gap_penalty,
+            seed=seed,
+        )
+        best, _, accepted = anneal(
+            evaluator,
+            iterations=iterations,
+            max_delay_seconds=int(max_delay.total_seconds()),
+            initial_temperature=initial_temperature,
+            seed=seed,
+        )
+        # Re-score the best schedule from scratch rather than trusting
+        # accumulated float deltas.
+        final = IncrementalScheduleEvaluator(
+            execute_at=best,
+            scheduled=scheduled,
+            rate=rate,
+            value=direction * compact.amount,
+            actor=compact.actor_code,
+            succ_indptr=succ_indptr,
+            succ_indices=succ_indices,
+            initial_balance=initial_balance,
+            gap_penalty=gap_penalty,
+        )
+
+        return ScheduleResult(
+            decisions=self._decisions_from_array(best, direction),
+            total_delay_cost=final.delay_cost,
+            details={
+                "delay_penalty_per_hour": delay_penalty_per_hour,
+                "gap_penalty": gap_penalty,
+                "events_evaluated": len(final),
+                "gap_cost": final.gap_cost,
+                "accepted_moves": accepted,
+            },
+        )
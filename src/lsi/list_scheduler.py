@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+# Balance effect of an event type code.
+INFLOW = 1
+OUTFLOW = -1
+NEUTRAL = 0
+
+# Event states during scheduling.
+_WAITING = 0    # not yet popped, or popped and deferred for liquidity
+_RELEASED = 1   # liquidity reserved; will execute when popped
+_DONE = 2
+
+
+@dataclass
+class ListScheduleResult:
+    """
+    Output of list_schedule. Arrays are aligned with the input columns.
+    """
+
+    execute_at: np.ndarray   # int64 epoch seconds
+    funded: np.ndarray       # bool; False for outflows executed on a shortfall
+    unfunded_events: int
+    shortfall_amount: float
+
+
+def list_schedule(
+    scheduled: np.ndarray,
+    amount: np.ndarray,
+    direction: np.ndarray,
+    actor: np.ndarray,
+    succ_indptr: np.ndarray,
+    succ_indices: np.ndarray,
+    weights: np.ndarray,
+    initial_balance: np.ndarray,
+    max_delay_seconds: Optional[int] = None,
+) -> ListScheduleResult:
+    """
+    Liquidity-constrained list scheduler.
+
+    Events are released in time order from a heap keyed by
+    (earliest start, -penalty weight). An event's earliest start is its
+    scheduled time, pushed back by the execution time of each
+    predecessor. An outflow only executes once its actor's running
+    balance (net of liquidity already reserved for other outflows)
+    covers it. Until then it waits in a per-actor heap, where the highest
+    penalty weight goes first. Each inflow releases waiting outflows of
+    its actor in that order while the new balance covers them.
+
+    An outflow that cannot be funded executes on a shortfall when its
+    deadline (scheduled + max_delay_seconds) passes. With no deadline,
+    this happens only when nothing else can run, and the outflow then
+    executes no earlier than its actor's last scheduled event: it has
+    waited for every income the actor could still receive, and that wait
+    is charged as delay like any other. Events of one actor never execute
+    out of time order (an event runs no earlier than the actor's last
+    executed event).
+
+    Heap ties break on input position. Events in different components
+    (linked by dependencies or a shared actor) never interact except
+    through that tie-break, so a component scheduled on its own, with its
+    events in the same relative order (as SequencingGraph.subgraph keeps
+    them), gets the same result.
+
+    Every event enters the main heap at most twice and the waiting heaps
+    at most once, so the cost is O((V + E) log V).
+    """
+    n = len(scheduled)
+    sched = scheduled.tolist()
+    amt = amount.tolist()
+    dirn = direction.tolist()
+    act = actor.tolist()
+    neg_w = (-np.asarray(weights, dtype=np.float64)).tolist()
+    indptr = succ_indptr.tolist()
+    succ = succ_indices.tolist()
+
+    earliest = list(sched)
+    pending = np.bincount(succ_indices, minlength=n).tolist() if n else []
+    balance = np.asarray(initial_balance, dtype=np.float64).tolist()
+    reserved = [0.0] * len(balance)
+    state = [_WAITING] * n
+
+    execute_at = [0] * n
+    funded = [True] * n
+    unfunded = 0
+    shortfall = 0.0
+
+    ready: List[Tuple[int, float, int]] = [
+        (earliest[i], neg_w[i], i) for i in range(n) if pending[i] == 0
+    ]
+    heapq.heapify(ready)
+    waiting: List[List[Tuple[float, int, int]]] = [[] for _ in balance]
+    # Deadlines of waiting outflows: (deadline, -w, i); lazily pruned.
+    deadlines: List[Tuple[float, float, int]] = []
+    # Last execution time per actor: an actor's events run in time order.
+    actor_clock = [min(sched) if n else 0] * len(balance)
+    # Last scheduled time per actor: when an unbounded shortfall executes.
+    actor_horizon = list(actor_clock)
+    for i in range(n):
+        if sched[i] > actor_horizon[act[i]]:
+            actor_horizon[act[i]] = sched[i]
+
+    def execute(i: int, t: int) -> None:
+        a = act[i]
+        t = max(t, actor_clock[a])
+        actor_clock[a] = t
+        execute_at[i] = t
+        state[i] = _DONE
+        if dirn[i] == INFLOW:
+            balance[a] += amt[i]
+            queue = waiting[a]
+            while queue:
+                _, _, j = queue[0]
+                if state[j] != _WAITING:
+                    heapq.heappop(queue)
+                    continue
+                if balance[a] - reserved[a] < amt[j]:
+                    break
+                heapq.heappop(queue)
+                reserved[a] += amt[j]
+                state[j] = _RELEASED
+                heapq.heappush(ready, (max(earliest[j], t), neg_w[j], j))
+        elif dirn[i] == OUTFLOW:
+            balance[a] -= amt[i]
+
+        for k in range(indptr[i], indptr[i + 1]):
+            s = succ[k]
+            if t > earliest[s]:
+                earliest[s] = t
+            pending[s] -= 1
+            if pending[s] == 0:
+                heapq.heappush(ready, (earliest[s], neg_w[s], s))
+
+    def force_next(until: float) -> bool:
+        """Execute the waiting outflow with the earliest deadline <= until."""
+        nonlocal unfunded, shortfall
+        while deadlines:
+            deadline, _, j = deadlines[0]
+            if state[j] != _WAITING:
+                heapq.heappop(deadlines)
+                continue
+            if deadline > until:
+                return False
+            heapq.heappop(deadlines)
+            a = act[j]
+            gap = amt[j] - max(balance[a] - reserved[a], 0.0)
+            if gap > 0:
+                funded[j] = False
+                unfunded += 1
+                shortfall += gap
+            if deadline == float("inf"):
+                execute(j, max(earliest[j], actor_horizon[a]))
+            else:
+                execute(j, int(deadline))
+            return True
+        return False
+
+    while ready or deadlines:
+        if not ready:
+            if not force_next(float("inf")):
+                break
+            continue
+
+        t, _, i = ready[0]
+        if force_next(t):
+            continue
+        heapq.heappop(ready)
+
+        if state[i] == _RELEASED:
+            reserved[act[i]] -= amt[i]
+        elif dirn[i] == OUTFLOW and balance[act[i]] - reserved[act[i]] < amt[i]:
+            earliest[i] = t
+            heapq.heappush(waiting[act[i]], (neg_w[i], t, i))
+            deadline = (
+                float("inf") if max_delay_seconds is None
+                else max(t, sched[i] + max_delay_seconds)
+            )
+            heapq.heappush(deadlines, (deadline, neg_w[i], i))
+            continue
+
+        execute(i, t)
+
+    if any(s != _DONE for s in state):
+        raise ValueError("Graph contains a cycle or disconnected dependency structure")
+
+    return ListScheduleResult(
+        execute_at=np.asarray(execute_at, dtype=np.int64),
+        funded=np.asarray(funded, dtype=bool),
+        unfunded_events=unfunded,
+        shortfall_amount=shortfall,
+    )
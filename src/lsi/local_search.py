@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import math
+import random
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+Key = Tuple[int, int]  # (execution time, event index); unique per event
+
+
+class _Node:
+    """Treap node over one actor's events, augmented with prefix minima."""
+
+    __slots__ = ("key", "val", "prio", "left", "right", "sum", "minpref")
+
+    def __init__(self, key: Key, val: float, prio: float) -> None:
+        self.key = key
+        self.val = val
+        self.prio = prio
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+        self.sum = val
+        self.minpref = val
+
+
+def _update(node: _Node) -> None:
+    # sum: total balance change of the subtree.
+    # minpref: lowest running balance change over non-empty prefixes.
+    left, right = node.left, node.right
+    s = node.val
+    mp = node.val
+    if left is not None:
+        s += left.sum
+        mp = min(left.minpref, s)
+    if right is not None:
+        mp = min(mp, s + right.minpref)
+        s += right.sum
+    node.sum = s
+    node.minpref = mp
+
+
+def _split(node: Optional[_Node], key: Key) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Split into (keys < key, keys >= key)."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        a, b = _split(node.right, key)
+        node.right = a
+        _update(node)
+        return node, b
+    a, b = _split(node.left, key)
+    node.left = b
+    _update(node)
+    return a, node
+
+
+def _merge(a: Optional[_Node], b: Optional[_Node]) -> Optional[_Node]:
+    """Merge two treaps where every key of a is below every key of b."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = _merge(a.right, b)
+        _update(a)
+        return a
+    b.left = _merge(a, b.left)
+    _update(b)
+    return b
+
+
+class _ActorLedger:
+    """
+    One actor's balance-changing events ordered by execution time.
+    Supports O(log n) re-timing and O(1) peak-shortfall reads.
+    """
+
+    def __init__(self, initial_balance: float, rng: random.Random) -> None:
+        self.initial_balance = initial_balance
+        self.root: Optional[_Node] = None
+        self._rng = rng
+
+    def insert(self, key: Key, val: float) -> None:
+        node = _Node(key, val, self._rng.random())
+        left, right = _split(self.root, key)
+        self.root = _merge(_merge(left, node), right)
+
+    def retime(self, old: Key, new: Key) -> None:
+        left, rest = _split(self.root, old)
+        node, right = _split(rest, (old[0], old[1] + 1))
+        self.root = _merge(left, right)
+        if node is None or node.key != old:
+            raise KeyError(f"No ledger entry at {old}")
+        node.key = new
+        node.left = node.right = None
+        _update(node)
+        left, right = _split(self.root, new)
+        self.root = _merge(_merge(left, node), right)
+
+    def shortfall(self) -> float:
+        """Depth of the most negative running balance (0 if never negative)."""
+        if self.root is None:
+            return 0.0
+        return max(0.0, -(self.initial_balance + self.root.minpref))
+
+
+class IncrementalScheduleEvaluator:
+    """
+    Stateful schedule cost for local search.
+
+    cost = delay cost (sum of rate * max(0, execute_at - scheduled))
+         + gap_penalty * sum over actors of the peak liquidity shortfall,
+           i.e. how far the actor's running balance (initial balance,
+           incomes in, obligations out, in execution-time order) dips
+           below zero.
+
+    Delay deltas are O(1). Balance deltas re-time one event in its
+    actor's augmented treap, which costs O(log n). Moves and swaps can
+    be priced (move_delta / swap_delta) without changing state, or
+    committed (move / swap). snapshot() marks the current schedule and
+    restore() undoes the commits made since, so keeping a best-so-far
+    schedule costs no copies.
+
+    Moves must keep execution times at or after scheduled times and
+    respect dependency order (see window / is_feasible).
+    """
+
+    def __init__(
+        self,
+        execute_at: np.ndarray,
+        scheduled: np.ndarray,
+        rate: np.ndarray,
+        value: np.ndarray,
+        actor: np.ndarray,
+        succ_indptr: np.ndarray,
+        succ_indices: np.ndarray,
+        initial_balance: np.ndarray,
+        gap_penalty: float = 1.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        execute_at, scheduled: int64 epoch seconds per event.
+        rate: delay cost per second per event.
+        value: signed balance effect per event (+ income, - obligation).
+        actor: actor code per event, indexing initial_balance.
+        succ_indptr, succ_indices: successor CSR.
+        """
+        n = len(scheduled)
+        self._scheduled: List[int] = np.asarray(scheduled, dtype=np.int64).tolist()
+        self._time: List[int] = np.asarray(execute_at, dtype=np.int64).tolist()
+        if len(self._time) != n:
+            raise ValueError(f"execute_at must have {n} entries, got {len(self._time)}")
+        self._rate: List[float] = np.asarray(rate, dtype=np.float64).tolist()
+        self._value: List[float] = np.asarray(value, dtype=np.float64).tolist()
+        self._actor: List[int] = np.asarray(actor).tolist()
+        self.gap_penalty = gap_penalty
+
+        indptr = succ_indptr.tolist()
+        succ = succ_indices.tolist()
+        self._succ: List[List[int]] = [succ[indptr[i]:indptr[i + 1]] for i in range(n)]
+        self._pred: List[List[int]] = [[] for _ in range(n)]
+        for i in range(n):
+            for s in self._succ[i]:
+                self._pred[s].append(i)
+
+        rng = random.Random(seed)
+        balances = np.asarray(initial_balance, dtype=np.float64).tolist()
+        self._ledgers = [_ActorLedger(b, rng) for b in balances]
+        self.actor_events: List[List[int]] = [[] for _ in balances]
+        for i, a in enumerate(self._actor):
+            self.actor_events[a].append(i)
+            if self._value[i] != 0.0:
+                self._ledgers[a].insert((self._time[i], i), self._value[i])
+
+        self.delay_cost = sum(
+            self._rate[i] * max(0, self._time[i] - self._scheduled[i]) for i in range(n)
+        )
+        self._shortfall = [ledger.shortfall() for ledger in self._ledgers]
+        self.gap_cost = gap_penalty * sum(self._shortfall)
+        # (event, previous time) per commit since snapshot(); None = no snapshot.
+        self._journal: Optional[List[Tuple[int, int]]] = None
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._time)
+
+    @property
+    def total_cost(self) -> float:
+        return self.delay_cost + self.gap_cost
+
+    @property
+    def execute_at(self) -> np.ndarray:
+        """Current execution times (int64 epoch seconds, a copy)."""
+        return np.asarray(self._time, dtype=np.int64)
+
+    def time_of(self, i: int) -> int:
+        return self._time[i]
+
+    def scheduled_of(self, i: int) -> int:
+        return self._scheduled[i]
+
+    def actor_of(self, i: int) -> int:
+        return self._actor[i]
+
+    def snapshot(self) -> None:
+        """Mark the current schedule as the one restore() returns to."""
+        self._journal = []
+
+    def restore(self) -> None:
+        """Undo every commit since the last snapshot() (which stays marked)."""
+        if self._journal is None:
+            raise ValueError("restore() called before snapshot()")
+        for i, t in reversed(self._journal):
+            self._move(i, t)
+        self._journal.clear()
+
+    def window(self, i: int) -> Tuple[int, int]:
+        """
+        Feasible execution interval [lo, hi] for event i with everything
+        else fixed (hi may be a large sentinel when i has no successors).
+        """
+        lo = max([self._scheduled[i]] + [self._time[p] for p in self._pred[i]])
+        hi = min([self._time[s] for s in self._succ[i]], default=np.iinfo(np.int64).max)
+        return lo, hi
+
+    def is_feasible(self, i: int, t: int) -> bool:
+        lo, hi = self.window(i)
+        return lo <= t <= hi
+
+    # ------------------------------------------------------------------
+    # Moves
+    # ------------------------------------------------------------------
+    def _delay_delta(self, i: int, t: int) -> float:
+        s = self._scheduled[i]
+        return self._rate[i] * (max(0, t - s) - max(0, self._time[i] - s))
+
+    def _apply(self, i: int, t: int) -> float:
+        """Re-time event i to t; returns the gap-cost delta."""
+        old = self._time[i]
+        self._time[i] = t
+        if self._value[i] == 0.0 or old == t:
+            return 0.0
+        a = self._actor[i]
+        self._ledgers[a].retime((old, i), (t, i))
+        before = self._shortfall[a]
+        self._shortfall[a] = self._ledgers[a].shortfall()
+        return self.gap_penalty * (self._shortfall[a] - before)
+
+    def move_delta(self, i: int, t: int) -> float:
+        """Cost change of moving event i to time t (state unchanged)."""
+        old = self._time[i]
+        delta = self._delay_delta(i, t) + self._apply(i, t)
+        self._apply(i, old)
+        return delta
+
+    def _move(self, i: int, t: int) -> float:
+        delay = self._delay_delta(i, t)
+        gap = self._apply(i, t)
+        self.delay_cost += delay
+        self.gap_cost += gap
+        return delay + gap
+
+    def move(self, i: int, t: int) -> float:
+        """Commit moving event i to time t; returns the cost change."""
+        if self._journal is not None:
+            self._journal.append((i, self._time[i]))
+        return self._move(i, t)
+
+    def swap_is_feasible(self, i: int, j: int) -> bool:
+        ti, tj = self._time[i], self._time[j]
+        self._time[i], self._time[j] = tj, ti
+        ok = self.is_feasible(i, tj) and self.is_feasible(j, ti)
+        self._time[i], self._time[j] = ti, tj
+        return ok
+
+    def swap_delta(self, i: int, j: int) -> float:
+        """Cost change of exchanging the execution times of i and j."""
+        ti, tj = self._time[i], self._time[j]
+        delta = self._move(i, tj) + self._move(j, ti)
+        self._move(i, ti)
+        self._move(j, tj)
+        return delta
+
+    def swap(self, i: int, j: int) -> float:
+        """Commit exchanging the execution times of i and j."""
+        ti, tj = self._time[i], self._time[j]
+        return self.move(i, tj) + self.move(j, ti)
+
+
+def anneal(
+    evaluator: IncrementalScheduleEvaluator,
+    iterations: int,
+    max_delay_seconds: int,
+    initial_temperature: Optional[float] = None,
+    final_temperature_ratio: float = 1e-3,
+    seed: Optional[int] = None,
+) -> Tuple[np.ndarray, float, int]:
+    """
+    Simulated annealing over single-event moves and same-actor swaps.
+
+    Proposals (equally likely):
+      - move an event to a uniform time in its feasible window,
+        capped at scheduled + max_delay_seconds;
+      - move an event just after another event of the same actor
+        (re-sequencing around an income, say);
+      - swap the times of two events of the same actor.
+
+    The temperature cools geometrically to initial * final_ratio. When not
+    given, the initial temperature is the mean |delta| of a short warm-up.
+
+    The evaluator is left at the best schedule found.
+
+    Returns (best execution times, best cost, accepted moves).
+    """
+    rng = random.Random(seed)
+    n = len(evaluator)
+    if n == 0 or iterations <= 0:
+        return evaluator.execute_at, evaluator.total_cost, 0
+
+    actor_events = evaluator.actor_events
+    scheduled = evaluator.scheduled_of
+
+    def propose() -> Optional[Tuple[str, int, int]]:
+        i = rng.randrange(n)
+        kind = rng.randrange(3)
+        peers = actor_events[evaluator.actor_of(i)]
+        if kind == 2 and len(peers) > 1:
+            j = peers[rng.randrange(len(peers))]
+            ti, tj = evaluator.time_of(i), evaluator.time_of(j)
+            if (
+                j != i
+                and tj <= scheduled(i) + max_delay_seconds
+                and ti <= scheduled(j) + max_delay_seconds
+                and evaluator.swap_is_feasible(i, j)
+            ):
+                return ("swap", i, j)
+            return None
+
+        lo, hi = evaluator.window(i)
+        hi = min(hi, scheduled(i) + max_delay_seconds)
+        if lo > hi:
+            return None
+        if kind == 1 and len(peers) > 1:
+            t = evaluator.time_of(peers[rng.randrange(len(peers))]) + 1
+            t = min(max(t, lo), hi)
+        else:
+            t = rng.randint(lo, hi)
+        if t == evaluator.time_of(i):
+            return None
+        return ("move", i, t)
+
+    def price(p: Tuple[str, int, int]) -> float:
+        kind, a, b = p
+        return evaluator.swap_delta(a, b) if kind == "swap" else evaluator.move_delta(a, b)
+
+    def commit(p: Tuple[str, int, int]) -> None:
+        kind, a, b = p
+        if kind == "swap":
+            evaluator.swap(a, b)
+        else:
+            evaluator.move(a, b)
+
+    temperature = initial_temperature
+    if temperature is None:
+        samples = [abs(price(p)) for p in (propose() for _ in range(min(200, iterations))) if p]
+        samples = [s for s in samples if s > 0]
+        temperature = (sum(samples) / len(samples)) if samples else 1.0
+    cooling = final_temperature_ratio ** (1.0 / iterations)
+
+    # The best schedule is kept as the evaluator's snapshot: it is
+    # recovered by undoing later commits instead of copying on each
+    # improvement.
+    evaluator.snapshot()
+    best_cost = evaluator.total_cost
+    accepted = 0
+
+    for _ in range(iterations):
+        temperature *= cooling
+        p = propose()
+        if p is None:
+            continue
+        delta = price(p)
+        if delta <= 0 or rng.random() < math.exp(-delta / max(temperature, 1e-12)):
+            commit(p)
+            accepted += 1
+            if evaluator.total_cost < best_cost - 1e-9:
+                best_cost = evaluator.total_cost
+                evaluator.snapshot()
+
+    evaluator.restore()
+    return evaluator.execute_at, best_cost, accepted
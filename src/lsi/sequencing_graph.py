@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, List
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .event_index import TimeIndex
+
+if TYPE_CHECKING:
+    from .compact_graph import CompactSequencingGraph
 
 
 @dataclass(frozen=True)
@@ -33,6 +38,20 @@ class Event:
     metadata: Dict[str, str] = field(default_factory=dict)
 
 
+class DependencyCycleError(ValueError):
+    """
+    Raised when adding a dependency would close a cycle.
+
+    `cycle` lists the offending path, starting and ending on the
+    predecessor of the rejected edge, e.g. [a, b, c, a].
+    """
+
+    def __init__(self, cycle: List["EventId"]) -> None:
+        self.cycle = cycle
+        path = " -> ".join(eid.value for eid in cycle)
+        super().__init__(f"Dependency would introduce a cycle: {path}")
+
+
 @dataclass
 class Dependency:
     """
@@ -62,6 +81,82 @@ class SequencingGraph:
         # Adjacency lists for dependencies
         self._successors: Dict[EventId, List[EventId]] = {}
         self._predecessors: Dict[EventId, List[EventId]] = {}
+        # Online topological order (Pearce-Kelly): position -> event and
+        # event -> position. Every edge u -> v satisfies
+        # _position[u] < _position[v].
+        self._order: List[EventId] = []
+        self._position: Dict[EventId, int] = {}
+        # Topological level (generation) of each event: 0 for events with
+        # no predecessors, else 1 + max level of its predecessors.
+        self._level: Dict[EventId, int] = {}
+        # Bumped on every mutation; derived snapshots are keyed on it.
+        self._version: int = 0
+        self._order_snapshot: Optional[Tuple[int, List[EventId]]] = None
+        self._generations_snapshot: Optional[Tuple[int, List[List[EventId]]]] = None
+        # Sorted secondary indexes on scheduled_time, overall and per
+        # actor / event_type / (actor, event_type).
+        self._time_index = TimeIndex()
+        self._actor_index: Dict[str, TimeIndex] = {}
+        self._type_index: Dict[str, TimeIndex] = {}
+        self._actor_type_index: Dict[Tuple[str, str], TimeIndex] = {}
+
+    @classmethod
+    def from_frames(cls, events: Any, dependencies: Optional[Any] = None) -> "SequencingGraph":
+        """
+        Bulk constructor from event/dependency columns (DataFrames, dicts
+        of NumPy arrays, Arrow tables). Uniqueness and dangling references
+        are checked vectorized and adjacency is built in one pass.
+        See ingest.graph_from_frames.
+        """
+        from .ingest import graph_from_frames
+
+        return graph_from_frames(events, dependencies)
+
+    def _bulk_load(
+        self,
+        events: List[Event],
+        successors: List[List[EventId]],
+        predecessors: List[List[EventId]],
+        order: List[EventId],
+        levels: List[int],
+    ) -> None:
+        """
+        Populate an empty graph from pre-validated structures.
+        `successors`/`predecessors`/`levels` are aligned with `events` and
+        `order` must already be a valid topological order.
+        """
+        if self._events:
+            raise ValueError("_bulk_load requires an empty graph")
+
+        ids = [event.id for event in events]
+        self._events = dict(zip(ids, events))
+        self._successors = dict(zip(ids, successors))
+        self._predecessors = dict(zip(ids, predecessors))
+        self._order = list(order)
+        self._position = {eid: i for i, eid in enumerate(self._order)}
+        self._level = dict(zip(ids, levels))
+        self._rebuild_indexes()
+        self._version += 1
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild all secondary indexes with one sort per index."""
+        by_actor: Dict[str, List[Tuple[datetime, EventId]]] = {}
+        by_type: Dict[str, List[Tuple[datetime, EventId]]] = {}
+        by_actor_type: Dict[Tuple[str, str], List[Tuple[datetime, EventId]]] = {}
+        pairs: List[Tuple[datetime, EventId]] = []
+        for event in self._events.values():
+            pair = (event.scheduled_time, event.id)
+            pairs.append(pair)
+            by_actor.setdefault(event.actor_id, []).append(pair)
+            by_type.setdefault(event.event_type, []).append(pair)
+            by_actor_type.setdefault((event.actor_id, event.event_type), []).append(pair)
+
+        self._time_index = TimeIndex.from_pairs(pairs)
+        self._actor_index = {k: TimeIndex.from_pairs(v) for k, v in by_actor.items()}
+        self._type_index = {k: TimeIndex.from_pairs(v) for k, v in by_type.items()}
+        self._actor_type_index = {
+            k: TimeIndex.from_pairs(v) for k, v in by_actor_type.items()
+        }
 
     # ------------------------------------------------------------------
     # Event management
@@ -77,6 +172,19 @@ class SequencingGraph:
         self._events[event.id] = event
         self._successors.setdefault(event.id, [])
         self._predecessors.setdefault(event.id, [])
+        self._position[event.id] = len(self._order)
+        self._order.append(event.id)
+        self._level[event.id] = 0
+
+        t = event.scheduled_time
+        self._time_index.insert(t, event.id)
+        self._actor_index.setdefault(event.actor_id, TimeIndex()).insert(t, event.id)
+        self._type_index.setdefault(event.event_type, TimeIndex()).insert(t, event.id)
+        self._actor_type_index.setdefault(
+            (event.actor_id, event.event_type), TimeIndex()
+        ).insert(t, event.id)
+
+        self._version += 1
 
     def get_event(self, event_id: EventId) -> Event:
         """
@@ -91,20 +199,105 @@ class SequencingGraph:
         """
         Add a directed dependency edge between two existing events.
 
+        Cycle detection is incremental (Pearce-Kelly): only events whose
+        position lies between the two endpoints in the maintained
+        topological order are visited, and edges that already agree with
+        the order cost O(1).
+
         Raises:
-            KeyError   – if either event is missing.
-            ValueError – if this would introduce a cycle (for v1 we can
-                         leave cycle detection as a TODO or simple check).
+            KeyError             – if either event is missing.
+            DependencyCycleError – (a ValueError) if this would introduce
+                                   a cycle; the graph is left unchanged.
         """
         if dep.predecessor not in self._events:
             raise KeyError(f"Unknown predecessor event: {dep.predecessor.value!r}")
         if dep.successor not in self._events:
             raise KeyError(f"Unknown successor event: {dep.successor.value!r}")
 
+        self._reorder_for_edge(dep.predecessor, dep.successor)
+
         self._successors.setdefault(dep.predecessor, []).append(dep.successor)
         self._predecessors.setdefault(dep.successor, []).append(dep.predecessor)
+        self._raise_levels(dep.predecessor, dep.successor)
+        self._version += 1
 
-        # TODO: cycle detection and validation can be added later.
+    def _raise_levels(self, pred: EventId, succ: EventId) -> None:
+        """
+        Push level increases downstream after adding pred -> succ.
+        Only events whose level actually changes are visited.
+        """
+        level = self._level
+        if level[succ] > level[pred]:
+            return
+
+        level[succ] = level[pred] + 1
+        stack = [succ]
+        while stack:
+            node = stack.pop()
+            nxt_level = level[node] + 1
+            for nxt in self._successors.get(node, []):
+                if level[nxt] < nxt_level:
+                    level[nxt] = nxt_level
+                    stack.append(nxt)
+
+    def _reorder_for_edge(self, pred: EventId, succ: EventId) -> None:
+        """
+        Pearce-Kelly update of the online order for a new edge pred -> succ.
+        Raises DependencyCycleError without touching any state on a cycle.
+        """
+        if pred == succ:
+            raise DependencyCycleError([pred, pred])
+
+        position = self._position
+        lower = position[succ]
+        upper = position[pred]
+        if upper < lower:
+            return
+
+        # Forward search from succ, bounded by pred's position.
+        parent: Dict[EventId, EventId] = {}
+        forward: List[EventId] = [succ]
+        seen = {succ}
+        stack = [succ]
+        while stack:
+            node = stack.pop()
+            for nxt in self._successors.get(node, []):
+                if nxt == pred:
+                    path = [pred]
+                    while node != succ:
+                        path.append(node)
+                        node = parent[node]
+                    path.append(succ)
+                    path.append(pred)
+                    path.reverse()
+                    raise DependencyCycleError(path)
+                if nxt not in seen and position[nxt] < upper:
+                    seen.add(nxt)
+                    parent[nxt] = node
+                    forward.append(nxt)
+                    stack.append(nxt)
+
+        # Backward search from pred, bounded by succ's position.
+        backward: List[EventId] = [pred]
+        seen = {pred}
+        stack = [pred]
+        while stack:
+            node = stack.pop()
+            for prv in self._predecessors.get(node, []):
+                if prv not in seen and position[prv] > lower:
+                    seen.add(prv)
+                    backward.append(prv)
+                    stack.append(prv)
+
+        # Everything reaching pred moves ahead of everything reachable
+        # from succ, reusing the same pool of positions.
+        backward.sort(key=position.__getitem__)
+        forward.sort(key=position.__getitem__)
+        moved = backward + forward
+        slots = sorted(position[eid] for eid in moved)
+        for eid, slot in zip(moved, slots):
+            position[eid] = slot
+            self._order[slot] = eid
 
     # ------------------------------------------------------------------
     # Basic graph queries
@@ -114,6 +307,13 @@ class SequencingGraph:
         """Return all events in the graph."""
         return list(self._events.values())
 
+    def iter_events(self) -> Iterator[Event]:
+        """Iterate over events without copying them into a list."""
+        return iter(self._events.values())
+
+    def __len__(self) -> int:
+        return len(self._events)
+
     def predecessors(self, event_id: EventId) -> List[EventId]:
         """Return direct predecessors of the given event."""
         return self._predecessors.get(event_id, [])
@@ -123,42 +323,146 @@ class SequencingGraph:
         return self._successors.get(event_id, [])
 
     # ------------------------------------------------------------------
-    # Topological ordering (naive)
+    # Indexed queries (half-open [start, end), O(log n + k))
     # ------------------------------------------------------------------
-    def topological_order(self) -> List[EventId]:
+    def events_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[EventId]:
+        """Events scheduled in [start, end), ordered by scheduled_time."""
+        return self._time_index.between(start, end)
+
+    def events_due_within(self, now: datetime, window: timedelta) -> List[EventId]:
+        """Events due in the settlement window [now, now + window)."""
+        return self._time_index.between(now, now + window)
+
+    def events_for_actor(
+        self,
+        actor_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        event_type: Optional[str] = None,
+    ) -> List[EventId]:
+        """
+        Events of one actor scheduled in [start, end), optionally
+        restricted to one event_type (e.g. all obligations of actor X).
         """
-        Compute a topological ordering of the events.
+        if event_type is None:
+            index = self._actor_index.get(actor_id)
+        else:
+            index = self._actor_type_index.get((actor_id, event_type))
+        return index.between(start, end) if index is not None else []
+
+    def events_of_type(
+        self,
+        event_type: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[EventId]:
+        """Events of one event_type scheduled in [start, end)."""
+        index = self._type_index.get(event_type)
+        return index.between(start, end) if index is not None else []
+
+    @property
+    def actor_ids(self) -> List[str]:
+        return list(self._actor_index.keys())
+
+    # ------------------------------------------------------------------
+    # Topological ordering
+    # ------------------------------------------------------------------
+    @property
+    def version(self) -> int:
+        """Mutation counter; changes whenever an event or edge is added."""
+        return self._version
 
-        This is a naive Kahn-style implementation.
-        Raises ValueError if it detects a cycle.
+    def topological_order(self) -> List[EventId]:
         """
-        # Compute in-degrees
-        in_degree: Dict[EventId, int] = {
-            eid: len(preds) for eid, preds in self._predecessors.items()
-        }
+        Return a topological ordering of the events.
 
-        # Nodes with no predecessors
-        zero_in_degree: List[EventId] = [
-            eid for eid in self._events.keys() if in_degree.get(eid, 0) == 0
-        ]
+        The order is maintained incrementally by add_dependency, so this
+        does no graph traversal. The returned list is memoized per graph
+        version and shared between callers: treat it as read-only.
+        """
+        snapshot = self._order_snapshot
+        if snapshot is None or snapshot[0] != self._version:
+            snapshot = (self._version, list(self._order))
+            self._order_snapshot = snapshot
+        return snapshot[1]
 
-        order: List[EventId] = []
-        idx = 0
+    def topological_level(self, event_id: EventId) -> int:
+        """
+        Generation of an event: 0 without predecessors, otherwise one more
+        than its deepest predecessor. Raises KeyError if missing.
+        """
+        return self._level[event_id]
 
-        while idx < len(zero_in_degree):
-            current = zero_in_degree[idx]
-            idx += 1
-            order.append(current)
+    def generations(self) -> List[List[EventId]]:
+        """
+        Group events by topological level. Events within a generation do
+        not depend on each other. Memoized per graph version (read-only).
+        """
+        snapshot = self._generations_snapshot
+        if snapshot is None or snapshot[0] != self._version:
+            levels: List[List[EventId]] = []
+            for eid in self.topological_order():
+                lvl = self._level[eid]
+                while len(levels) <= lvl:
+                    levels.append([])
+                levels[lvl].append(eid)
+            snapshot = (self._version, levels)
+            self._generations_snapshot = snapshot
+        return snapshot[1]
 
-            for succ in self._successors.get(current, []):
-                in_degree[succ] = in_degree.get(succ, 0) - 1
-                if in_degree[succ] == 0:
-                    zero_in_degree.append(succ)
+    # ------------------------------------------------------------------
+    # Subgraphs
+    # ------------------------------------------------------------------
+    def subgraph(self, event_ids: Iterable[EventId]) -> "SequencingGraph":
+        """
+        Return a new graph holding the given events and every dependency
+        whose endpoints are both among them.
+
+        Events keep this graph's insertion order (so positional
+        tie-breaks, e.g. in list_schedule, resolve as they do on the full
+        graph), and the subgraph inherits this graph's topological order
+        restricted to the kept events, so no reordering is needed.
+        Raises KeyError if an id is missing.
+        """
+        keep = set(event_ids)
+        missing = keep.difference(self._events)
+        if missing:
+            raise KeyError(f"Unknown events: {sorted(e.value for e in missing)[:5]}")
+
+        inserted = [eid for eid in self._events if eid in keep]
+        ordered = [eid for eid in self.topological_order() if eid in keep]
+
+        level: Dict[EventId, int] = {}
+        for eid in ordered:
+            level[eid] = max(
+                (level[p] + 1 for p in self._predecessors[eid] if p in keep), default=0
+            )
+
+        sub = SequencingGraph()
+        sub._bulk_load(
+            events=[self._events[eid] for eid in inserted],
+            successors=[[s for s in self._successors[eid] if s in keep] for eid in inserted],
+            predecessors=[[p for p in self._predecessors[eid] if p in keep] for eid in inserted],
+            order=ordered,
+            levels=[level[eid] for eid in inserted],
+        )
+        return sub
 
-        if len(order) != len(self._events):
-            raise ValueError("Graph contains a cycle or disconnected dependency structure")
+    # ------------------------------------------------------------------
+    # Compact storage
+    # ------------------------------------------------------------------
+    def to_compact(self) -> "CompactSequencingGraph":
+        """
+        Return an array-backed (CSR) copy of this graph.
+        See compact_graph.CompactSequencingGraph.
+        """
+        from .compact_graph import CompactSequencingGraph
 
-        return order
+        return CompactSequencingGraph.from_graph(self)
 
     # ------------------------------------------------------------------
     # Placeholders for integration with the Flow Optimization Engine
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.foe.forecasting.backtest import ERROR_COLUMNS, _refit_backtest, rolling_origin_backtest
+from src.foe.forecasting.panel import panel_from_long
+
+
+def _random_panel(seed: int = 3, n_corridors: int = 20, n_years: int = 16):
+    """Positive flows with random gaps and missing FX, on a shared year grid."""
+    rng = np.random.default_rng(seed)
+    years = np.arange(2005, 2005 + n_years)
+    rows = []
+    for c in range(n_corridors):
+        level = rng.uniform(1e6, 1e8)
+        growth = rng.normal(0.05, 0.03)
+        fx = 80.0 + np.cumsum(rng.normal(1.0, 3.0, n_years))
+        values = level * np.exp(growth * (years - years[0]) + rng.normal(0.0, 0.1, n_years))
+        values[rng.random(n_years) < 0.15] = np.nan
+        fx[rng.random(n_years) < 0.15] = np.nan
+        keep = rng.random(n_years) > 0.1  # some corridor-years have no row at all
+        for y, v, f in zip(years[keep], values[keep], fx[keep]):
+            rows.append({"corridor_id": f"C{c:02d}", "year": int(y), "remittance_usd": v, "usd_kes": f})
+    return panel_from_long(pd.DataFrame(rows), fx_col="usd_kes")
+
+
+def _sorted(errors: pd.DataFrame) -> pd.DataFrame:
+    keys = ["model", "corridor_id", "origin", "year"]
+    return errors[ERROR_COLUMNS].sort_values(keys).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("model", ["logtrend", "fx_linear"])
+@pytest.mark.parametrize("horizon", [1, 3])
+def test_incremental_fitters_match_refit(model, horizon):
+    panel = _random_panel()
+    min_train_years = 4
+    origins = panel.years[min_train_years - 1:-1].tolist()
+
+    incremental = rolling_origin_backtest(
+        panel, models=[model], horizon=horizon, min_train_years=min_train_years
+    )["errors"]
+    refit = _refit_backtest(model, panel, origins, horizon, min_train_years)
+
+    assert len(refit) > 0
+    got, expected = _sorted(incremental), _sorted(refit)
+    pd.testing.assert_frame_equal(
+        got, expected, check_dtype=False, check_exact=False, rtol=1e-9, atol=0.0
+    )
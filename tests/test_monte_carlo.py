@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.foe.monte_carlo import run_foe_monte_carlo
+
+
+def _flows():
+    months = pd.period_range("2024-01", periods=14, freq="M")
+    rng = np.random.default_rng(5)
+    return pd.DataFrame(
+        {
+            "year": months.year,
+            "month": months.month,
+            "flow_usd": rng.uniform(1e5, 5e5, len(months)),
+        }
+    )
+
+
+@pytest.mark.parametrize("max_cells", [1, 37 * 200, 45 * 200])
+def test_seeded_run_does_not_depend_on_block_size(max_cells):
+    kwargs = {"n_paths": 200, "settlement_delay_days": 3, "seed": 11}
+    whole = run_foe_monte_carlo(_flows(), max_cells=1 << 30, **kwargs)
+    blocked = run_foe_monte_carlo(_flows(), max_cells=max_cells, **kwargs)
+
+    assert blocked["percentiles"] == pytest.approx(whole["percentiles"], rel=1e-12)
+    np.testing.assert_allclose(blocked["peak_float"], whole["peak_float"], rtol=1e-12)
+    pd.testing.assert_frame_equal(blocked["bands"], whole["bands"], rtol=1e-12)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.foe.result_cache import ResultCache
+
+
+def _frame():
+    df = pd.DataFrame(
+        {
+            2: [1, 2, 3],
+            "when": pd.date_range("2024-03-30", periods=3, tz="Africa/Nairobi"),
+            "corridor": ["KE-US", "UG-UK", "KE-US"],
+            "value": [1.5, np.nan, -2.0],
+        },
+        index=pd.Index(["a", "b", "c"], name="key"),
+    )
+    df.columns.name = "field"
+    return df
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        _frame(),
+        _frame().set_index("when"),
+        _frame().reset_index(drop=True).rename(columns={"value": 0.5}),
+    ],
+)
+def test_frame_round_trips_through_memo_and_disk(tmp_path, frame):
+    cache = ResultCache(tmp_path)
+    assert cache.put("k", {"frame": frame, "n": 3})
+
+    memo = cache.get("k")
+    disk = ResultCache(tmp_path).get("k")
+    for result in (memo, disk):
+        assert result["n"] == 3
+        pd.testing.assert_frame_equal(result["frame"], frame)
+
+
+def test_uncacheable_frames_store_nothing(tmp_path):
+    cache = ResultCache(tmp_path)
+    nested = pd.DataFrame({"a": [{"x": 1}]})
+    multi = pd.DataFrame({"a": [1]}, index=pd.MultiIndex.from_tuples([(1, 2)]))
+
+    assert not cache.put("nested", nested)
+    assert not cache.put("multi", multi)
+    assert cache.get("nested") is None
+    assert ResultCache(tmp_path).get("multi") is None
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.lsi.flow_optimization_engine import FlowOptimizationEngine
+from src.lsi.ingest import graph_from_frames
+from src.lsi.sharding import ShardedFlowRunner
+
+
+def _random_graph(seed: int = 7, n_actors: int = 12, events_per_actor: int = 40):
+    """
+    Several independent actors with coarse (often tied) scheduled times and
+    dependency edges pointing from later-inserted to earlier-inserted events,
+    so insertion order differs from topological order.
+    """
+    rng = np.random.default_rng(seed)
+    n = n_actors * events_per_actor
+    actor = np.repeat(np.arange(n_actors), events_per_actor)
+    rng.shuffle(actor)
+    events = pd.DataFrame(
+        {
+            "event_id": [f"e{i}" for i in range(n)],
+            "actor_id": [f"a{a}" for a in actor],
+            "event_type": np.where(rng.random(n) < 0.4, "income", "obligation"),
+            "amount": rng.integers(1, 20, n) * 100.0,
+            "currency": "USD",
+            "scheduled_time": pd.Timestamp("2025-01-01", tz="UTC")
+            + pd.to_timedelta(rng.integers(0, 30, n), unit="D"),
+        }
+    )
+
+    edges = []
+    for a in range(n_actors):
+        members = np.flatnonzero(actor == a)
+        for _ in range(events_per_actor // 2):
+            i, j = rng.choice(members, 2, replace=False)
+            # Later-inserted event first; an edge from high to low index
+            # within one actor keeps the graph acyclic.
+            edges.append((f"e{max(i, j)}", f"e{min(i, j)}"))
+    dependencies = pd.DataFrame(sorted(set(edges)), columns=["predecessor", "successor"])
+    return graph_from_frames(events, dependencies)
+
+
+def _as_tuple(result):
+    times = {eid: d.execute_at for eid, d in result.decisions.items()}
+    sources = {eid: d.use_liquidity_source for eid, d in result.decisions.items()}
+    return times, sources, result.details.get("unfunded_events")
+
+
+@pytest.mark.parametrize("n_shards", [1, 3, 8])
+@pytest.mark.parametrize("max_delay", [None, timedelta(days=7)])
+def test_sharded_optimize_matches_unsharded(n_shards, max_delay):
+    graph = _random_graph()
+    kwargs = {"initial_balances": {f"a{a}": 500.0 for a in range(12)}, "max_delay": max_delay}
+
+    full = FlowOptimizationEngine(graph).optimize_schedule(**kwargs)
+    sharded = ShardedFlowRunner(graph, n_shards=n_shards, max_workers=1).run(
+        "optimize_schedule", **kwargs
+    )
+
+    assert _as_tuple(sharded) == _as_tuple(full)
+    assert sharded.total_delay_cost == pytest.approx(full.total_delay_cost)
+    assert sharded.details["shortfall_amount"] == pytest.approx(full.details["shortfall_amount"])
+
+
+def test_subgraph_keeps_insertion_order():
+    graph = _random_graph()
+    ids = [event.id for event in graph.iter_events()]
+    kept = ids[::3]
+    sub = graph.subgraph(reversed(kept))
+    assert [event.id for event in sub.iter_events()] == kept